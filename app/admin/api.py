@@ -0,0 +1,201 @@
+import time
+from typing import Dict, Optional
+
+from app.admin.health import HealthAPI
+from app.admin.server import AdminServer, Request
+from app.clients.health import HealthChecker
+from app.clients.polling_worker import PollingWorker
+from app.clients.rabbit.backpressure import BackpressureController
+from app.clients.worker_registry import WorkerRegistry
+from app.config import settings
+from app.enums.circuit_breaker import CircuitBreakerClientEnum, CircuitBreakerState
+from app.enums.logging import LoggingLevel
+from app.enums.polling_workers import OriginType
+from app.exceptions.admin import AdminAPIError
+from app.logger import get_log_level, logger, set_log_level
+from app.utils.circuit_breaker.base import CircuitBreakerBaseClient
+
+
+def breaker_state(breaker: CircuitBreakerBaseClient) -> dict:
+    state = {
+        "state": breaker.state.value,
+        "failures": breaker.failures,
+        "max_failures": breaker.max_failures,
+        "reset_timeout_sec": breaker.reset_timeout_sec,
+    }
+    if breaker.state == CircuitBreakerState.OPEN:
+        state["open_for_sec"] = round(time.time() - breaker.last_failure_time, 3)
+    return state
+
+
+class AdminAPI:
+    """
+    Состояние и настройка сервиса на ходу: воркеры, лимиты, выключатели, логи.
+
+    Все изменения применяются к живым объектам: соединения, клиенты ботов
+    и маркеры не пересоздаются, поэтому настройки можно менять во время инцидента.
+    """
+
+    def __init__(
+        self,
+        registries: Dict[OriginType, WorkerRegistry],
+        backpressure: Optional[BackpressureController] = None,
+    ):
+        self.registries = registries
+        self.backpressure = backpressure
+
+    def register(self, server: AdminServer):
+        server.route("GET", "/state", self.state)
+        server.route("GET", "/origins/{origin}", self.origin_state)
+        server.route("POST", "/origins/{origin}/workers/{token}/pause", self.pause)
+        server.route("POST", "/origins/{origin}/workers/{token}/resume", self.resume)
+        server.route("PUT", "/origins/{origin}/rate-limit", self.set_rate_limit)
+        server.route("PUT", "/origins/{origin}/breakers/{breaker}", self.set_breaker)
+        server.route("PUT", "/log-level", self.set_log_level)
+
+    def _registry(self, origin: str) -> WorkerRegistry:
+        try:
+            return self.registries[OriginType(origin.upper())]
+        except (ValueError, KeyError):
+            raise AdminAPIError(404, f"Origin {origin} не запущен")
+
+    @staticmethod
+    def _worker(registry: WorkerRegistry, token: str) -> PollingWorker:
+        workers = registry.find(token)
+        if not workers:
+            raise AdminAPIError(404, f"Нет бота с суффиксом токена {token}")
+        if len(workers) > 1:
+            raise AdminAPIError(409, f"Суффикс {token} у нескольких ботов")
+        return workers[0]
+
+    @staticmethod
+    def _positive_int(data: dict, name: str, required: bool = False) -> Optional[int]:
+        value = data.get(name)
+        if value is None and not required:
+            return None
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise AdminAPIError(400, f"{name}: нужно целое число больше 0")
+        return value
+
+    def _origin_state(self, registry: WorkerRegistry) -> dict:
+        limiter = registry.rate_limiter
+        fallback = registry.fallback_limiter
+        return {
+            "workers": [
+                registry.worker_state(worker) for worker in registry.workers.values()
+            ],
+            "limiter": {
+                "max_requests_per_service": limiter.max_requests_per_service,
+                "window_seconds": limiter.window_seconds,
+                "fallback_rate": fallback.rate if fallback else None,
+                "degraded": fallback.degraded if fallback else False,
+            },
+            "breakers": {
+                "rabbitmq": breaker_state(registry.publisher_cb),
+                "redis": breaker_state(registry.redis_cb),
+            },
+            "scheduler": {
+                "max_concurrency": registry.scheduler.max_concurrency,
+                "busy": len(registry.scheduler.in_flight),
+                "queued": registry.scheduler.queue.qsize(),
+                "paused": len(registry.scheduler.parked),
+            },
+        }
+
+    async def state(self, request: Request) -> dict:
+        return {
+            "origins": {
+                origin.value: self._origin_state(registry)
+                for origin, registry in self.registries.items()
+            },
+            "log_level": get_log_level().value,
+            "backpressure": (
+                {"mode": self.backpressure.mode.value, "depth": self.backpressure.depth}
+                if self.backpressure
+                else None
+            ),
+        }
+
+    async def origin_state(self, request: Request, origin: str) -> dict:
+        return self._origin_state(self._registry(origin))
+
+    async def pause(self, request: Request, origin: str, token: str) -> dict:
+        registry = self._registry(origin)
+        worker = self._worker(registry, token)
+        registry.pause(worker)
+        return registry.worker_state(worker)
+
+    async def resume(self, request: Request, origin: str, token: str) -> dict:
+        registry = self._registry(origin)
+        worker = self._worker(registry, token)
+        registry.resume(worker)
+        return registry.worker_state(worker)
+
+    async def set_rate_limit(self, request: Request, origin: str) -> dict:
+        registry = self._registry(origin)
+        max_requests = self._positive_int(
+            request.json(), "max_requests_per_service", required=True
+        )
+        try:
+            registry.set_rate_limit(max_requests)
+        except ValueError as e:
+            raise AdminAPIError(400, f"max_requests_per_service: {e}")
+        return self._origin_state(registry)["limiter"]
+
+    async def set_breaker(self, request: Request, origin: str, breaker: str) -> dict:
+        registry = self._registry(origin)
+        try:
+            client = CircuitBreakerClientEnum(breaker.upper())
+        except ValueError:
+            raise AdminAPIError(404, f"Нет выключателя {breaker}")
+        target = (
+            registry.publisher_cb
+            if client == CircuitBreakerClientEnum.RABBITMQ
+            else registry.redis_cb
+        )
+
+        data = request.json()
+        state = None
+        if data.get("state") is not None:
+            try:
+                state = CircuitBreakerState(str(data["state"]).upper())
+            except ValueError:
+                raise AdminAPIError(400, f"Неизвестное состояние {data['state']}")
+        max_failures = self._positive_int(data, "max_failures")
+        reset_timeout_sec = self._positive_int(data, "reset_timeout_sec")
+
+        target.configure(max_failures, reset_timeout_sec)
+        if state is not None:
+            target.force(state)
+        return breaker_state(target)
+
+    async def set_log_level(self, request: Request) -> dict:
+        try:
+            level = LoggingLevel(str(request.json().get("level", "")).upper())
+            if level == LoggingLevel.NOTSET:
+                raise ValueError(level)
+        except ValueError:
+            raise AdminAPIError(400, "level: DEBUG, INFO, WARNING, ERROR или CRITICAL")
+        set_log_level(level)
+        logger.warning(f"Уровень логов изменён на {level.value}")
+        return {"log_level": level.value}
+
+
+def get_admin_server(
+    registries: Dict[OriginType, WorkerRegistry],
+    backpressure: Optional[BackpressureController] = None,
+    health: Optional[HealthChecker] = None,
+) -> Optional[AdminServer]:
+    """Сервер с admin API (при ADMIN_TOKEN) и пробами (при включённых проверках)"""
+    config = settings.admin
+    token = config.ADMIN_TOKEN.get_secret_value() if config.ADMIN_TOKEN else ""
+    if not token:
+        logger.warning("ADMIN_TOKEN не задан, admin API не запускается")
+    if not token and health is None:
+        return None
+    server = AdminServer(config.ADMIN_HOST, config.ADMIN_PORT, token or None)
+    if token:
+        AdminAPI(registries, backpressure).register(server)
+    if health is not None:
+        HealthAPI(health).register(server)
+    return server
@@ -0,0 +1,31 @@
+from app.admin.server import AdminServer, Request, Response
+from app.clients.health import HealthChecker
+
+
+class HealthAPI:
+    """
+    Пробы для оркестратора, без токена: отдают последний снимок HealthChecker
+    и не обращаются к зависимостям, сколько бы раз их ни вызывали.
+    """
+
+    def __init__(self, checker: HealthChecker):
+        self.checker = checker
+
+    def register(self, server: AdminServer):
+        server.route("GET", "/health", self.health, auth=False)
+        server.route("GET", "/ready", self.ready, auth=False)
+
+    async def health(self, request: Request) -> Response:
+        """Liveness: цикл событий отвечает и фоновые проверки не зависли"""
+        live, age = self.checker.live(), self.checker.age
+        payload = {
+            "status": "ok" if live else "stale",
+            "checked_sec_ago": round(age, 3) if age is not None else None,
+        }
+        return Response(200 if live else 503, payload)
+
+    async def ready(self, request: Request) -> Response:
+        """Readiness: сервис запущен, получатель доступен, поллеры работают"""
+        ready = self.checker.ready()
+        payload = {"status": "ready" if ready else "not_ready", **self.checker.report()}
+        return Response(200 if ready else 503, payload)
@@ -0,0 +1,176 @@
+import asyncio
+import hmac
+import json
+import re
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from app.exceptions.admin import AdminAPIError
+from app.logger import logger
+
+# Запросы admin API маленькие: большее тело - ошибка клиента
+MAX_BODY_BYTES = 64 * 1024
+READ_TIMEOUT_SEC = 10.0
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise AdminAPIError(400, "Тело запроса - не JSON")
+        if not isinstance(data, dict):
+            raise AdminAPIError(400, "Ожидается JSON-объект")
+        return data
+
+
+@dataclass
+class Response:
+    """Ответ с кодом, отличным от 200 (например, 503 у /ready)"""
+
+    status: int
+    payload: Any
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class _Route:
+    method: str
+    pattern: Pattern
+    handler: Handler
+    auth: bool
+
+
+class AdminServer:
+    """
+    Минимальный HTTP/1.1 сервер на asyncio.start_server для admin API.
+
+    Обработчик получает Request и параметры пути ({name} в шаблоне) и возвращает
+    объект, который отдаётся JSON с кодом 200, или Response со своим кодом;
+    AdminAPIError превращается в ответ с её статусом. Маршруты с auth требуют заголовок
+    Authorization: Bearer <token>. Одно соединение - один запрос.
+    """
+
+    def __init__(self, host: str, port: int, token: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.routes: List[_Route] = []
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    def route(self, method: str, path: str, handler: Handler, auth: bool = True):
+        pattern = re.compile(
+            "^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path) + "$"
+        )
+        self.routes.append(_Route(method, pattern, handler, auth))
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, self.host, self.port)
+        logger.info(f"Admin API слушает {self.host}:{self.port}")
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def _authorized(self, request: Request) -> bool:
+        if not self.token:
+            return False
+        scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip().encode(), self.token.encode()
+        )
+
+    def _match(self, request: Request) -> Tuple[_Route, Dict[str, str]]:
+        allowed = False
+        for route in self.routes:
+            match = route.pattern.match(request.path)
+            if match is None:
+                continue
+            if route.method == request.method:
+                return route, match.groupdict()
+            allowed = True
+        if allowed:
+            raise AdminAPIError(405, f"Метод {request.method} не поддерживается")
+        raise AdminAPIError(404, f"Нет ресурса {request.path}")
+
+    async def dispatch(self, request: Request) -> Tuple[int, Any]:
+        try:
+            route, params = self._match(request)
+            if route.auth and not self._authorized(request):
+                raise AdminAPIError(401, "Нужен Authorization: Bearer <ADMIN_TOKEN>")
+            result = await route.handler(request, **params)
+            if isinstance(result, Response):
+                return result.status, result.payload
+            return 200, result
+        except AdminAPIError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            logger.exception(f"Admin API: ошибка {request.method} {request.path}: {e}")
+            return 500, {"error": "Внутренняя ошибка"}
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Request:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise AdminAPIError(400, "Некорректная строка запроса")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise AdminAPIError(413, "Слишком большое тело запроса")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers, body)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                request = await asyncio.wait_for(
+                    self._read_request(reader), READ_TIMEOUT_SEC
+                )
+                status, payload = await self.dispatch(request)
+            except AdminAPIError as e:
+                status, payload = e.status, {"error": e.message}
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                status, payload = 400, {"error": "Некорректный запрос"}
+
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode()
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode()
+                + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
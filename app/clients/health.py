@@ -0,0 +1,189 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.clients.redis.pool import get_redis
+from app.clients.sinks.base import BaseSink
+from app.clients.worker_registry import WorkerRegistry
+from app.config import settings
+from app.enums.circuit_breaker import CircuitBreakerState
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import HEALTH_CHECK_DURATION, HEALTH_CHECK_STATUS
+
+
+class HealthChecker:
+    """
+    Фоновые проверки для /health и /ready.
+
+    Раз в interval_sec пингуются получатель уведомлений и Redis, читаются
+    выключатели и пульс планировщиков; результат кешируется, и пробы только
+    читают его, не обращаясь к зависимостям. Проверки идут последовательно,
+    каждая не дольше timeout_sec, поэтому медленная зависимость не получает
+    лишних запросов, а зависимость с открытым выключателем не пингуется вовсе.
+    """
+
+    def __init__(
+        self,
+        sink: BaseSink,
+        registries: Dict[OriginType, WorkerRegistry],
+        interval_sec: float = 5.0,
+        timeout_sec: float = 2.0,
+        stale_sec: float = 120.0,
+        redis_required: bool = False,
+    ):
+        self.sink = sink
+        # Заполняется сервисом по мере запуска origin
+        self.registries = registries
+        self.interval_sec = interval_sec
+        self.timeout_sec = timeout_sec
+        self.stale_sec = stale_sec
+        # При включённом локальном лимитере сервис работает и без Redis
+        self.redis_required = redis_required
+        self.started = False
+        self.checks: Dict[str, dict] = {}
+        self.checked_at: Optional[float] = None
+        self.created_at = time.monotonic()
+
+    def mark_started(self):
+        self.started = True
+
+    def mark_stopping(self):
+        """Drain: новые апдейты не берутся, сервис больше не готов"""
+        self.started = False
+
+    def _breakers_open(self, attribute: str) -> bool:
+        """
+        Выключатель открыт и его таймаут не истёк. Без трафика он сам не
+        переходит в HALF_OPEN, поэтому после таймаута зависимость снова пингуется.
+        """
+        now = time.time()
+        return any(
+            breaker.state == CircuitBreakerState.OPEN
+            and now - breaker.last_failure_time < breaker.reset_timeout_sec
+            for breaker in (
+                getattr(registry, attribute) for registry in self.registries.values()
+            )
+        )
+
+    async def _ping(
+        self, name: str, func: Callable[[], Awaitable], breaker: Optional[str] = None
+    ) -> dict:
+        if breaker and self._breakers_open(breaker):
+            result = {"ok": False, "error": "выключатель открыт"}
+        else:
+            started = time.monotonic()
+            try:
+                ok = bool(await asyncio.wait_for(func(), self.timeout_sec))
+                result = {"ok": ok}
+            except asyncio.TimeoutError:
+                result = {"ok": False, "error": f"нет ответа за {self.timeout_sec}с"}
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+            duration = time.monotonic() - started
+            HEALTH_CHECK_DURATION.labels(check=name).observe(duration)
+            result["latency_ms"] = round(duration * 1000, 1)
+        HEALTH_CHECK_STATUS.labels(check=name).set(1 if result["ok"] else 0)
+        return result
+
+    def _origin(self, registry: WorkerRegistry) -> dict:
+        now = time.monotonic()
+        scheduler = registry.scheduler
+        # Пульс нужен, только если есть воркеры, которым пора опрашивать API
+        due = sum(
+            1
+            for worker in registry.workers.values()
+            if not worker.paused and worker.resume_at <= now
+        )
+        heartbeat_age = now - scheduler.heartbeat_at
+        ok = not due or heartbeat_age <= self.stale_sec
+        HEALTH_CHECK_STATUS.labels(check=f"workers_{registry.origin_type.value}").set(
+            1 if ok else 0
+        )
+        return {
+            "ok": ok,
+            "workers": len(registry.workers),
+            "due": due,
+            "heartbeat_age_sec": round(heartbeat_age, 3),
+            "stuck": scheduler.stuck(self.stale_sec),
+            "breakers": {
+                "rabbitmq": registry.publisher_cb.state.value,
+                "redis": registry.redis_cb.state.value,
+            },
+        }
+
+    async def check(self):
+        checks = {
+            "sink": await self._ping(self.sink.name, self.sink.check, "publisher_cb"),
+            "redis": await self._ping("redis", get_redis().ping, "redis_cb"),
+        }
+        checks["redis"]["required"] = self.redis_required
+        for origin, registry in list(self.registries.items()):
+            checks[origin.value.lower()] = self._origin(registry)
+
+        failed = [name for name, check in checks.items() if not self._passed(check)]
+        previous = [
+            name for name, check in self.checks.items() if not self._passed(check)
+        ]
+        if failed != previous:
+            if failed:
+                logger.warning(f"Health-check: не пройдены {', '.join(failed)}")
+            else:
+                logger.info("Health-check: все проверки пройдены")
+        self.checks, self.checked_at = checks, time.monotonic()
+
+    @staticmethod
+    def _passed(check: dict) -> bool:
+        return check["ok"] or not check.get("required", True)
+
+    async def run(self):
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Ошибка health-check: {e}")
+            await asyncio.sleep(self.interval_sec)
+
+    @property
+    def age(self) -> Optional[float]:
+        if self.checked_at is None:
+            return None
+        return time.monotonic() - self.checked_at
+
+    def live(self) -> bool:
+        """Цикл проверок жив: снимок обновлялся не дольше трёх циклов назад"""
+        last = self.checked_at if self.checked_at is not None else self.created_at
+        return time.monotonic() - last <= 3 * (self.interval_sec + self.timeout_sec * 2)
+
+    def ready(self) -> bool:
+        return (
+            self.started
+            and self.live()
+            and all(self._passed(check) for check in self.checks.values())
+        )
+
+    def report(self) -> dict:
+        age = self.age
+        return {
+            "started": self.started,
+            "checked_sec_ago": round(age, 3) if age is not None else None,
+            "checks": self.checks,
+        }
+
+
+def get_health_checker(
+    sink: BaseSink, registries: Dict[OriginType, WorkerRegistry]
+) -> Optional[HealthChecker]:
+    config = settings.health
+    if not config.HEALTH_ENABLED:
+        return None
+    return HealthChecker(
+        sink,
+        registries,
+        interval_sec=config.HEALTH_CHECK_INTERVAL_SEC,
+        timeout_sec=config.HEALTH_CHECK_TIMEOUT_SEC,
+        stale_sec=config.HEALTH_STALE_SEC,
+        redis_required=not settings.redis.REDIS_DEGRADED_ENABLED,
+    )
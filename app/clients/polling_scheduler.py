@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+from app.clients.polling_worker import PollingWorker
+from app.clients.worker_supervisor import WorkerSupervisor
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import SCHEDULER_BUSY_POLLERS, SCHEDULER_QUEUE_WAIT
+
+
+class PollingScheduler:
+    """
+    Фиксированный пул поллеров, обслуживающий произвольное число воркеров.
+
+    Воркеры стоят в очереди по кругу: свободный поллер берёт следующий воркер,
+    выполняет один long-poll цикл (poll_once) и возвращает воркер в конец очереди.
+    Число одновременных запросов и корутин не зависит от количества токенов.
+    """
+
+    def __init__(
+        self,
+        origin_type: OriginType,
+        max_concurrency: int,
+        supervisor: Optional[WorkerSupervisor] = None,
+    ):
+        self.origin_type = origin_type
+        self.max_concurrency = max(1, max_concurrency)
+        self.supervisor = supervisor or WorkerSupervisor(origin_type)
+        self.queue: "asyncio.Queue[tuple[PollingWorker, float]]" = asyncio.Queue()
+        self.in_flight: Dict[PollingWorker, asyncio.Task] = {}
+        # Начало текущего цикла каждого занятого поллера
+        self.cycle_started: Dict[PollingWorker, float] = {}
+        # Пульс: время завершения последнего цикла любым поллером
+        self.heartbeat_at = time.monotonic()
+        self.runners: List[asyncio.Task] = []
+        # Воркеры на паузе: сняты с очереди до resume
+        self.parked: Set[PollingWorker] = set()
+        self.errors = 0
+
+    def start(self):
+        if self.runners:
+            return
+        self.runners = [
+            asyncio.create_task(
+                self._run(), name=f"poller_{self.origin_type.value}_{i}"
+            )
+            for i in range(self.max_concurrency)
+        ]
+        logger.info(f"Запущено {self.max_concurrency} поллеров {self.origin_type.value}")
+
+    def add(self, worker: PollingWorker):
+        self.queue.put_nowait((worker, time.monotonic()))
+
+    def pause(self, worker: PollingWorker):
+        """Новые циклы не начинаются; текущий запрос завершается и публикуется"""
+        worker.paused = True
+        self.supervisor.set_paused(worker, True)
+
+    def resume(self, worker: PollingWorker):
+        worker.paused = False
+        self.supervisor.set_paused(worker, False)
+        if worker in self.parked:
+            self.parked.discard(worker)
+            self.add(worker)
+
+    async def remove(self, worker: PollingWorker):
+        """Снимает воркер с расписания, прерывая его текущий запрос"""
+        worker.is_running = False
+        self.parked.discard(worker)
+        task = self.in_flight.get(worker)
+        if task:
+            task.cancel()
+            await asyncio.wait({task})
+        self.supervisor.forget(worker)
+
+    async def _run(self):
+        while True:
+            worker, queued_at = await self.queue.get()
+            if not worker.is_running:
+                continue
+            if worker.paused:
+                self.parked.add(worker)
+                continue
+            SCHEDULER_QUEUE_WAIT.labels(origin_type=self.origin_type).observe(
+                time.monotonic() - queued_at
+            )
+
+            SCHEDULER_BUSY_POLLERS.labels(origin_type=self.origin_type).inc()
+            task = asyncio.create_task(worker.poll_once())
+            self.in_flight[worker] = task
+            self.cycle_started[worker] = time.monotonic()
+            try:
+                await asyncio.wait({task})
+            finally:
+                self.in_flight.pop(worker, None)
+                self.cycle_started.pop(worker, None)
+                self.heartbeat_at = time.monotonic()
+                SCHEDULER_BUSY_POLLERS.labels(origin_type=self.origin_type).dec()
+
+            if not task.cancelled():
+                if task.exception():
+                    self.errors += 1
+                    await self.supervisor.on_failure(worker, task.exception())
+                else:
+                    self.supervisor.on_success(worker)
+            if worker.is_running:
+                self._requeue(worker)
+
+    def stuck(self, older_than_sec: float) -> int:
+        """Число циклов поллинга, идущих дольше older_than_sec"""
+        deadline = time.monotonic() - older_than_sec
+        return sum(1 for started in self.cycle_started.values() if started < deadline)
+
+    def _requeue(self, worker: PollingWorker):
+        delay = worker.resume_at - time.monotonic()
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.add, worker)
+        else:
+            self.add(worker)
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Перестаёт брать новые циклы поллинга и ждёт публикации уже полученных
+        апдейтов не дольше timeout. Возвращает число апдейтов, брошенных по дедлайну.
+        """
+        in_flight = dict(self.in_flight)
+        for runner in self.runners:
+            runner.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+        self.runners = []
+
+        # Запросы без полученных апдейтов можно прервать сразу
+        for worker, task in in_flight.items():
+            if not worker.in_flight:
+                task.cancel()
+
+        pending = set()
+        if in_flight:
+            _, pending = await asyncio.wait(in_flight.values(), timeout=timeout)
+
+        dropped = 0
+        for worker, task in in_flight.items():
+            if task in pending:
+                dropped += worker.in_flight
+                task.cancel()
+        await asyncio.gather(*in_flight.values(), return_exceptions=True)
+        return dropped
+
+    async def stop(self):
+        in_flight = list(self.in_flight.values())
+        for task in [*in_flight, *self.runners]:
+            task.cancel()
+        await asyncio.gather(*self.runners, *in_flight, return_exceptions=True)
+        self.runners = []
@@ -1,14 +1,26 @@
 import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
 
 from app.origin_clients.base_client import BaseOriginClient
-from app.clients.rabbit.client import RabbitProducerClient
+from app.clients.rabbit.backpressure import BackpressureController
+from app.clients.rabbit.routing import MessageRouter
 from app.clients.redis.redis_client import RedisRateLimiter
+from app.clients.sinks.base import BaseSink
+from app.enums.rabbit import PriorityLane
 from app.metrics import (
-    get_token_suffix,
+    EMPTY_POLLS,
     RABBITMQ_MESSAGES_SENT,
     RABBITMQ_MESSAGES_ERROR,
 )
 from app.logger import logger
+from app.schemas.message import MessageSchema
+from app.utils.coalescer import EditCoalescer
+from app.utils.deduplicator import UpdateDeduplicator
+from app.utils.local_rate_limiter import LocalRateLimiter
+from app.utils.poll_controller import AdaptivePollController, PollBounds
+from app.utils.retry import RetryPolicy
+from app.utils import tracing
 
 from app.utils.circuit_breaker.rabbit import CircuitBreakerRabbitClient
 from app.utils.circuit_breaker.redis import CircuitBreakerRedisClient
@@ -22,66 +34,215 @@ class PollingWorker:
     def __init__(
         self,
         client: BaseOriginClient,
-        publisher: RabbitProducerClient,
+        publisher: BaseSink,
         redis_client: RedisRateLimiter,
         publisher_cb: CircuitBreakerRabbitClient,
         redis_cb: CircuitBreakerRedisClient,
-        update_queue: str,
+        router: MessageRouter,
+        deduplicator: Optional[UpdateDeduplicator] = None,
+        coalescer: Optional[EditCoalescer] = None,
+        poll_bounds: Optional[PollBounds] = None,
+        fetch_retry: Optional[RetryPolicy] = None,
+        redis_retry: Optional[RetryPolicy] = None,
+        fallback_limiter: Optional[LocalRateLimiter] = None,
+        backpressure: Optional[BackpressureController] = None,
     ):
         self.client = client
         self.origin_type = client.origin_type
         self.publisher = publisher
         self.redis_client = redis_client
         self.is_running = False
-        self.update_queue = update_queue
+        # Пауза из admin API: клиент, соединения и маркер сохраняются
+        self.paused = False
+        self.router = router
+        # Полученные, но ещё не опубликованные апдейты (для корректного drain)
+        self.in_flight = 0
+        # После ошибки воркер возвращается в очередь поллеров не раньше resume_at,
+        # не занимая поллер на время паузы
+        self.resume_at = 0.0
+        self.fetch_retry = fetch_retry or RetryPolicy(self.origin_type.value)
+        self.redis_retry = redis_retry or RetryPolicy("redis")
+        self.fetch_failures = 0
+        self.redis_failures = 0
+        # Без Redis воркер продолжает поллинг по локальному лимиту, если он задан
+        self.fallback_limiter = fallback_limiter
+        self.backpressure = backpressure
 
         self.publisher_cb = publisher_cb
         self.redis_cb = redis_cb
+        self.deduplicator = deduplicator
+        self.coalescer = coalescer
+        self.poll_controller = (
+            AdaptivePollController(poll_bounds, self.origin_type, client.token_suffix)
+            if poll_bounds
+            else None
+        )
 
     async def start(self):
         self.is_running = True
         await self.client.create_client()
 
+    async def stop(self):
+        self.is_running = False
+        await self.client.close_client()
+
+    async def restart(self):
+        """Пересоздаёт клиент и сбрасывает подобранные параметры запроса"""
+        await self.client.close_client()
+        await self.client.create_client()
+        if self.poll_controller:
+            self.poll_controller.reset()
+
+    def backoff(self, delay: float):
+        self.resume_at = max(self.resume_at, time.monotonic() + delay)
+
+    async def _acquire_rate_limit(self) -> bool:
+        """Место в общем лимите origin; False - запрос пропускается до паузы"""
+        cost = self.client.rate_limit_cost
         try:
-            while self.is_running:
-                try:
-                    await self.redis_cb.call(
-                        self.redis_client.wait_for_service, self.client.origin_type
-                    )
-                except RedisCircuitBreakerOpenError:
-                    logger.warning(
-                        f"Redis недоступен -> бот {get_token_suffix(self.client.token)} пропускает запрос"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                except Exception as e:
-                    logger.error(
-                        f"Бот {get_token_suffix(self.client.token)}. Ошибка при обращении к Redis: {str(e)}"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                logger.info(
-                    f"Бот {get_token_suffix(self.client.token)} делает запрос..."
+            await self.redis_cb.call(
+                self.redis_client.wait_for_service, self.client.origin_type, cost
+            )
+            self.redis_failures = 0
+            if self.fallback_limiter:
+                self.fallback_limiter.recover()
+            return True
+        except RedisCircuitBreakerOpenError as e:
+            if self.fallback_limiter:
+                await self.fallback_limiter.acquire(cost)
+                return True
+            self.redis_failures += 1
+            delay = self.redis_retry.next_delay(self.redis_failures, e)
+            logger.warning(
+                f"Redis недоступен -> бот {self.client.token_suffix} пропускает запрос, пауза {delay:.2f}с"
+            )
+            self.backoff(delay)
+            return False
+        except Exception as e:
+            if self.fallback_limiter:
+                logger.error(
+                    f"Бот {self.client.token_suffix}. Ошибка при обращении к Redis: {str(e)}, локальный лимит"
                 )
-                update = await self.client.get_updates()
-                if update:
-                    try:
-                        await self.publisher_cb.call(
-                            self.publisher.send, update, self.update_queue
-                        )
-                        RABBITMQ_MESSAGES_SENT.labels(
-                            origin_type=self.origin_type,
-                            token_suffix=self.client.token_suffix,
-                        ).inc()
-                    except Exception as e:
-                        logger.error(
-                            f"Ошибка отправки в RabbitMQ. Origin_type: {self.origin_type}, token_suffix: {self.client.token_suffix}. Ошибка: {e}"
-                        )
-                        RABBITMQ_MESSAGES_ERROR.labels(
-                            origin_type=self.origin_type,
-                            token_suffix=self.client.token_suffix,
-                        ).inc()
+                await self.fallback_limiter.acquire(cost)
+                return True
+            self.redis_failures += 1
+            delay = self.redis_retry.next_delay(self.redis_failures, e)
+            logger.error(
+                f"Бот {self.client.token_suffix}. Ошибка при обращении к Redis: {str(e)}, пауза {delay:.2f}с"
+            )
+            self.backoff(delay)
+            return False
+
+    async def poll_once(self):
+        """Один цикл воркера: лимитер -> запрос к API -> публикация"""
+        with tracing.span(
+            "poll_cycle",
+            {"origin": self.origin_type.value, "bot.token_suffix": self.client.token_suffix},
+        ):
+            await self._poll_once()
+
+    async def _poll_once(self):
+        if self.backpressure:
+            # Очереди уведомлений переполнены: бот опрашивает API реже или стоит,
+            # а курсор не двигается, пока апдейты не заберём
+            self.backoff(self.backpressure.poll_delay)
+            if self.backpressure.paused:
+                return
+        with tracing.span("rate_limit.acquire"):
+            acquired = await self._acquire_rate_limit()
+        if not acquired:
+            return
+        logger.info(f"Бот {self.client.token_suffix} делает запрос...")
+        self.fetch_retry.record_request()
+        try:
+            with tracing.span("origin.fetch_updates") as current:
+                if self.poll_controller:
+                    updates = await self.client.fetch_updates(
+                        self.poll_controller.limit, self.poll_controller.timeout
+                    )
+                    self.poll_controller.observe(len(updates))
+                else:
+                    updates = await self.client.fetch_updates()
+                if current:
+                    current.set_attribute("updates.count", len(updates))
         except asyncio.CancelledError:
-            pass
+            raise
+        except Exception as e:
+            # 429/Retry-After - пауза, запрошенная сервером, иначе экспоненциальная
+            self.fetch_failures += 1
+            self.backoff(self.fetch_retry.next_delay(self.fetch_failures, e))
+            raise
+        self.fetch_failures = 0
+        if not updates:
+            EMPTY_POLLS.labels(origin_type=self.origin_type).inc()
+            return
+        self.in_flight = len(updates)
+        try:
+            await self._publish(updates)
         finally:
-            await self.client.close_client()
+            self.in_flight = 0
+
+    async def _publish(self, updates: List[MessageSchema]):
+        if self.deduplicator:
+            fresh = await self.deduplicator.filter_new(updates)
+            if len(fresh) < len(updates):
+                logger.info(
+                    f"Бот {self.client.token_suffix}: {len(updates) - len(fresh)} апдейтов уже отправлялись, пропускаем"
+                )
+            updates = fresh
+        if not updates:
+            return
+
+        chats: Dict[Tuple[PriorityLane, int], List[MessageSchema]] = {}
+        for update in updates:
+            lane = self.router.lane(update)
+            if self.coalescer and lane == PriorityLane.NORMAL:
+                # Публикация произойдёт после окна склейки, drain дожидается её отдельно.
+                # ack ниже сдвигает маркер раньше: в окне доставка не более одного раза
+                self.coalescer.submit(self.client.token, update, self._send)
+            else:
+                # Верхняя полоса не ждёт окна склейки и обычных апдейтов своего чата
+                chats.setdefault((lane, update.chat_id), []).append(update)
+        # Разные чаты и полосы публикуются параллельно, внутри чата - по порядку
+        await asyncio.gather(*(self._send_chat(chat) for chat in chats.values()))
+        await self.client.ack(updates)
+
+    async def _send_chat(self, updates: List[MessageSchema]):
+        for update in updates:
+            await self._send(update)
+
+    async def _send(self, update: MessageSchema):
+        with tracing.span(
+            "publish", {"update.type": update.update_type, "chat.id": update.chat_id}
+        ) as current:
+            await self._send_traced(update, current)
+
+    async def _send_traced(self, update: MessageSchema, current):
+        try:
+            route = self.router.route(update, self.origin_type)
+            if current:
+                current.set_attribute("messaging.destination.name", route.queue)
+            await self.publisher_cb.call(
+                self.publisher.send,
+                update,
+                route.queue,
+                route.exchange,
+                route.routing_key,
+                route.priority,
+                route.partition,
+            )
+            RABBITMQ_MESSAGES_SENT.labels(
+                origin_type=self.origin_type,
+                token_suffix=self.client.token_suffix,
+            ).inc()
+        except Exception as e:
+            tracing.record_error(current, e)
+            if self.deduplicator:
+                await self.deduplicator.forget([update])
+            logger.error(
+                f"Ошибка отправки в RabbitMQ. Origin_type: {self.origin_type}, token_suffix: {self.client.token_suffix}. Ошибка: {e}"
+            )
+            RABBITMQ_MESSAGES_ERROR.labels(
+                origin_type=self.origin_type,
+                token_suffix=self.client.token_suffix,
+            ).inc()
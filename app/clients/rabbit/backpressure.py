@@ -0,0 +1,124 @@
+import asyncio
+from typing import List, Optional
+
+from app.clients.sinks.base import BaseSink
+from app.config import settings
+from app.enums.rabbit import BackpressureMode
+from app.logger import logger
+from app.metrics import (
+    BACKPRESSURE_MODE,
+    RABBITMQ_QUEUE_CONSUMERS,
+    RABBITMQ_QUEUE_DEPTH,
+)
+
+
+class BackpressureController:
+    """
+    Обратное давление от потребителей очереди уведомлений.
+
+    Раз в interval_sec глубина и число потребителей очередей читаются через
+    passive declare. Выше throttle_depth каждый бот опрашивает API не чаще раза
+    в throttle_delay_sec, выше pause_depth поллинг встаёт целиком. Фильтр
+    типов на стороне API здесь не годится: курсор уходит за пропущенные
+    апдейты, и они теряются, а при паузе апдейты ждут у мессенджера.
+    Так отставание потребителей не доводит брокер до memory alarm и flow
+    control всех паблишеров.
+    """
+
+    def __init__(
+        self,
+        publisher: BaseSink,
+        queues: List[str],
+        throttle_depth: int = 10000,
+        pause_depth: int = 50000,
+        interval_sec: float = 5.0,
+        throttle_delay_sec: float = 2.0,
+    ):
+        self.publisher = publisher
+        self.queues = queues
+        self.throttle_depth = throttle_depth
+        self.pause_depth = max(pause_depth, throttle_depth)
+        self.interval_sec = interval_sec
+        self.throttle_delay_sec = throttle_delay_sec
+        self.mode = BackpressureMode.NORMAL
+        self.depth = 0
+        self._export()
+
+    @property
+    def poll_delay(self) -> float:
+        """Минимальная пауза между запросами одного бота"""
+        if self.mode == BackpressureMode.NORMAL:
+            return 0.0
+        return self.throttle_delay_sec
+
+    @property
+    def paused(self) -> bool:
+        return self.mode == BackpressureMode.PAUSE
+
+    def _export(self):
+        for mode in BackpressureMode:
+            BACKPRESSURE_MODE.labels(mode=mode.value).set(1 if mode == self.mode else 0)
+
+    def _mode_for(self, depth: int) -> BackpressureMode:
+        if depth >= self.pause_depth:
+            return BackpressureMode.PAUSE
+        if depth >= self.throttle_depth:
+            return BackpressureMode.THROTTLE
+        return BackpressureMode.NORMAL
+
+    async def sample(self):
+        results = await asyncio.gather(
+            *(self.publisher.queue_stats(queue) for queue in self.queues)
+        )
+        depths = []
+        for queue, stats in zip(self.queues, results):
+            # Глубина неизвестна - очередь не влияет на режим
+            if stats is None:
+                continue
+            messages, consumers = stats
+            depths.append(messages)
+            RABBITMQ_QUEUE_DEPTH.labels(queue=queue).set(messages)
+            RABBITMQ_QUEUE_CONSUMERS.labels(queue=queue).set(consumers)
+            if consumers == 0 and messages:
+                logger.warning(f"У очереди {queue} нет потребителей, сообщений: {messages}")
+        self.depth = max(depths, default=0)
+
+        mode = self._mode_for(self.depth)
+        if mode != self.mode:
+            logger.warning(
+                f"Back-pressure: {self.mode.value} -> {mode.value} (глубина очереди {self.depth})"
+            )
+            self.mode = mode
+            self._export()
+
+    async def run(self):
+        while True:
+            try:
+                await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Без свежих данных режим не меняется
+                logger.warning(f"Не удалось получить глубину очередей: {e}")
+            await asyncio.sleep(self.interval_sec)
+
+
+def get_backpressure_controller(
+    publisher: BaseSink, queues: List[str]
+) -> Optional[BackpressureController]:
+    config = settings.backpressure
+    if not config.BACKPRESSURE_ENABLED:
+        return None
+    if not publisher.supports_queue_stats:
+        logger.warning(
+            f"Получатель {publisher.name} не отдаёт глубину очереди, back-pressure выключен"
+        )
+        return None
+    return BackpressureController(
+        publisher,
+        queues,
+        throttle_depth=config.BACKPRESSURE_THROTTLE_DEPTH,
+        pause_depth=config.BACKPRESSURE_PAUSE_DEPTH,
+        interval_sec=config.BACKPRESSURE_INTERVAL_SEC,
+        throttle_delay_sec=config.BACKPRESSURE_THROTTLE_DELAY_SEC,
+    )
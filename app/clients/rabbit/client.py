@@ -1,15 +1,38 @@
-from faststream.rabbit import RabbitBroker
-import asyncio
+from faststream.rabbit import RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Optional, Sequence, Tuple
 from pydantic import BaseModel
 
+from app.enums.rabbit import MessageCompression
 from app.logger import logger
 from app.exceptions.rabbit import RabbitBrokerNotStartedError
+from app.metrics import RABBITMQ_BATCH_SIZE, RABBITMQ_PAYLOAD_BYTES
+from app.utils.envelope import (
+    MESSAGE_CONTENT_TYPE,
+    dump_message,
+    encode_envelope,
+    resolve_compression,
+)
+from app.utils.retry import RetryPolicy
+from app.utils import tracing
 
 
 class RabbitProducerClient:
-    def __init__(self, url: str, max_retries: int, backoff_sec: int):
+    def __init__(
+        self,
+        url: str,
+        max_retries: int,
+        backoff_sec: int,
+        compression: MessageCompression = MessageCompression.NONE,
+        compression_min_bytes: int = 1024,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.max_retries = max_retries
         self.backoff_sec = backoff_sec
+        self.retry_policy = retry_policy or RetryPolicy(
+            "rabbitmq", max_attempts=max_retries, max_delay=backoff_sec
+        )
+        self.compression = resolve_compression(compression)
+        self.compression_min_bytes = compression_min_bytes
 
         try:
             self.broker = RabbitBroker(url=url)
@@ -46,27 +69,87 @@ class RabbitProducerClient:
             logger.error(f"Ошибка при health-check RabbitProducerClient: {str(e)}")
             return False
 
-    async def send(self, message: BaseModel, queue: str):
+    async def queue_stats(self, queue: str) -> Tuple[int, int]:
+        """Число сообщений и потребителей очереди (passive declare, очередь не создаётся)"""
+        declared = await self.broker.declare_queue(RabbitQueue(queue, declare=False))
+        # Объект очереди кешируется faststream, счётчики даёт только повторный declare
+        result = await declared.declare()
+        return result.message_count, result.consumer_count
+
+    async def send(
+        self,
+        message: BaseModel,
+        queue: str,
+        exchange: Optional[RabbitExchange] = None,
+        routing_key: str = "",
+        priority: Optional[int] = None,
+    ):
+        await self._publish(
+            dump_message(message),
+            str(message),
+            queue,
+            exchange,
+            routing_key,
+            content_type=MESSAGE_CONTENT_TYPE,
+            priority=priority,
+        )
+
+    async def send_batch(
+        self,
+        messages: Sequence[BaseModel],
+        queue: str,
+        exchange: Optional[RabbitExchange] = None,
+        routing_key: str = "",
+        priority: Optional[int] = None,
+    ):
+        """Публикует пачку уведомлений одним сообщением-конвертом"""
+        envelope = encode_envelope(
+            messages, self.compression, self.compression_min_bytes
+        )
+        await self._publish(
+            envelope.body,
+            f"пачка из {len(messages)} уведомлений",
+            queue,
+            exchange,
+            routing_key,
+            headers=envelope.headers,
+            content_type=envelope.content_type,
+            content_encoding=envelope.content_encoding,
+            priority=priority,
+        )
+        RABBITMQ_BATCH_SIZE.observe(len(messages))
+        RABBITMQ_PAYLOAD_BYTES.labels(kind="raw").inc(envelope.raw_size)
+        RABBITMQ_PAYLOAD_BYTES.labels(kind="wire").inc(len(envelope.body))
+
+    async def _publish(
+        self,
+        body,
+        description: str,
+        queue: str,
+        exchange: Optional[RabbitExchange],
+        routing_key: str,
+        **kwargs,
+    ):
         if not self._is_started:
             logger.error("Ошибка при RabbitProducerClient send: брокер не запущен")
             raise RabbitBrokerNotStartedError
 
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                await self.broker.publish(
-                    queue=queue, message=message.model_dump_json()
-                )
-                logger.info(f"Отправлено сообщение {message} в queue {queue}")
-                break
-            except Exception as e:
-                logger.warning(
-                    f"Ошибка при попытке отправки сообщения {message} в queue {queue} RabbitProducerClient: {str(e)}"
-                )
-
-                if attempt < self.max_retries:
-                    await asyncio.sleep(self.backoff_sec)
-                else:
-                    logger.error(
-                        f"Не удалось отправить сообщение {message} в queue {queue} после {self.max_retries} попыток"
-                    )
-                    raise
+        # traceparent текущего спана (уведомления или пачки) для потребителей
+        headers = tracing.inject_headers(kwargs.get("headers"))
+        if headers:
+            kwargs["headers"] = headers
+        try:
+            await self.retry_policy.call(
+                self.broker.publish,
+                queue=queue,
+                exchange=exchange,
+                routing_key=routing_key,
+                message=body,
+                **kwargs,
+            )
+        except Exception:
+            logger.error(
+                f"Не удалось отправить сообщение {description} в queue {queue} после {self.retry_policy.max_attempts} попыток"
+            )
+            raise
+        logger.info(f"Отправлено сообщение {description} в queue {queue}")
@@ -1,16 +1,30 @@
-from faststream.rabbit import RabbitQueue
-
 from app.clients.rabbit.client import RabbitProducerClient
+from app.clients.rabbit.routing import get_message_router
 from app.logger import logger
-from app.config import settings
 
 
 async def create_queues(rabbit_client: RabbitProducerClient):
     logger.info("Инициализация очередей в RabbitMQ...")
-    queues = [
-        RabbitQueue(settings.rabbit.RABBITMQ_NOTIFICATIONS_QUEUE, durable=True),
-    ]
+    router = get_message_router()
+
+    exchange = None
+    if router.exchange is not None:
+        exchange = await rabbit_client.broker.declare_exchange(router.exchange)
+        logger.info(
+            f"Exchange {router.exchange.name} ({router.exchange.type.value}) объявлен"
+        )
 
-    for q in queues:
-        await rabbit_client.broker.declare_queue(q)
+    for partition, q in enumerate(router.queues()):
+        queue = await rabbit_client.broker.declare_queue(q)
         logger.info(f"Очередь {q.name} объявлена")
+        if exchange is not None:
+            await queue.bind(exchange, routing_key=router.binding_key(partition))
+            logger.info(
+                f"Очередь {q.name} привязана к {router.exchange.name} по ключу {router.binding_key(partition)}"
+            )
+
+    # Приоритетная очередь получает сообщения напрямую, без exchange
+    priority_queue = router.priority_queue()
+    if priority_queue is not None:
+        await rabbit_client.broker.declare_queue(priority_queue)
+        logger.info(f"Приоритетная очередь {priority_queue.name} объявлена")
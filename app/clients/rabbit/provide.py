@@ -1,12 +1,25 @@
 from app.config import settings
+from app.utils.retry import get_retry_policy
 from app.clients.rabbit.client import RabbitProducerClient
 
 
-async def get_rabbit_client() -> RabbitProducerClient:
-    client = RabbitProducerClient(
+def create_rabbit_client() -> RabbitProducerClient:
+    return RabbitProducerClient(
         url=settings.rabbit.RABBIT_URL.get_secret_value(),
         max_retries=settings.rabbit.RABBITMQ_MAX_RETRIES,
         backoff_sec=settings.rabbit.RABBITMQ_BACKOFF_SEC,
+        compression=settings.rabbit.RABBITMQ_COMPRESSION,
+        compression_min_bytes=settings.rabbit.RABBITMQ_COMPRESSION_MIN_BYTES,
+        retry_policy=get_retry_policy(
+            "rabbitmq",
+            max_attempts=settings.rabbit.RABBITMQ_MAX_RETRIES,
+            max_delay=settings.rabbit.RABBITMQ_BACKOFF_SEC,
+        ),
     )
+
+
+async def get_rabbit_client() -> RabbitProducerClient:
+    client = create_rabbit_client()
     await client.start()
     return client
+
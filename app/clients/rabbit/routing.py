@@ -0,0 +1,188 @@
+import zlib
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional
+
+from faststream.rabbit import ExchangeType, QueueType, RabbitExchange, RabbitQueue
+
+from app.config import settings
+from app.enums.polling_workers import OriginType
+from app.enums.rabbit import (
+    NotificationsQueueType,
+    PriorityLane,
+    PriorityMode,
+    RoutingExchangeType,
+    RoutingKeyField,
+)
+from app.schemas.message import MessageSchema
+
+_EXCHANGE_TYPES = {
+    RoutingExchangeType.DIRECT: ExchangeType.DIRECT,
+    RoutingExchangeType.TOPIC: ExchangeType.TOPIC,
+    RoutingExchangeType.CONSISTENT_HASH: ExchangeType.X_CONSISTENT_HASH,
+}
+
+_QUEUE_TYPES = {
+    NotificationsQueueType.QUORUM: QueueType.QUORUM,
+    NotificationsQueueType.STREAM: QueueType.STREAM,
+}
+
+# AMQP-приоритет полосы. Quorum-очереди RabbitMQ 4 считают приоритет от 5 высоким,
+# classic-очередям объявляется x-max-priority с тем же верхним значением
+LANE_PRIORITIES = {PriorityLane.NORMAL: 0, PriorityLane.HIGH: 5}
+
+
+@dataclass(frozen=True)
+class Route:
+    queue: str
+    exchange: Optional[RabbitExchange] = None
+    routing_key: str = ""
+    # None - полосы приоритета выключены
+    priority: Optional[int] = None
+    # Партиция (и полоса), куда попадёт сообщение; для получателей без exchange
+    partition: str = ""
+
+    @property
+    def target(self) -> str:
+        """Имя файла или потока для получателей, не знающих exchange и routing key"""
+        return self.partition or self.queue
+
+
+class MessageRouter:
+    """
+    Маршрутизация уведомлений по партициям очереди notifications.
+
+    Ключ маршрутизации - chat_id или origin_type. Для DEFAULT/DIRECT/TOPIC партиция
+    выбирается стабильным хешем ключа на стороне сервиса, для x-consistent-hash -
+    на стороне брокера. В обоих случаях сообщения одного чата идут в одну очередь
+    и сохраняют порядок.
+
+    При включённых полосах приоритета апдейты типов priority_types получают
+    AMQP-приоритет или уходят в отдельную очередь <queue>.priority; относительно
+    обычных апдейтов того же чата они могут обогнать их.
+    """
+
+    def __init__(
+        self,
+        queue: str,
+        exchange: str = "",
+        exchange_type: RoutingExchangeType = RoutingExchangeType.DEFAULT,
+        key_field: RoutingKeyField = RoutingKeyField.CHAT_ID,
+        partitions: int = 1,
+        queue_type: NotificationsQueueType = NotificationsQueueType.CLASSIC,
+        priority_mode: PriorityMode = PriorityMode.NONE,
+        priority_types: Iterable[str] = (),
+    ):
+        self.queue = queue
+        self.exchange_type = exchange_type
+        self.key_field = key_field
+        self.partitions = max(1, partitions)
+        self.queue_type = queue_type
+        self.priority_mode = priority_mode
+        self.priority_types = frozenset(priority_types)
+        self.priority_queue_name = f"{queue}.priority"
+
+        self.exchange: Optional[RabbitExchange] = None
+        if exchange_type != RoutingExchangeType.DEFAULT:
+            self.exchange = RabbitExchange(
+                exchange or f"{queue}.exchange",
+                type=_EXCHANGE_TYPES[exchange_type],
+                durable=True,
+            )
+
+    def queue_names(self) -> List[str]:
+        if self.partitions == 1:
+            return [self.queue]
+        return [f"{self.queue}.{i}" for i in range(self.partitions)]
+
+    def _declaration(self, name: str) -> RabbitQueue:
+        queue_type = _QUEUE_TYPES.get(self.queue_type)
+        if queue_type is not None:
+            return RabbitQueue(name, queue_type=queue_type, durable=True)
+        arguments = None
+        if self.priority_mode == PriorityMode.PRIORITY_QUEUE:
+            arguments = {"x-max-priority": LANE_PRIORITIES[PriorityLane.HIGH]}
+        return RabbitQueue(name, durable=True, arguments=arguments)
+
+    def queues(self) -> List[RabbitQueue]:
+        """Очереди-партиции, привязываемые к exchange"""
+        return [self._declaration(name) for name in self.queue_names()]
+
+    def priority_queue(self) -> Optional[RabbitQueue]:
+        """Отдельная очередь верхней полосы (PriorityMode.SEPARATE_QUEUE)"""
+        if self.priority_mode != PriorityMode.SEPARATE_QUEUE:
+            return None
+        return self._declaration(self.priority_queue_name)
+
+    def lane(self, message: MessageSchema) -> PriorityLane:
+        if (
+            self.priority_mode != PriorityMode.NONE
+            and message.update_type in self.priority_types
+        ):
+            return PriorityLane.HIGH
+        return PriorityLane.NORMAL
+
+    def binding_key(self, partition: int) -> str:
+        """Ключ привязки очереди-партиции к exchange"""
+        if self.exchange_type == RoutingExchangeType.CONSISTENT_HASH:
+            return "1"  # вес партиции в кольце хешей
+        if self.exchange_type == RoutingExchangeType.TOPIC:
+            return f"*.{partition}"
+        return self.queue_names()[partition]
+
+    def _key(self, message: MessageSchema, origin_type: OriginType) -> str:
+        if self.key_field == RoutingKeyField.ORIGIN_TYPE:
+            return origin_type.value
+        return str(message.chat_id)
+
+    def partition(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % self.partitions
+
+    def route(self, message: MessageSchema, origin_type: OriginType) -> Route:
+        route = self._partition_route(message, origin_type)
+        if self.priority_mode == PriorityMode.NONE:
+            return route
+        lane = self.lane(message)
+        priority = LANE_PRIORITIES[lane]
+        if lane == PriorityLane.NORMAL:
+            return replace(route, priority=priority)
+        if self.priority_mode == PriorityMode.SEPARATE_QUEUE:
+            name = self.priority_queue_name
+            return Route(queue=name, priority=priority, partition=name)
+        # В RabbitMQ полоса - AMQP-приоритет в той же очереди,
+        # у прочих получателей - своя партиция
+        return replace(route, priority=priority, partition=f"{route.partition}.priority")
+
+    def _partition_route(
+        self, message: MessageSchema, origin_type: OriginType
+    ) -> Route:
+        key = self._key(message, origin_type)
+        partition = self.partition(key)
+        # Для x-consistent-hash партицию выбирает брокер, прочим получателям - тот же хеш
+        name = self.queue_names()[partition]
+        if self.exchange is None:
+            return Route(queue=name, partition=name)
+        if self.exchange_type == RoutingExchangeType.CONSISTENT_HASH:
+            routing_key = key
+        elif self.exchange_type == RoutingExchangeType.TOPIC:
+            routing_key = f"{origin_type.value}.{partition}"
+        else:
+            routing_key = name
+        return Route(
+            queue=self.queue,
+            exchange=self.exchange,
+            routing_key=routing_key,
+            partition=name,
+        )
+
+
+def get_message_router() -> MessageRouter:
+    return MessageRouter(
+        settings.rabbit.RABBITMQ_NOTIFICATIONS_QUEUE,
+        exchange=settings.rabbit.RABBITMQ_EXCHANGE,
+        exchange_type=settings.rabbit.RABBITMQ_EXCHANGE_TYPE,
+        key_field=settings.rabbit.RABBITMQ_ROUTING_KEY_FIELD,
+        partitions=settings.rabbit.RABBITMQ_PARTITIONS,
+        queue_type=settings.rabbit.RABBITMQ_QUEUE_TYPE,
+        priority_mode=settings.rabbit.RABBITMQ_PRIORITY_MODE,
+        priority_types=settings.rabbit.RABBITMQ_PRIORITY_TYPES_LIST,
+    )
@@ -0,0 +1,68 @@
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from redis.exceptions import RedisError
+
+from app.clients.redis.pool import RedisClient, get_redis
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import REDIS_OPERATIONS
+
+
+class MarkerStore:
+    """
+    Чекпоинты маркеров поллинга в Redis (hash markers:<origin>).
+    Токены в ключи не попадают - используется их хеш.
+    """
+
+    def __init__(self, origin_type: OriginType):
+        self.origin_type = origin_type
+        self.key = f"markers:{origin_type.value}"
+        self.redis: Optional[RedisClient] = None
+
+    @staticmethod
+    def _field(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+    async def _get_redis(self) -> RedisClient:
+        if self.redis is None:
+            self.redis = get_redis()
+        return self.redis
+
+    def _count(self, operation: str, status: str):
+        REDIS_OPERATIONS.labels(
+            origin_type=self.origin_type, operation=operation, status=status
+        ).inc()
+
+    async def load_many(self, tokens: Iterable[str]) -> Dict[str, str]:
+        tokens = list(tokens)
+        if not tokens:
+            return {}
+        try:
+            client = await self._get_redis()
+            values = await client.hmget(self.key, [self._field(t) for t in tokens])
+            self._count("marker_load", "success")
+        except (RedisError, ConnectionError) as e:
+            logger.warning(f"Не удалось загрузить маркеры из Redis: {e}")
+            self._count("marker_load", "error")
+            return {}
+        return {token: value for token, value in zip(tokens, values) if value}
+
+    async def save_many(self, markers: Dict[str, Optional[str]]):
+        mapping = {
+            self._field(token): str(marker)
+            for token, marker in markers.items()
+            if marker is not None
+        }
+        if not mapping:
+            return
+        try:
+            client = await self._get_redis()
+            await client.hset(self.key, mapping=mapping)
+            self._count("marker_save", "success")
+        except (RedisError, ConnectionError) as e:
+            logger.error(f"Не удалось сохранить маркеры в Redis: {e}")
+            self._count("marker_save", "error")
+
+    async def close(self):
+        self.redis = None
@@ -0,0 +1,91 @@
+from typing import Dict, Optional, Union
+
+import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.connection import parse_url
+from redis.asyncio.sentinel import Sentinel
+
+from app.config import settings
+from app.enums.redis import RedisMode
+from app.logger import logger
+
+RedisClient = Union[redis.Redis, RedisCluster]
+
+_client: Optional[RedisClient] = None
+# sha загруженных Lua-скриптов: один SCRIPT LOAD на процесс, а не на клиента
+_scripts: Dict[str, str] = {}
+
+
+def create_redis(url: Optional[str] = None) -> RedisClient:
+    """Клиент с ограниченным пулом соединений по настройкам RedisSettings"""
+    config = settings.redis
+    url = url or config.REDIS_URL.get_secret_value()
+    options = dict(
+        encoding="utf-8",
+        decode_responses=True,
+        socket_connect_timeout=config.REDIS_SOCKET_TIMEOUT_SEC,
+        socket_timeout=config.REDIS_SOCKET_TIMEOUT_SEC,
+        health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL_SEC,
+    )
+
+    if config.REDIS_MODE == RedisMode.CLUSTER:
+        return RedisCluster.from_url(
+            url, max_connections=config.REDIS_MAX_CONNECTIONS, **options
+        )
+
+    if config.REDIS_MODE == RedisMode.SENTINEL:
+        # Из URL берутся только учётные данные и номер базы, адрес мастера даёт Sentinel
+        credentials = {
+            key: value
+            for key, value in parse_url(url).items()
+            if key in ("username", "password", "db")
+        }
+        sentinel = Sentinel(config.REDIS_SENTINEL_NODES, **options, **credentials)
+        return sentinel.master_for(
+            config.REDIS_SENTINEL_MASTER,
+            max_connections=config.REDIS_MAX_CONNECTIONS,
+        )
+
+    # Блокирующий пул: при нехватке соединений команда ждёт, а не падает
+    pool = redis.BlockingConnectionPool.from_url(
+        url,
+        max_connections=config.REDIS_MAX_CONNECTIONS,
+        timeout=config.REDIS_POOL_TIMEOUT_SEC,
+        **options,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def get_redis() -> RedisClient:
+    """Общий клиент Redis процесса"""
+    global _client
+    if _client is None:
+        _client = create_redis()
+        logger.info(
+            f"Создан пул Redis ({settings.redis.REDIS_MODE.value}, "
+            f"до {settings.redis.REDIS_MAX_CONNECTIONS} соединений)"
+        )
+    return _client
+
+
+def set_redis(client: Optional[RedisClient]):
+    """Подменяет общий клиент (бенчмарки, внешний Redis)"""
+    global _client
+    _client = client
+    _scripts.clear()
+
+
+async def load_script(source: str, reload: bool = False) -> str:
+    """Загружает Lua-скрипт один раз на процесс и возвращает его sha"""
+    if reload or source not in _scripts:
+        _scripts[source] = await get_redis().script_load(source)
+        logger.info("Lua script loaded successfully")
+    return _scripts[source]
+
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _scripts.clear()
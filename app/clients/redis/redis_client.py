@@ -1,9 +1,11 @@
 import asyncio
 import time
+from enum import Enum
 from typing import Optional, Tuple
-import redis.asyncio as redis
 from redis.exceptions import RedisError
 
+from app.clients.redis.pool import RedisClient, get_redis, load_script
+
 from app.metrics import (
     REDIS_OPERATIONS,
     RATE_LIMIT_REQUESTS,
@@ -15,49 +17,37 @@ from app.logger import logger
 
 
 class RedisRateLimiter:
+    """
+    Общий лимит запросов к API сервиса по скользящему окну в Redis.
+    Соединения и загруженный Lua-скрипт берутся из общего пула процесса.
+    """
+
     def __init__(
         self,
-        redis_url: str,
         max_requests_per_service: int,
         origin_type: OriginType,
         window_seconds: int = 1,
     ):
-        self.redis_url = redis_url
         self.max_requests_per_service = (
             max_requests_per_service  # Общий лимит для сервиса (IP)
         )
         self.window_seconds = window_seconds
         self.key_prefix = "rate_limiter"
-        self.redis: Optional[redis.Redis] = None
+        self.redis: Optional[RedisClient] = None
         self._script_sha: Optional[str] = None
 
         self.origin_type = origin_type
 
     async def ensure_connection(self):
-        """Гарантирует, что соединение с Redis активно."""
+        """Гарантирует, что клиент получен; переподключения и health check делает пул"""
         if not self.redis:
             await self.connect()
-            return
-
-        try:
-            await self.redis.ping()
-        except (RedisError, ConnectionError):
-            logger.warning("Redis connection lost, reconnecting...")
-            await self.disconnect()
-            await self.connect()
 
     async def connect(self):
-        """Создаёт соединение с Redis и загружает Lua-скрипт."""
+        """Проверяет соединение общего пула и загружает Lua-скрипт."""
         if not self.redis:
             try:
-                self.redis = redis.from_url(
-                    self.redis_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5,
-                    retry_on_timeout=True,
-                )
+                self.redis = get_redis()
                 # Пробуем ping для проверки соединения
                 await self.redis.ping()
                 await self._load_lua_script()
@@ -75,20 +65,25 @@ class RedisRateLimiter:
                 REDIS_OPERATIONS.labels(
                     origin_type=self.origin_type, operation="connect", status="error"
                 ).inc()
-                # Закрываем соединение при ошибке
-                if self.redis:
-                    await self.redis.close()
-                    self.redis = None
+                self.redis = None
                 self._script_sha = None
                 raise
 
-    async def _load_lua_script(self):
+    def _key(self, service: str) -> str:
+        # Hash tag: все ключи сервиса в одном слоте Redis Cluster. Версии до него
+        # считали лимит в rate_limiter:service:OriginType.TAMTAM - см. миграцию в README.
+        # OriginType берётся по значению: f-строка str-Enum даёт OriginType.TAMTAM
+        name = service.value if isinstance(service, Enum) else service
+        return f"{self.key_prefix}:service:{{{name}}}"
+
+    async def _load_lua_script(self, reload: bool = False):
         """Загружает Lua-скрипт для атомарного rate limiting по сервису."""
         lua_script = """
         local key = KEYS[1]
         local max_requests = tonumber(ARGV[1])
         local window = tonumber(ARGV[2])
         local now = tonumber(ARGV[3])
+        local cost = tonumber(ARGV[4] or 1)
         
         -- Удаляем старые записи вне временного окна
         redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
@@ -96,11 +91,13 @@ class RedisRateLimiter:
         -- Получаем текущее количество запросов
         local current = redis.call('ZCARD', key)
         
-        if current < max_requests then
-            -- Добавляем новый запрос с временной меткой
-            redis.call('ZADD', key, now, now)
+        if current + cost <= max_requests then
+            -- Добавляем запрос с временной меткой: по записи на единицу стоимости
+            for i = 1, cost do
+                redis.call('ZADD', key, now, now .. ':' .. i)
+            end
             redis.call('EXPIRE', key, window)
-            return {1, max_requests - current - 1}  -- allowed, remaining
+            return {1, max_requests - current - cost}  -- allowed, remaining
         else
             -- Получаем время самого старого запроса для расчета времени ожидания
             local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
@@ -114,16 +111,18 @@ class RedisRateLimiter:
         """
 
         try:
-            self._script_sha = await self.redis.script_load(lua_script)
-            logger.info("Lua script loaded successfully")
+            self._script_sha = await load_script(lua_script, reload=reload)
         except RedisError as e:
             logger.error(f"Failed to load Lua script: {e}")
             self._script_sha = None
 
-    async def acquire_for_service(self, service: str) -> Tuple[bool, int]:
+    async def acquire_for_service(
+        self, service: str, cost: int = 1
+    ) -> Tuple[bool, int]:
         """
         Rate limiting для конкретного сервиса (tamtam, telegram, etc).
-        Все боты одного сервиса делят общий лимит.
+        Все боты одного сервиса делят общий лимит, cost - сколько единиц лимита
+        расходует запрос.
 
         Returns:
             Tuple[bool, int]: (allowed, remaining_requests_or_wait_time)
@@ -132,7 +131,7 @@ class RedisRateLimiter:
 
         await self.ensure_connection()
 
-        key = f"{self.key_prefix}:service:{service}"
+        key = self._key(service)
         current_time = time.time()
 
         try:
@@ -145,6 +144,7 @@ class RedisRateLimiter:
                         self.max_requests_per_service,
                         self.window_seconds,
                         current_time,
+                        cost,
                     )
                     allowed, remaining = bool(result[0]), int(result[1])
                     REDIS_OPERATIONS.labels(
@@ -157,13 +157,13 @@ class RedisRateLimiter:
                     if "No matching script" in str(e):
                         # ПЕРЕЗАГРУЖАЕМ скрипт при такой ошибке
                         logger.warning("Lua script not found, reloading...")
-                        await self._load_lua_script()
+                        await self._load_lua_script(reload=True)
                         # Пробуем снова с EVAL вместо EVALSHA
-                        return await self._acquire_fallback(key, current_time)
+                        return await self._acquire_fallback(key, current_time, cost)
                     else:
                         raise
             else:
-                return await self._acquire_fallback(key, current_time)
+                return await self._acquire_fallback(key, current_time, cost)
 
         except RedisError as e:
             logger.error(f"Redis error in acquire_for_service: {e}")
@@ -178,21 +178,23 @@ class RedisRateLimiter:
             RATE_LIMIT_WAIT_TIME.labels(origin_type=self.origin_type).observe(duration)
 
     async def _acquire_fallback(
-        self, key: str, current_time: float
+        self, key: str, current_time: float, cost: int = 1
     ) -> Tuple[bool, int]:
         """Fallback реализация через pipeline"""
         async with self.redis.pipeline(transaction=True) as pipe:
             try:
                 pipe.zremrangebyscore(key, 0, current_time - self.window_seconds)
                 pipe.zcard(key)
-                pipe.zadd(key, {str(current_time): current_time})
+                pipe.zadd(
+                    key, {f"{current_time}:{i}": current_time for i in range(cost)}
+                )
                 pipe.expire(key, self.window_seconds)
 
                 results = await pipe.execute()
                 current_count = results[1]
 
-                if current_count <= self.max_requests_per_service:
-                    return True, self.max_requests_per_service - current_count - 1
+                if current_count + cost <= self.max_requests_per_service:
+                    return True, self.max_requests_per_service - current_count - cost
                 else:
                     oldest = await self.redis.zrange(key, 0, 0, withscores=True)
                     if oldest:
@@ -204,7 +206,7 @@ class RedisRateLimiter:
                 logger.error(f"Fallback rate limit error: {e}")
                 return True, self.max_requests_per_service - 1
 
-    async def wait_for_service(self, service: str):
+    async def wait_for_service(self, service: str, cost: int = 1):
         """
         Умное ожидание для конкретного сервиса.
         Все боты этого сервиса будут ждать вместе когда освободится место в общем лимите.
@@ -215,7 +217,7 @@ class RedisRateLimiter:
         wait_start = time.time()
 
         while total_wait_time < max_total_wait:
-            allowed, remaining_or_wait = await self.acquire_for_service(service)
+            allowed, remaining_or_wait = await self.acquire_for_service(service, cost)
 
             if allowed:
                 logger.debug(
@@ -249,7 +251,7 @@ class RedisRateLimiter:
         if not self.redis:
             await self.connect()
 
-        key = f"{self.key_prefix}:service:{service}"
+        key = self._key(service)
         current_time = time.time()
 
         try:
@@ -278,8 +280,6 @@ class RedisRateLimiter:
             return {}
 
     async def disconnect(self):
-        """Закрывает соединение."""
-        if self.redis:
-            await self.redis.close()
-            self.redis = None
-            self._script_sha = None
+        """Отпускает общий клиент; сам пул закрывает close_redis."""
+        self.redis = None
+        self._script_sha = None
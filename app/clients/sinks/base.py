@@ -0,0 +1,72 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+
+from faststream.rabbit import RabbitExchange
+from pydantic import BaseModel
+
+from app.clients.rabbit.routing import Route
+from app.metrics import SINK_MESSAGES_WRITTEN, SINK_WRITE_DURATION
+
+
+class BaseSink(ABC):
+    """
+    Получатель уведомлений: RabbitMQ, Redis Streams, файл.
+
+    write принимает пачку уведомлений одного маршрута и возвращается, когда
+    получатель её сохранил, - ошибки и circuit breaker работают для воркера
+    так же, как при поштучной отправке. Маршрут (очередь или партиция) строит
+    MessageRouter; exchange и routing key имеют смысл только для RabbitMQ,
+    остальные получатели раскладывают уведомления по партициям (route.target).
+    """
+
+    name: str
+    # Размер пачки и окно накопления для BatchPublisher; 1 - поштучная запись
+    batch_max_messages: int = 1
+    batch_max_delay_sec: float = 0.0
+    # Умеет ли получатель отдавать глубину очереди для back-pressure
+    supports_queue_stats: bool = False
+
+    async def start(self):
+        pass
+
+    async def write(self, messages: Sequence[BaseModel], route: Route):
+        started = time.perf_counter()
+        await self._write(messages, route)
+        SINK_WRITE_DURATION.labels(sink=self.name).observe(
+            time.perf_counter() - started
+        )
+        SINK_MESSAGES_WRITTEN.labels(sink=self.name).inc(len(messages))
+
+    @abstractmethod
+    async def _write(self, messages: Sequence[BaseModel], route: Route):
+        pass
+
+    async def send(
+        self,
+        message: BaseModel,
+        queue: str,
+        exchange: Optional[RabbitExchange] = None,
+        routing_key: str = "",
+        priority: Optional[int] = None,
+        partition: str = "",
+    ):
+        """Одно уведомление - пачка из одного сообщения"""
+        await self.write(
+            [message], Route(queue, exchange, routing_key, priority, partition)
+        )
+
+    async def flush(self):
+        """Дописывает буферы получателя"""
+        pass
+
+    @abstractmethod
+    async def check(self) -> bool:
+        pass
+
+    async def queue_stats(self, queue: str) -> Optional[Tuple[int, int]]:
+        """Число сообщений и потребителей очереди; None - глубина неизвестна"""
+        return None
+
+    async def stop(self):
+        await self.flush()
@@ -0,0 +1,188 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from faststream.rabbit import RabbitExchange
+from pydantic import BaseModel
+
+from app.clients.rabbit.routing import Route
+from app.clients.sinks.base import BaseSink
+from app.logger import logger
+from app.utils import tracing
+
+
+@dataclass
+class _Batch:
+    queue: str
+    exchange: Optional[RabbitExchange]
+    routing_key: str
+    priority: Optional[int] = None
+    partition: str = ""
+    messages: List[BaseModel] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    # Спаны публикации уведомлений пачки (при включённой трассировке)
+    links: List = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class BatchPublisher(BaseSink):
+    """
+    Буфер публикаций поверх получателя с тем же интерфейсом send.
+
+    Уведомления копятся по маршруту (очередь, exchange, routing key, партиция) и уходят
+    одной пачкой sink.write (конверт RabbitMQ, pipeline XADD, одна запись в файл)
+    при наборе max_messages или через max_delay_sec после первого сообщения.
+    send возвращается только после публикации пачки, поэтому ошибки и circuit
+    breaker работают для воркера так же, как при поштучной отправке.
+    Пачки одного маршрута публикуются строго по очереди - порядок чата сохраняется.
+
+    Пачки с AMQP-приоритетом (верхняя полоса) уходят без ожидания окна, а пачки
+    ниже по приоритету ждут, пока опубликуются уже собранные пачки выше.
+    """
+
+    def __init__(
+        self,
+        sink: BaseSink,
+        max_messages: int = 50,
+        max_delay_sec: float = 0.02,
+    ):
+        self.sink = sink
+        self.name = sink.name
+        self.supports_queue_stats = sink.supports_queue_stats
+        self.max_messages = max(1, max_messages)
+        self.max_delay_sec = max_delay_sec
+        self.batches: Dict[Tuple, _Batch] = {}
+        self.locks: Dict[Tuple, asyncio.Lock] = {}
+        self.flushing: Set[asyncio.Task] = set()
+        # Собранные, но ещё не опубликованные пачки по приоритету
+        self.pending: Dict[int, int] = {}
+        self.lanes = asyncio.Condition()
+
+    @staticmethod
+    def _key(
+        queue: str,
+        exchange: Optional[RabbitExchange],
+        routing_key: str,
+        priority: Optional[int],
+        partition: str,
+    ):
+        exchange_name = exchange.name if exchange else None
+        return queue, exchange_name, routing_key, priority, partition
+
+    async def write(self, messages: Sequence[BaseModel], route: Route):
+        """Готовая пачка уходит в получатель без буфера"""
+        await self.sink.write(messages, route)
+
+    async def _write(self, messages: Sequence[BaseModel], route: Route):
+        await self.sink.write(messages, route)
+
+    async def send(
+        self,
+        message: BaseModel,
+        queue: str,
+        exchange: Optional[RabbitExchange] = None,
+        routing_key: str = "",
+        priority: Optional[int] = None,
+        partition: str = "",
+    ):
+        loop = asyncio.get_running_loop()
+        key = self._key(queue, exchange, routing_key, priority, partition)
+        batch = self.batches.get(key)
+        if batch is None:
+            batch = _Batch(queue, exchange, routing_key, priority, partition)
+            delay = 0 if priority else self.max_delay_sec
+            batch.timer = loop.call_later(delay, self._schedule_flush, key)
+            self.batches[key] = batch
+
+        future = loop.create_future()
+        batch.messages.append(message)
+        batch.futures.append(future)
+        link = tracing.current_link()
+        if link:
+            batch.links.append(link)
+        if len(batch.messages) >= self.max_messages:
+            self._schedule_flush(key)
+        await future
+
+    def _schedule_flush(self, key: Tuple):
+        batch = self.batches.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        priority = batch.priority or 0
+        self.pending[priority] = self.pending.get(priority, 0) + 1
+        task = asyncio.create_task(self._flush(key, batch))
+        self.flushing.add(task)
+        task.add_done_callback(self.flushing.discard)
+
+    def _higher_pending(self, priority: int) -> bool:
+        return any(count for p, count in self.pending.items() if p > priority)
+
+    async def _flush(self, key: Tuple, batch: _Batch):
+        priority = batch.priority or 0
+        try:
+            async with self.lanes:
+                await self.lanes.wait_for(lambda: not self._higher_pending(priority))
+            await self._publish(key, batch)
+        finally:
+            self.pending[priority] -= 1
+            async with self.lanes:
+                self.lanes.notify_all()
+
+    async def _publish(self, key: Tuple, batch: _Batch):
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # В пачке уведомления разных трейсов: свой трейс со ссылками на них
+            with tracing.span(
+                "publish_batch",
+                {
+                    "messaging.destination.name": batch.queue,
+                    "messaging.batch.message_count": len(batch.messages),
+                },
+                links=batch.links,
+                root=True,
+            ) as current:
+                try:
+                    await self.sink.write(
+                        batch.messages,
+                        Route(
+                            batch.queue,
+                            batch.exchange,
+                            batch.routing_key,
+                            batch.priority,
+                            batch.partition,
+                        ),
+                    )
+                except Exception as e:
+                    tracing.record_error(current, e)
+                    logger.error(
+                        f"Не удалось отправить пачку из {len(batch.messages)} уведомлений в {batch.queue}: {e}"
+                    )
+                    for future in batch.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for future in batch.futures:
+                        if not future.done():
+                            future.set_result(None)
+
+    async def flush(self):
+        """Публикует все накопленные пачки, не дожидаясь таймера"""
+        for key in list(self.batches):
+            self._schedule_flush(key)
+        if self.flushing:
+            await asyncio.gather(*self.flushing, return_exceptions=True)
+        await self.sink.flush()
+
+    async def start(self):
+        await self.sink.start()
+
+    async def check(self) -> bool:
+        return await self.sink.check()
+
+    async def queue_stats(self, queue: str):
+        return await self.sink.queue_stats(queue)
+
+    async def stop(self):
+        await self.flush()
+        await self.sink.stop()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from typing import BinaryIO, Dict, Sequence
+
+from pydantic import BaseModel
+
+from app.clients.rabbit.routing import Route
+from app.clients.sinks.base import BaseSink
+from app.logger import logger
+from app.utils.envelope import dump_message
+
+
+class FileSink(BaseSink):
+    """
+    Локальный файл для пакетной загрузки: JSON Lines, по файлу <partition>.jsonl
+    на партицию (полосу) маршрута в каталоге directory, только дозапись.
+
+    Пачка пишется одним write в отдельном потоке, чтобы диск не блокировал
+    event loop. С fsync пачка считается записанной только после сброса на диск,
+    без него - после передачи ОС (flush и stop сбрасывают всё).
+    """
+
+    name = "file"
+
+    def __init__(
+        self,
+        directory: str,
+        fsync: bool = False,
+        batch_max_messages: int = 100,
+        batch_max_delay_sec: float = 0.02,
+    ):
+        self.directory = directory
+        self.fsync = fsync
+        self.batch_max_messages = batch_max_messages
+        self.batch_max_delay_sec = batch_max_delay_sec
+        self.files: Dict[str, BinaryIO] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file(self, queue: str) -> BinaryIO:
+        file = self.files.get(queue)
+        if file is None:
+            file = self.files[queue] = open(
+                os.path.join(self.directory, f"{queue}.jsonl"), "ab"
+            )
+        return file
+
+    def _append(self, queue: str, data: bytes):
+        file = self._file(queue)
+        file.write(data)
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+    async def _write(self, messages: Sequence[BaseModel], route: Route):
+        data = b"".join(dump_message(message) + b"\n" for message in messages)
+        # Пачки одной партиции не перемешиваются: порядок чата сохраняется
+        target = route.target
+        async with self.locks.setdefault(target, asyncio.Lock()):
+            await asyncio.to_thread(self._append, target, data)
+
+    def _sync(self):
+        for file in self.files.values():
+            file.flush()
+            os.fsync(file.fileno())
+
+    async def flush(self):
+        await asyncio.to_thread(self._sync)
+
+    async def check(self) -> bool:
+        if os.access(self.directory, os.W_OK):
+            return True
+        logger.error(f"Каталог {self.directory} недоступен для записи")
+        return False
+
+    async def stop(self):
+        await self.flush()
+        for file in self.files.values():
+            file.close()
+        self.files.clear()
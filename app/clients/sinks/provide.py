@@ -0,0 +1,49 @@
+from typing import Optional
+
+from app.clients.rabbit.client import RabbitProducerClient
+from app.clients.sinks.base import BaseSink
+from app.clients.sinks.batcher import BatchPublisher
+from app.clients.sinks.file import FileSink
+from app.clients.sinks.rabbit import RabbitSink
+from app.clients.sinks.redis_stream import RedisStreamSink
+from app.config import settings
+from app.enums.sink import SinkType
+
+
+def create_sink(rabbit_client: Optional[RabbitProducerClient] = None) -> BaseSink:
+    """Получатель из SINK_TYPE; для RabbitMQ нужен подключённый клиент"""
+    config = settings.sink
+    if config.SINK_TYPE == SinkType.REDIS_STREAM:
+        return RedisStreamSink(
+            maxlen=config.SINK_REDIS_STREAM_MAXLEN,
+            batch_max_messages=config.SINK_BATCH_MAX_MESSAGES,
+            batch_max_delay_sec=config.SINK_BATCH_MAX_DELAY_MS / 1000,
+        )
+    if config.SINK_TYPE == SinkType.FILE:
+        return FileSink(
+            config.SINK_FILE_DIR,
+            fsync=config.SINK_FILE_FSYNC,
+            batch_max_messages=config.SINK_BATCH_MAX_MESSAGES,
+            batch_max_delay_sec=config.SINK_BATCH_MAX_DELAY_MS / 1000,
+        )
+    return create_rabbit_sink(rabbit_client)
+
+
+def create_rabbit_sink(rabbit_client: RabbitProducerClient) -> RabbitSink:
+    return RabbitSink(
+        rabbit_client,
+        envelope=settings.rabbit.RABBITMQ_ENVELOPE_ENABLED,
+        batch_max_messages=settings.rabbit.RABBITMQ_BATCH_MAX_MESSAGES,
+        batch_max_delay_sec=settings.rabbit.RABBITMQ_BATCH_MAX_DELAY_MS / 1000,
+    )
+
+
+def wrap_batch_publisher(sink: BaseSink) -> BaseSink:
+    """Получатели, которым выгодна запись пачками, получают буфер BatchPublisher"""
+    if sink.batch_max_messages <= 1:
+        return sink
+    return BatchPublisher(
+        sink,
+        max_messages=sink.batch_max_messages,
+        max_delay_sec=sink.batch_max_delay_sec,
+    )
@@ -0,0 +1,52 @@
+from typing import Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.clients.rabbit.client import RabbitProducerClient
+from app.clients.rabbit.routing import Route
+from app.clients.sinks.base import BaseSink
+
+
+class RabbitSink(BaseSink):
+    """
+    RabbitMQ: при включённом конверте пачка уходит одним AMQP-сообщением,
+    иначе каждое уведомление публикуется отдельно.
+    """
+
+    name = "rabbitmq"
+    supports_queue_stats = True
+
+    def __init__(
+        self,
+        publisher: RabbitProducerClient,
+        envelope: bool = False,
+        batch_max_messages: int = 50,
+        batch_max_delay_sec: float = 0.02,
+    ):
+        self.publisher = publisher
+        self.envelope = envelope
+        self.batch_max_messages = batch_max_messages if envelope else 1
+        self.batch_max_delay_sec = batch_max_delay_sec
+
+    async def start(self):
+        await self.publisher.start()
+
+    async def _write(self, messages: Sequence[BaseModel], route: Route):
+        if self.envelope:
+            await self.publisher.send_batch(
+                messages, route.queue, route.exchange, route.routing_key, route.priority
+            )
+            return
+        for message in messages:
+            await self.publisher.send(
+                message, route.queue, route.exchange, route.routing_key, route.priority
+            )
+
+    async def check(self) -> bool:
+        return await self.publisher.check()
+
+    async def queue_stats(self, queue: str) -> Tuple[int, int]:
+        return await self.publisher.queue_stats(queue)
+
+    async def stop(self):
+        await self.publisher.stop()
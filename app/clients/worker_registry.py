@@ -0,0 +1,255 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from app.clients.polling_scheduler import PollingScheduler
+from app.clients.polling_worker import PollingWorker
+from app.clients.rabbit.backpressure import BackpressureController
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.redis.marker_store import MarkerStore
+from app.clients.redis.redis_client import RedisRateLimiter
+from app.clients.sinks.base import BaseSink
+from app.clients.worker_supervisor import WorkerSupervisor
+from app.config import settings
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import (
+    ACTIVE_WORKERS,
+    SHUTDOWN_DRAIN_DURATION,
+    SHUTDOWN_DROPPED_MESSAGES,
+    get_token_suffix,
+)
+from app.origin_clients.base_client import BaseOriginClient
+from app.utils.circuit_breaker.rabbit import CircuitBreakerRabbitClient
+from app.utils.circuit_breaker.redis import CircuitBreakerRedisClient
+from app.utils.coalescer import EditCoalescer
+from app.utils.deduplicator import UpdateDeduplicator
+from app.utils.local_rate_limiter import LocalRateLimiter, degraded_rate
+from app.utils.poll_controller import PollBounds, pool_timeout_cap
+from app.utils.retry import get_retry_policy
+from app.utils.token_source import BaseTokenSource
+
+
+class WorkerRegistry:
+    """
+    Динамический набор PollingWorker'ов одного origin.
+
+    Воркеры запускаются и останавливаются по одному при изменении набора токенов;
+    соединения с RabbitMQ и Redis общие и не пересоздаются. Запросы к API
+    выполняет пул из max_concurrency поллеров (см. PollingScheduler).
+    """
+
+    def __init__(
+        self,
+        origin_type: OriginType,
+        client_factory: Callable[[str], BaseOriginClient],
+        publisher: BaseSink,
+        rate_limiter: RedisRateLimiter,
+        router: MessageRouter,
+        deduplicator: Optional[UpdateDeduplicator] = None,
+        max_concurrency: int = 10,
+        marker_store: Optional[MarkerStore] = None,
+        coalescer: Optional[EditCoalescer] = None,
+        poll_bounds: Optional[PollBounds] = None,
+        fallback_limiter: Optional[LocalRateLimiter] = None,
+        backpressure: Optional[BackpressureController] = None,
+    ):
+        self.origin_type = origin_type
+        self.client_factory = client_factory
+        self.publisher = publisher
+        self.rate_limiter = rate_limiter
+        self.router = router
+        self.deduplicator = deduplicator
+        self.marker_store = marker_store
+        self.coalescer = coalescer
+        self.poll_bounds = poll_bounds
+        self.fallback_limiter = fallback_limiter
+        self.backpressure = backpressure
+
+        self.publisher_cb = CircuitBreakerRabbitClient()
+        self.redis_cb = CircuitBreakerRedisClient()
+        # Общие на все воркеры origin: бюджет повторов считается по зависимости целиком
+        self.fetch_retry = get_retry_policy(origin_type.value)
+        self.redis_retry = get_retry_policy("redis")
+
+        self.workers: Dict[str, PollingWorker] = {}
+        self.supervisor = WorkerSupervisor(
+            origin_type,
+            restart_after=settings.supervisor.SUPERVISOR_RESTART_AFTER_FAILURES,
+            quarantine_sec=settings.supervisor.SUPERVISOR_QUARANTINE_SEC,
+        )
+        self.scheduler = PollingScheduler(
+            origin_type, max_concurrency, supervisor=self.supervisor
+        )
+
+    def _update_metrics(self):
+        ACTIVE_WORKERS.labels(origin_type=self.origin_type).set(len(self.workers))
+        self._cap_poll_timeouts()
+
+    def _cap_poll_timeouts(self):
+        """Адаптивный таймаут не растёт так, чтобы тихие боты задерживали очередь"""
+        if self.poll_bounds is None:
+            return
+        cap = pool_timeout_cap(
+            self.poll_bounds, self.scheduler.max_concurrency, len(self.workers)
+        )
+        for worker in self.workers.values():
+            if worker.poll_controller:
+                worker.poll_controller.cap_timeout(cap)
+
+    async def add(self, token: str, marker: Optional[str] = None):
+        if token in self.workers:
+            return
+
+        worker = PollingWorker(
+            self.client_factory(token),
+            self.publisher,
+            self.rate_limiter,
+            self.publisher_cb,
+            self.redis_cb,
+            self.router,
+            self.deduplicator,
+            self.coalescer,
+            self.poll_bounds,
+            self.fetch_retry,
+            self.redis_retry,
+            self.fallback_limiter,
+            self.backpressure,
+        )
+        if marker is not None:
+            worker.client.set_cursor(marker)
+        self.workers[token] = worker
+        await worker.start()
+        self.scheduler.add(worker)
+        self._update_metrics()
+        logger.info(f"Воркер бота {worker.client.token_suffix} запущен")
+
+    async def remove(self, token: str):
+        worker = self.workers.pop(token, None)
+        if worker is None:
+            return
+        await self.scheduler.remove(worker)
+        await self.checkpoint({token: worker})
+        await worker.stop()
+        self._update_metrics()
+        logger.info(f"Воркер бота {get_token_suffix(token)} остановлен")
+
+    def find(self, token_suffix: str) -> List[PollingWorker]:
+        """Воркеры по суффиксу токена (полный токен в admin API не передаётся)"""
+        return [
+            worker
+            for worker in self.workers.values()
+            if worker.client.token_suffix == token_suffix
+        ]
+
+    def pause(self, worker: PollingWorker):
+        self.scheduler.pause(worker)
+        logger.warning(f"Бот {worker.client.token_suffix} поставлен на паузу")
+
+    def resume(self, worker: PollingWorker):
+        self.scheduler.resume(worker)
+        logger.warning(f"Бот {worker.client.token_suffix} снят с паузы")
+
+    def set_rate_limit(self, max_requests: int):
+        """Новый общий лимит origin для всех воркеров, без переподключения к Redis"""
+        previous = self.rate_limiter.max_requests_per_service
+        # Локальный лимит проверяется первым: при ошибке не меняется ни один
+        if self.fallback_limiter:
+            self.fallback_limiter.set_rate(degraded_rate(max_requests))
+        self.rate_limiter.max_requests_per_service = max_requests
+        logger.warning(
+            f"Лимит {self.origin_type.value} изменён: {previous} -> {max_requests} запросов/с"
+        )
+
+    def worker_state(self, worker: PollingWorker) -> dict:
+        return {
+            "token_suffix": worker.client.token_suffix,
+            "state": self.supervisor.state(worker).value,
+            "paused": worker.paused,
+            "in_flight": worker.in_flight,
+            "failures": self.supervisor.failures.get(worker, 0),
+            "resume_in_sec": round(max(0.0, worker.resume_at - time.monotonic()), 3),
+            "marker": worker.client.get_cursor(),
+        }
+
+    async def sync(self, tokens: Set[str]):
+        """Приводит набор воркеров к переданному набору токенов"""
+        removed = set(self.workers) - tokens
+        await asyncio.gather(*(self.remove(token) for token in removed))
+
+        added = tokens - set(self.workers)
+        markers = await self.marker_store.load_many(added) if self.marker_store else {}
+        await asyncio.gather(*(self.add(token, markers.get(token)) for token in added))
+        if removed:
+            logger.info(f"Набор токенов обновлён: {len(tokens)} ботов, удалено {len(removed)}")
+
+    async def reload(self, source: BaseTokenSource):
+        try:
+            tokens = await source.load()
+        except Exception as e:
+            logger.error(f"Не удалось загрузить токены, оставляем текущий набор: {e}")
+            return
+        if not tokens and self.workers:
+            # Пустой набор чаще означает недописанный файл или сбой источника
+            logger.warning("Источник вернул пустой набор токенов, оставляем текущий")
+            return
+        await self.sync(tokens)
+
+    async def watch(
+        self,
+        source: BaseTokenSource,
+        reload_event: Optional[asyncio.Event] = None,
+        interval_sec: int = 0,
+    ):
+        """
+        Перечитывает источник по сигналу reload_event или раз в interval_sec.
+        Начальный набор загружается заранее через reload().
+        """
+        reload_event = reload_event or asyncio.Event()
+        self.scheduler.start()
+        while True:
+            try:
+                await asyncio.wait_for(reload_event.wait(), interval_sec or None)
+                logger.info("Получен запрос на перезагрузку токенов")
+            except asyncio.TimeoutError:
+                pass
+            reload_event.clear()
+            await self.reload(source)
+
+    async def checkpoint(self, workers: Dict[str, PollingWorker]):
+        if self.marker_store:
+            await self.marker_store.save_many(
+                {token: worker.client.get_cursor() for token, worker in workers.items()}
+            )
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Мягкая остановка: новые запросы не начинаются, полученные апдейты
+        публикуются (не дольше timeout), маркеры сохраняются, клиенты закрываются.
+        """
+        started = time.monotonic()
+        logger.warning(f"Drain {self.origin_type.value}: ждём публикации полученных апдейтов до {timeout}с")
+        dropped = await self.scheduler.drain(timeout)
+        if self.coalescer:
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            dropped += await self.coalescer.flush(remaining)
+
+        workers, self.workers = self.workers, {}
+        for worker in workers.values():
+            worker.is_running = False
+        await self.checkpoint(workers)
+        await asyncio.gather(*(worker.stop() for worker in workers.values()))
+        self._update_metrics()
+
+        duration = time.monotonic() - started
+        SHUTDOWN_DRAIN_DURATION.labels(origin_type=self.origin_type).set(duration)
+        if dropped:
+            SHUTDOWN_DROPPED_MESSAGES.labels(origin_type=self.origin_type).inc(dropped)
+        logger.warning(
+            f"Drain {self.origin_type.value} завершён за {duration:.2f}с, потеряно апдейтов: {dropped}"
+        )
+        return dropped
+
+    async def stop_all(self):
+        await self.scheduler.stop()
+        await asyncio.gather(*(self.remove(token) for token in list(self.workers)))
@@ -0,0 +1,110 @@
+from typing import Dict
+
+import httpx
+
+from app.clients.polling_worker import PollingWorker
+from app.enums.polling_workers import OriginType, WorkerState
+from app.logger import logger
+from app.metrics import WORKER_RESTARTS, WORKER_STATE
+
+# Токен отозван или бот заблокирован: повторы бесполезны до замены токена
+AUTH_ERROR_STATUSES = {401, 403}
+
+
+def is_auth_error(exc: BaseException) -> bool:
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and exc.response.status_code in AUTH_ERROR_STATUSES
+    )
+
+
+class WorkerSupervisor:
+    """
+    Изоляция сбоев отдельных ботов в пуле поллеров.
+
+    Ошибка цикла одного воркера не влияет на остальные: воркер уходит в паузу
+    (см. RetryPolicy), после restart_after ошибок подряд его клиент пересоздаётся,
+    а токен с ответом 401/403 помещается в карантин на quarantine_sec.
+    """
+
+    def __init__(
+        self,
+        origin_type: OriginType,
+        restart_after: int = 5,
+        quarantine_sec: float = 600.0,
+    ):
+        self.origin_type = origin_type
+        self.restart_after = max(1, restart_after)
+        self.quarantine_sec = quarantine_sec
+        self.failures: Dict[PollingWorker, int] = {}
+        self.states: Dict[PollingWorker, WorkerState] = {}
+
+    def _set_state(self, worker: PollingWorker, state: WorkerState):
+        previous = self.states.get(worker)
+        if previous == state:
+            return
+        self.states[worker] = state
+        for value in WorkerState:
+            WORKER_STATE.labels(
+                origin_type=self.origin_type,
+                token_suffix=worker.client.token_suffix,
+                state=value.value,
+            ).set(1 if value == state else 0)
+        if previous is not None:
+            logger.info(
+                f"Бот {worker.client.token_suffix}: состояние {previous.value} -> {state.value}"
+            )
+
+    def set_paused(self, worker: PollingWorker, paused: bool):
+        """Ручная пауза из admin API; после снятия бот считается работающим"""
+        self.failures.pop(worker, None)
+        self._set_state(worker, WorkerState.PAUSED if paused else WorkerState.RUNNING)
+
+    def state(self, worker: PollingWorker) -> WorkerState:
+        return self.states.get(worker, WorkerState.RUNNING)
+
+    def on_success(self, worker: PollingWorker):
+        self.failures.pop(worker, None)
+        if not worker.paused:
+            self._set_state(worker, WorkerState.RUNNING)
+
+    async def on_failure(self, worker: PollingWorker, exc: BaseException):
+        if is_auth_error(exc):
+            worker.backoff(self.quarantine_sec)
+            self._set_state(worker, WorkerState.QUARANTINED)
+            logger.error(
+                f"Бот {worker.client.token_suffix}: API ответил {exc.response.status_code}, "
+                f"токен в карантине на {self.quarantine_sec:.0f}с"
+            )
+            return
+
+        failures = self.failures.get(worker, 0) + 1
+        self.failures[worker] = failures
+        self._set_state(worker, WorkerState.BACKOFF)
+        logger.error(
+            f"Бот {worker.client.token_suffix}: ошибка цикла поллинга ({failures} подряд): {exc}"
+        )
+        if failures % self.restart_after == 0:
+            await self.restart(worker)
+
+    async def restart(self, worker: PollingWorker):
+        logger.warning(f"Перезапуск воркера бота {worker.client.token_suffix}")
+        WORKER_RESTARTS.labels(
+            origin_type=self.origin_type, token_suffix=worker.client.token_suffix
+        ).inc()
+        try:
+            await worker.restart()
+        except Exception as e:
+            logger.error(f"Бот {worker.client.token_suffix}: ошибка перезапуска: {e}")
+
+    def forget(self, worker: PollingWorker):
+        self.failures.pop(worker, None)
+        if self.states.pop(worker, None) is None:
+            return
+        for value in WorkerState:
+            try:
+                WORKER_STATE.remove(
+                    self.origin_type, worker.client.token_suffix, value.value
+                )
+            except KeyError:
+                pass
@@ -1,9 +1,25 @@
-from typing import List
+from typing import List, Optional, Tuple
 
-from pydantic import SecretStr, computed_field
+from pydantic import AliasChoices, Field, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.enums.logging import LoggingLevel
+from app.enums.polling_workers import OriginType, TokenSourceType
+from app.enums.rabbit import (
+    MessageCompression,
+    NotificationsQueueType,
+    PriorityMode,
+    RoutingExchangeType,
+    RoutingKeyField,
+)
+from app.enums.redis import RedisMode
+from app.enums.sink import SinkType
+from app.enums.tracing import TracingExporter
+
+
+def split_csv(value: str) -> List[str]:
+    """Список из строки через запятую, пустые элементы отбрасываются"""
+    return [item.strip() for item in value.split(",") if item.strip()]
 
 
 class BaseSettingsConfig(BaseSettings):
@@ -24,11 +40,43 @@ class RabbitMQSettings(BaseSettingsConfig):
     RABBITMQ_USER: SecretStr
     RABBITMQ_PASS: SecretStr
 
+    # Повторы публикации: экспоненциальная задержка с jitter не больше RABBITMQ_BACKOFF_SEC
     RABBITMQ_MAX_RETRIES: int = 3
     RABBITMQ_BACKOFF_SEC: int = 5
 
+    # Ожидание брокера при старте: экспоненциальная задержка с jitter
+    RABBITMQ_STARTUP_MAX_RETRIES: int = 10
+    RABBITMQ_STARTUP_BACKOFF_BASE_SEC: float = 0.5
+    RABBITMQ_STARTUP_BACKOFF_MAX_SEC: float = 10.0
+
     RABBITMQ_NOTIFICATIONS_QUEUE: str = "notifications"
 
+    # Маршрутизация: при RABBITMQ_PARTITIONS > 1 объявляются очереди notifications.0..N-1,
+    # сообщения одного ключа (chat_id или origin_type) всегда попадают в одну партицию
+    RABBITMQ_EXCHANGE: str = ""
+    RABBITMQ_EXCHANGE_TYPE: RoutingExchangeType = RoutingExchangeType.DEFAULT
+    RABBITMQ_ROUTING_KEY_FIELD: RoutingKeyField = RoutingKeyField.CHAT_ID
+    RABBITMQ_PARTITIONS: int = 1
+    RABBITMQ_QUEUE_TYPE: NotificationsQueueType = NotificationsQueueType.CLASSIC
+
+    # Конверт: до RABBITMQ_BATCH_MAX_MESSAGES уведомлений в одном AMQP-сообщении,
+    # пачки от RABBITMQ_COMPRESSION_MIN_BYTES сжимаются (zstd требует пакет zstandard)
+    RABBITMQ_ENVELOPE_ENABLED: bool = False
+    RABBITMQ_BATCH_MAX_MESSAGES: int = 50
+    RABBITMQ_BATCH_MAX_DELAY_MS: int = 20
+    RABBITMQ_COMPRESSION: MessageCompression = MessageCompression.GZIP
+    RABBITMQ_COMPRESSION_MIN_BYTES: int = 1024
+
+    # Полосы приоритета: типы апдейтов из RABBITMQ_PRIORITY_TYPES (нажатия кнопок)
+    # публикуются раньше остальных и попадают в приоритетную очередь
+    RABBITMQ_PRIORITY_MODE: PriorityMode = PriorityMode.NONE
+    RABBITMQ_PRIORITY_TYPES: str = "message_callback"
+
+    @computed_field
+    @property
+    def RABBITMQ_PRIORITY_TYPES_LIST(self) -> List[str]:
+        return split_csv(self.RABBITMQ_PRIORITY_TYPES)
+
     @computed_field
     @property
     def RABBIT_URL(self) -> SecretStr:
@@ -52,6 +100,35 @@ class TamTamSettings(BaseSettingsConfig):
     TAM_TAM_TOKENS_STR: SecretStr = ""
     TAM_TAM_MAX_POLLING_BOTS: int = 10
 
+    # Источник токенов для горячей перезагрузки (SIGHUP или раз в TAM_TAM_TOKENS_RELOAD_SEC)
+    TAM_TAM_TOKENS_SOURCE: TokenSourceType = TokenSourceType.ENV
+    TAM_TAM_TOKENS_FILE: str = "tokens.txt"
+    TAM_TAM_TOKENS_REDIS_KEY: str = "tamtam:tokens"
+    TAM_TAM_TOKENS_RELOAD_SEC: int = 30
+
+    # Прикладывать к уведомлению исходный JSON апдейта (поле raw)
+    TAM_TAM_RAW_PASSTHROUGH: bool = False
+
+    # Общий лимит запросов к API в секунду на все боты, размер пачки и long-poll таймаут
+    TAM_TAM_RATE_LIMIT: int = Field(2, gt=0)
+    TAM_TAM_POLL_LIMIT: int = 100
+    TAM_TAM_POLL_TIMEOUT_SEC: int = 1
+    # Адаптивный подбор: простаивающим ботам таймаут растёт до TAM_TAM_POLL_TIMEOUT_MAX_SEC
+    # (API допускает 90), активным limit растёт до TAM_TAM_POLL_LIMIT_MAX (API допускает 1000).
+    # Выключен по умолчанию: тихий бот держит поллер из общего пула на весь таймаут
+    TAM_TAM_POLL_ADAPTIVE: bool = False
+    TAM_TAM_POLL_TIMEOUT_MAX_SEC: int = 30
+    TAM_TAM_POLL_LIMIT_MAX: int = 1000
+
+    # Нужные типы апдейтов через запятую (message_created,message_callback,...),
+    # передаются в параметр types запроса. Пусто - все типы
+    TAM_TAM_UPDATE_TYPES: str = ""
+
+    @computed_field
+    @property
+    def TAM_TAM_UPDATE_TYPES_LIST(self) -> List[str]:
+        return split_csv(self.TAM_TAM_UPDATE_TYPES)
+
     @computed_field
     @property
     def TAM_TAM_TOKENS(self) -> List[SecretStr]:
@@ -62,10 +139,208 @@ class TamTamSettings(BaseSettingsConfig):
         ]
 
 
+class TelegramSettings(BaseSettingsConfig):
+    """Настройки Telegram"""
+
+    TELEGRAM_TOKENS_STR: SecretStr = ""
+    TELEGRAM_MAX_POLLING_BOTS: int = 10
+
+    TELEGRAM_TOKENS_SOURCE: TokenSourceType = TokenSourceType.ENV
+    TELEGRAM_TOKENS_FILE: str = "telegram_tokens.txt"
+    TELEGRAM_TOKENS_REDIS_KEY: str = "telegram:tokens"
+    TELEGRAM_TOKENS_RELOAD_SEC: int = 30
+
+    TELEGRAM_RAW_PASSTHROUGH: bool = False
+
+    TELEGRAM_RATE_LIMIT: int = Field(30, gt=0)
+    TELEGRAM_POLL_LIMIT: int = 100
+    TELEGRAM_POLL_TIMEOUT_SEC: int = 1
+    TELEGRAM_POLL_ADAPTIVE: bool = False
+    TELEGRAM_POLL_TIMEOUT_MAX_SEC: int = 30
+    TELEGRAM_POLL_LIMIT_MAX: int = 100
+
+    # Общие имена типов, как у TamTam; передаются в allowed_updates
+    TELEGRAM_UPDATE_TYPES: str = ""
+
+    @computed_field
+    @property
+    def TELEGRAM_UPDATE_TYPES_LIST(self) -> List[str]:
+        return split_csv(self.TELEGRAM_UPDATE_TYPES)
+
+    @computed_field
+    @property
+    def TELEGRAM_TOKENS(self) -> List[SecretStr]:
+        return [
+            SecretStr(token.strip())
+            for token in self.TELEGRAM_TOKENS_STR.get_secret_value().split(",")
+            if token.strip()
+        ]
+
+
+class OriginsSettings(BaseSettingsConfig):
+    """Набор мессенджеров, которые опрашивает сервис"""
+
+    ORIGINS_ENABLED: str = "TAMTAM"
+
+    @computed_field
+    @property
+    def ORIGINS(self) -> List[OriginType]:
+        return [
+            OriginType(origin.strip().upper())
+            for origin in self.ORIGINS_ENABLED.split(",")
+            if origin.strip()
+        ]
+
+
+class SinkSettings(BaseSettingsConfig):
+    """Куда публикуются уведомления"""
+
+    SINK_TYPE: SinkType = SinkType.RABBITMQ
+    # Пачки для Redis Streams и файла (для RabbitMQ - RABBITMQ_BATCH_* при включённом конверте)
+    SINK_BATCH_MAX_MESSAGES: int = 100
+    SINK_BATCH_MAX_DELAY_MS: int = 20
+    # Redis Streams: поток на очередь (партицию), приблизительная обрезка XADD MAXLEN ~;
+    # 0 - без обрезки
+    SINK_REDIS_STREAM_MAXLEN: int = 1000000
+    # Файл: JSON Lines, по файлу на очередь в SINK_FILE_DIR; fsync после каждой пачки
+    SINK_FILE_DIR: str = "data/notifications"
+    SINK_FILE_FSYNC: bool = False
+
+
+class BackpressureSettings(BaseSettingsConfig):
+    """Замедление поллинга по глубине очередей уведомлений"""
+
+    BACKPRESSURE_ENABLED: bool = False
+    BACKPRESSURE_INTERVAL_SEC: float = 5.0
+    # Пороги по самой глубокой из очередей (партиций), сообщений
+    BACKPRESSURE_THROTTLE_DEPTH: int = 10000
+    # Выше второго порога поллинг встаёт, апдейты ждут на стороне мессенджера.
+    # Старое имя BACKPRESSURE_PRIORITY_ONLY_DEPTH читается для совместимости
+    BACKPRESSURE_PAUSE_DEPTH: int = Field(
+        50000,
+        validation_alias=AliasChoices(
+            "BACKPRESSURE_PAUSE_DEPTH", "BACKPRESSURE_PRIORITY_ONLY_DEPTH"
+        ),
+    )
+    # Пауза бота между запросами к API выше первого порога, с
+    BACKPRESSURE_THROTTLE_DELAY_SEC: float = 2.0
+
+
 class RedisSettings(BaseSettingsConfig):
     """Настройки для подключения к Redis"""
 
     REDIS_URL: SecretStr
+    # Один пул на процесс: лимитеры, дедупликация, маркеры и источник токенов
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_POOL_TIMEOUT_SEC: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL_SEC: int = 30
+    REDIS_SOCKET_TIMEOUT_SEC: float = 5.0
+    REDIS_MODE: RedisMode = RedisMode.STANDALONE
+    # host:port через запятую, для REDIS_MODE=SENTINEL
+    REDIS_SENTINELS: str = ""
+    REDIS_SENTINEL_MASTER: str = "mymaster"
+    # Пока Redis недоступен, лимит API считается в процессе: доля общего лимита,
+    # поделённая на число реплик сервиса; нулевой лимит остановил бы поллинг
+    REDIS_DEGRADED_ENABLED: bool = True
+    REDIS_DEGRADED_LIMIT_RATIO: float = Field(0.5, gt=0, le=1)
+    REDIS_DEGRADED_REPLICAS: int = Field(1, ge=1)
+
+    @computed_field
+    @property
+    def REDIS_SENTINEL_NODES(self) -> List[Tuple[str, int]]:
+        nodes = []
+        for node in self.REDIS_SENTINELS.split(","):
+            if node.strip():
+                host, _, port = node.strip().rpartition(":")
+                nodes.append((host, int(port)))
+        return nodes
+
+
+class DeduplicationSettings(BaseSettingsConfig):
+    """Настройки дедупликации апдейтов"""
+
+    DEDUP_ENABLED: bool = True
+    DEDUP_LRU_SIZE: int = 10000
+    DEDUP_REDIS_ENABLED: bool = False
+    DEDUP_TTL_SEC: int = 86400
+
+
+class ChatCacheSettings(BaseSettingsConfig):
+    """Кеш метаданных чатов (название, тип, собеседник) по chat_id"""
+
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_CACHE_SIZE: int = 100000
+    CHAT_CACHE_TTL_SEC: int = 3600
+
+
+class CoalesceSettings(BaseSettingsConfig):
+    """Настройки склейки правок сообщений перед публикацией"""
+
+    # Доставка не более одного раза: придержанные апдейты подтверждаются (маркер сдвигается)
+    # до публикации. Kill/падение процесса в окне теряет их, ошибка публикации не повторяется;
+    # дописывает накопленное только drain при SIGTERM
+    COALESCE_ENABLED: bool = False
+    COALESCE_WINDOW_MS: int = 500
+
+
+class RetrySettings(BaseSettingsConfig):
+    """Общая политика повторов: задержки и бюджет на зависимость"""
+
+    RETRY_BASE_DELAY_SEC: float = 0.5
+    RETRY_MAX_DELAY_SEC: float = 30.0
+    # Не дольше этого ждём по Retry-After / HTTP 429
+    RETRY_AFTER_MAX_SEC: float = 120.0
+    # Повторов за окно - не больше доли от запросов плюс минимальный запас
+    RETRY_BUDGET_RATIO: float = 0.1
+    RETRY_BUDGET_MIN_RETRIES: int = 10
+    RETRY_BUDGET_WINDOW_SEC: int = 10
+
+
+class SupervisorSettings(BaseSettingsConfig):
+    """Настройки надзора за воркерами"""
+
+    # Ошибок подряд, после которых клиент бота пересоздаётся
+    SUPERVISOR_RESTART_AFTER_FAILURES: int = 5
+    # Пауза для токена, получившего 401/403
+    SUPERVISOR_QUARANTINE_SEC: float = 600.0
+
+
+class ShutdownSettings(BaseSettingsConfig):
+    """Настройки остановки сервиса"""
+
+    SHUTDOWN_DRAIN_TIMEOUT_SEC: float = 20.0
+    SHUTDOWN_CHECKPOINT_MARKERS: bool = True
+
+
+class HealthSettings(BaseSettingsConfig):
+    """Проверки для /health и /ready (отдаются на порту admin API без токена)"""
+
+    HEALTH_ENABLED: bool = True
+    HEALTH_CHECK_INTERVAL_SEC: float = 5.0
+    HEALTH_CHECK_TIMEOUT_SEC: float = 2.0
+    # Без завершённых циклов поллинга дольше этого сервис не готов
+    HEALTH_STALE_SEC: float = 120.0
+
+
+class AdminSettings(BaseSettingsConfig):
+    """Admin HTTP API: состояние и настройка воркеров, лимитов и выключателей на ходу"""
+
+    ADMIN_HOST: str = "0.0.0.0"
+    ADMIN_PORT: int = 8000
+    # Bearer-токен; без него admin API выключен (остаются /health и /ready)
+    ADMIN_TOKEN: Optional[SecretStr] = None
+
+
+class TracingSettings(BaseSettingsConfig):
+    """OpenTelemetry-трассировка пути поллинг -> лимит -> публикация (нужен opentelemetry-sdk)"""
+
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "notification-container"
+    # Доля трейсов, начинающихся в сервисе (0..1)
+    TRACING_SAMPLE_RATIO: float = 0.1
+    TRACING_EXPORTER: TracingExporter = TracingExporter.OTLP
+    TRACING_OTLP_ENDPOINT: str = "http://polling_jaeger:4318/v1/traces"
+    TRACING_FILE_PATH: str = "data/traces.jsonl"
 
 
 class PrometheusSettings(BaseSettingsConfig):
@@ -80,7 +355,20 @@ class Settings(BaseSettings):
     rabbit: RabbitMQSettings = RabbitMQSettings()
     logging: LoggingSettings = LoggingSettings()
     tam_tam: TamTamSettings = TamTamSettings()
+    telegram: TelegramSettings = TelegramSettings()
+    origins: OriginsSettings = OriginsSettings()
+    sink: SinkSettings = SinkSettings()
+    backpressure: BackpressureSettings = BackpressureSettings()
     redis: RedisSettings = RedisSettings()
+    dedup: DeduplicationSettings = DeduplicationSettings()
+    chat_cache: ChatCacheSettings = ChatCacheSettings()
+    coalesce: CoalesceSettings = CoalesceSettings()
+    retry: RetrySettings = RetrySettings()
+    supervisor: SupervisorSettings = SupervisorSettings()
+    shutdown: ShutdownSettings = ShutdownSettings()
+    health: HealthSettings = HealthSettings()
+    admin: AdminSettings = AdminSettings()
+    tracing: TracingSettings = TracingSettings()
     prometheus: PrometheusSettings = PrometheusSettings()
 
 
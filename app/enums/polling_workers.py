@@ -3,3 +3,17 @@ from enum import Enum
 
 class OriginType(str, Enum):
     TAMTAM = "TAMTAM"
+    TELEGRAM = "TELEGRAM"
+
+
+class TokenSourceType(str, Enum):
+    ENV = "ENV"
+    FILE = "FILE"
+    REDIS = "REDIS"
+
+
+class WorkerState(str, Enum):
+    RUNNING = "running"
+    BACKOFF = "backoff"
+    QUARANTINED = "quarantined"
+    PAUSED = "paused"
@@ -0,0 +1,44 @@
+from enum import Enum
+
+
+class RoutingExchangeType(str, Enum):
+    DEFAULT = "default"
+    DIRECT = "direct"
+    TOPIC = "topic"
+    CONSISTENT_HASH = "x-consistent-hash"
+
+
+class RoutingKeyField(str, Enum):
+    CHAT_ID = "chat_id"
+    ORIGIN_TYPE = "origin_type"
+
+
+class NotificationsQueueType(str, Enum):
+    CLASSIC = "classic"
+    QUORUM = "quorum"
+    STREAM = "stream"
+
+
+class MessageCompression(str, Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class BackpressureMode(str, Enum):
+    NORMAL = "normal"
+    THROTTLE = "throttle"
+    PAUSE = "pause"
+
+
+class PriorityLane(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+
+
+class PriorityMode(str, Enum):
+    NONE = "none"
+    # Одна очередь с x-max-priority, приоритет ставится на сообщение
+    PRIORITY_QUEUE = "priority_queue"
+    # Апдейты верхней полосы идут в отдельную очередь <queue>.priority
+    SEPARATE_QUEUE = "separate_queue"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class RedisMode(str, Enum):
+    STANDALONE = "STANDALONE"
+    SENTINEL = "SENTINEL"
+    CLUSTER = "CLUSTER"
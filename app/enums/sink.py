@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SinkType(str, Enum):
+    RABBITMQ = "rabbitmq"
+    REDIS_STREAM = "redis_stream"
+    FILE = "file"
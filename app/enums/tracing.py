@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TracingExporter(str, Enum):
+    # OTLP/HTTP: локальный коллектор, Jaeger, Tempo
+    OTLP = "otlp"
+    # JSON-строка на спан, для разбора без коллектора
+    FILE = "file"
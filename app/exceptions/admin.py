@@ -0,0 +1,7 @@
+class AdminAPIError(Exception):
+    """Ошибка запроса к admin API: статус HTTP и сообщение для клиента"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
@@ -4,15 +4,17 @@ import sys
 from loguru import logger
 
 from app.config import settings
+from app.enums.logging import LoggingLevel
 
 logger.remove()
-logger.add(
+_stdout_handler = logger.add(
     sys.stdout,
     level=settings.logging.LOGGING_LEVEL,
     backtrace=True,
     diagnose=True,  # только для dev
     enqueue=True,
 )
+log_level = settings.logging.LOGGING_LEVEL
 
 # Логи INFO, DEBUG, WARNING - в отдельный файл
 logger.add(
@@ -42,6 +44,28 @@ logger.add(
 )
 
 
+def get_log_level() -> LoggingLevel:
+    return log_level
+
+
+def set_log_level(level: LoggingLevel):
+    """Меняет уровень вывода в stdout без перезапуска; файловые логи не меняются"""
+    global _stdout_handler, log_level
+    handler = logger.add(
+        sys.stdout,
+        level=level.value,
+        backtrace=True,
+        diagnose=True,  # только для dev
+        enqueue=True,
+    )
+    try:
+        logger.remove(_stdout_handler)
+    except ValueError:
+        # Обработчик уже сняли снаружи (например, бенчмарки глушат логи)
+        pass
+    _stdout_handler, log_level = handler, level
+
+
 class InterceptHandler(logging.Handler):
     def emit(self, record):
         try:
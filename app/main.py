@@ -1,5 +1,6 @@
 import asyncio
 import signal
+import sys
 from prometheus_client import start_http_server
 from datetime import datetime
 
@@ -8,39 +9,62 @@ from app.logger import logger
 from app.on_startup import on_startup
 from app.service import start_all_workers
 from app.utils.loop_settings import handle_async_exception, safe_create_task
-from app.utils.rabbit_waiter import wait_for_rabbit
+from app.utils.tracing import setup_tracing, shutdown_tracing
 from app.metrics import registry, SERVICE_INFO
 
 
-async def main():
+async def start_service(reload_event: asyncio.Event):
+    publisher = await on_startup()
+    await start_all_workers(publisher, reload_event)
+
+
+async def serve(stop_event: asyncio.Event, reload_event: asyncio.Event) -> int:
+    """
+    Работает до сигнала остановки и возвращает код выхода. Если запуск
+    (например, ожидание RabbitMQ) или воркеры упали сами, код ненулевой:
+    процесс завершается, а не висит без воркеров.
+    """
+    logger.info("Запускаем всех воркеров...")
+    task = safe_create_task(start_service(reload_event), name="start_all_workers")
+    task.add_done_callback(lambda _: stop_event.set())
+
+    await stop_event.wait()
+    logger.warning("Останавливаем всех воркеров...")
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    if not task.cancelled() and task.exception() is not None:
+        logger.critical("Сервис остановлен из-за ошибки запуска или воркеров")
+        return 1
+    return 0
+
+
+async def main() -> int:
     SERVICE_INFO.info(
         {
             "start_time": datetime.now().isoformat(),
         }
     )
     start_http_server(settings.prometheus.METRICS_PORT, registry=registry)
+    setup_tracing()
 
     loop = asyncio.get_event_loop()
     stop_event = asyncio.Event()
+    reload_event = asyncio.Event()
 
     def handle_sigterm():
         stop_event.set()
 
     loop.add_signal_handler(signal.SIGTERM, handle_sigterm)
     loop.add_signal_handler(signal.SIGINT, handle_sigterm)
+    loop.add_signal_handler(signal.SIGHUP, reload_event.set)
     loop.set_exception_handler(handle_async_exception)
 
-    logger.info("Запускаем всех воркеров...")
-    task = safe_create_task(start_all_workers(), name="start_all_workers")
-
-    await stop_event.wait()
-    logger.warning("Останавливаем всех воркеров...")
-    task.cancel()
-    await asyncio.gather(task, return_exceptions=True)
+    try:
+        return await serve(stop_event, reload_event)
+    finally:
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
     logger.info(f"Все настройки инициализированы: {settings}")
-    asyncio.run(wait_for_rabbit())
-    asyncio.run(on_startup())
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
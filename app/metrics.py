@@ -72,6 +72,20 @@ RATE_LIMIT_WAIT_TIME = Histogram(
     registry=registry,
 )
 
+RATE_LIMIT_DEGRADED = Gauge(
+    "origin_rate_limit_degraded",
+    "Лимит считается локально, потому что Redis недоступен (1 = да)",
+    ["origin_type"],
+    registry=registry,
+)
+
+RATE_LIMIT_DEGRADED_SECONDS = Counter(
+    "origin_rate_limit_degraded_seconds_total",
+    "Время работы с локальным лимитом вместо Redis",
+    ["origin_type"],
+    registry=registry,
+)
+
 # Метрики очереди RabbitMQ
 RABBITMQ_MESSAGES_SENT = Counter(
     "origin_rabbitmq_messages_sent_total",
@@ -95,6 +109,216 @@ REDIS_OPERATIONS = Counter(
     registry=registry,
 )
 
+# Метрики дедупликации
+DEDUP_CHECKS = Counter(
+    "origin_dedup_checks_total",
+    "Количество проверенных апдейтов в индексе дедупликации",
+    ["origin_type", "layer", "result"],
+    registry=registry,
+)
+
+COALESCED_UPDATES = Counter(
+    "origin_coalesced_updates_total",
+    "Правки, склеенные с ещё не опубликованной версией сообщения",
+    ["origin_type"],
+    registry=registry,
+)
+
+# Кеш метаданных чатов
+CHAT_CACHE_REQUESTS = Counter(
+    "origin_chat_cache_requests_total",
+    "Обращения к кешу метаданных чатов",
+    ["origin_type", "result"],
+    registry=registry,
+)
+
+CHAT_CACHE_EVICTIONS = Counter(
+    "origin_chat_cache_evictions_total",
+    "Записи, вытесненные из кеша метаданных чатов (size - LRU, expired - TTL)",
+    ["origin_type", "reason"],
+    registry=registry,
+)
+
+CHAT_CACHE_SIZE = Gauge(
+    "origin_chat_cache_size",
+    "Записей в кеше метаданных чатов",
+    ["origin_type"],
+    registry=registry,
+)
+
+# Метрики воркеров
+ACTIVE_WORKERS = Gauge(
+    "origin_active_workers",
+    "Количество запущенных воркеров поллинга",
+    ["origin_type"],
+    registry=registry,
+)
+
+SCHEDULER_BUSY_POLLERS = Gauge(
+    "origin_scheduler_busy_pollers",
+    "Количество поллеров пула, выполняющих запрос",
+    ["origin_type"],
+    registry=registry,
+)
+
+SCHEDULER_QUEUE_WAIT = Histogram(
+    "origin_scheduler_queue_wait_seconds",
+    "Время ожидания воркера в очереди на свободный поллер",
+    ["origin_type"],
+    buckets=[0.01, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+
+WORKER_STATE = Gauge(
+    "origin_worker_state",
+    "Состояние воркера: 1 для текущего состояния, 0 для остальных",
+    ["origin_type", "token_suffix", "state"],
+    registry=registry,
+)
+
+WORKER_RESTARTS = Counter(
+    "origin_worker_restarts_total",
+    "Перезапуски клиента воркера после серии ошибок",
+    ["origin_type", "token_suffix"],
+    registry=registry,
+)
+
+# Повторы
+RETRY_ATTEMPTS = Counter(
+    "origin_retry_attempts_total",
+    "Повторные попытки обращения к зависимости",
+    ["dependency"],
+    registry=registry,
+)
+
+RETRY_BUDGET_EXHAUSTED = Counter(
+    "origin_retry_budget_exhausted_total",
+    "Повторы, отклонённые из-за исчерпанного бюджета",
+    ["dependency"],
+    registry=registry,
+)
+
+FILTERED_UPDATES = Counter(
+    "origin_filtered_updates_total",
+    "Апдейты ненужных типов, отброшенные до разбора",
+    ["origin_type", "update_type"],
+    registry=registry,
+)
+
+# Адаптивный long-poll
+POLL_TIMEOUT = Gauge(
+    "origin_poll_timeout_seconds",
+    "Текущий long-poll таймаут запроса апдейтов",
+    ["origin_type", "token_suffix"],
+    registry=registry,
+)
+
+POLL_LIMIT = Gauge(
+    "origin_poll_limit",
+    "Текущий размер пачки запроса апдейтов",
+    ["origin_type", "token_suffix"],
+    registry=registry,
+)
+
+EMPTY_POLLS = Counter(
+    "origin_empty_polls_total",
+    "Запросы апдейтов, вернувшие пустой ответ",
+    ["origin_type"],
+    registry=registry,
+)
+
+# Метрики запуска
+STARTUP_PHASE_DURATION = Gauge(
+    "origin_startup_phase_duration_seconds",
+    "Длительность фаз запуска сервиса",
+    ["phase"],
+    registry=registry,
+)
+
+# Метрики остановки
+SHUTDOWN_DRAIN_DURATION = Gauge(
+    "origin_shutdown_drain_duration_seconds",
+    "Длительность последнего drain при остановке",
+    ["origin_type"],
+    registry=registry,
+)
+
+SHUTDOWN_DROPPED_MESSAGES = Counter(
+    "origin_shutdown_dropped_messages_total",
+    "Апдейты, не опубликованные до истечения дедлайна drain",
+    ["origin_type"],
+    registry=registry,
+)
+
+# Back-pressure по глубине очередей
+RABBITMQ_QUEUE_DEPTH = Gauge(
+    "origin_rabbitmq_queue_depth",
+    "Сообщений в очереди уведомлений (passive declare)",
+    ["queue"],
+    registry=registry,
+)
+
+RABBITMQ_QUEUE_CONSUMERS = Gauge(
+    "origin_rabbitmq_queue_consumers",
+    "Потребителей очереди уведомлений",
+    ["queue"],
+    registry=registry,
+)
+
+BACKPRESSURE_MODE = Gauge(
+    "origin_backpressure_mode",
+    "Режим поллинга: 1 для текущего режима, 0 для остальных",
+    ["mode"],
+    registry=registry,
+)
+
+# Получатели уведомлений
+SINK_MESSAGES_WRITTEN = Counter(
+    "origin_sink_messages_written_total",
+    "Уведомления, принятые получателем",
+    ["sink"],
+    registry=registry,
+)
+
+SINK_WRITE_DURATION = Histogram(
+    "origin_sink_write_duration_seconds",
+    "Время записи одной пачки в получатель",
+    ["sink"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+    registry=registry,
+)
+
+# Метрики публикации пачками
+RABBITMQ_BATCH_SIZE = Histogram(
+    "origin_rabbitmq_batch_size",
+    "Количество уведомлений в одном AMQP-сообщении",
+    buckets=[1, 2, 5, 10, 20, 50, 100, 200],
+    registry=registry,
+)
+
+RABBITMQ_PAYLOAD_BYTES = Counter(
+    "origin_rabbitmq_payload_bytes_total",
+    "Объём тел AMQP-сообщений до (raw) и после (wire) сжатия",
+    ["kind"],
+    registry=registry,
+)
+
+# Проверки /health и /ready
+HEALTH_CHECK_STATUS = Gauge(
+    "origin_health_check_status",
+    "Результат последней фоновой проверки (1 = пройдена, 0 = нет)",
+    ["check"],
+    registry=registry,
+)
+
+HEALTH_CHECK_DURATION = Histogram(
+    "origin_health_check_duration_seconds",
+    "Длительность пинга зависимости фоновой проверкой",
+    ["check"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+    registry=registry,
+)
+
 SERVICE_INFO = Info("origin_service_info", "Информация о сервисе", registry=registry)
 
 WORKER_INFO = Info(
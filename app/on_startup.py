@@ -1,7 +1,51 @@
+import time
+from contextlib import contextmanager
+from typing import Optional
+
 from app.clients.rabbit.create_queues import create_queues
-from app.clients.rabbit.provide import get_rabbit_client
+from app.clients.sinks.base import BaseSink
+from app.clients.sinks.provide import create_sink
+from app.config import settings
+from app.enums.sink import SinkType
+from app.logger import logger
+from app.metrics import STARTUP_PHASE_DURATION
+from app.utils.rabbit_waiter import wait_for_rabbit
+
+_startup_started_at: Optional[float] = None
+
+
+@contextmanager
+def startup_phase(phase: str):
+    """Замеряет фазу запуска и экспортирует её длительность"""
+    global _startup_started_at
+    started = time.monotonic()
+    if _startup_started_at is None:
+        _startup_started_at = started
+    try:
+        yield
+    finally:
+        duration = time.monotonic() - started
+        STARTUP_PHASE_DURATION.labels(phase=phase).set(duration)
+        logger.info(f"Фаза запуска {phase} заняла {duration:.3f}с")
+
+
+def startup_finished():
+    if _startup_started_at is None:
+        return
+    duration = time.monotonic() - _startup_started_at
+    STARTUP_PHASE_DURATION.labels(phase="total").set(duration)
+    logger.info(f"Сервис запущен за {duration:.3f}с")
+
 
+async def on_startup() -> BaseSink:
+    if settings.sink.SINK_TYPE != SinkType.RABBITMQ:
+        sink = create_sink()
+        with startup_phase("sink_start"):
+            await sink.start()
+        return sink
 
-async def on_startup():
-    client = await get_rabbit_client()
-    await create_queues(client)
+    with startup_phase("rabbit_connect"):
+        client = await wait_for_rabbit()
+    with startup_phase("declare_queues"):
+        await create_queues(client)
+    return create_sink(client)
@@ -1,12 +1,37 @@
+import json
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 from app.enums.polling_workers import OriginType
+from app.metrics import FILTERED_UPDATES
+from app.schemas.message import MessageSchema
+from app.utils.chat_cache import ChatMetadata, ChatMetadataCache
 
 
 class BaseOriginClient(ABC):
+    """
+    Плагин мессенджера для общего движка поллинга.
+
+    Клиент умеет только получать пачку апдейтов и двигать курсор; лимиты,
+    дедупликацию, публикацию и метрики берёт на себя PollingWorker.
+    """
+
     token: str
     token_suffix: str
     origin_type: OriginType
+    # Позиция в потоке апдейтов, сохраняется между перезапусками
+    marker: Optional[str]
+    # Сколько единиц общего лимита origin расходует один fetch_updates
+    rate_limit_cost: int = 1
+    # Параметры запроса по умолчанию: размер пачки и long-poll таймаут, с
+    poll_limit: int = 100
+    poll_timeout: int = 1
+    # Нужные сервису типы апдейтов (общие имена); None - все
+    update_types: Optional[List[str]] = None
+    # Общий для ботов origin кеш метаданных чатов; None - без кеша
+    chat_cache: Optional[ChatMetadataCache] = None
+    # Прикладывать ли к уведомлению исходный JSON апдейта (MessageSchema.raw)
+    raw_passthrough: bool = False
 
     @abstractmethod
     async def create_client(self):
@@ -15,3 +40,52 @@ class BaseOriginClient(ABC):
     @abstractmethod
     async def close_client(self):
         pass
+
+    @abstractmethod
+    async def fetch_updates(
+        self,
+        limit: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> List[MessageSchema]:
+        """
+        Один запрос к API: до limit апдейтов, курсор сдвигается за полученные.
+        Запрашиваются только update_types: апдейты остальных типов API мессенджера
+        пропускает безвозвратно, поэтому фильтр задаётся только постоянной настройкой.
+        """
+        pass
+
+    def accepts(self, update_type: Optional[str]) -> bool:
+        """Проверка типа до разбора апдейта - на случай, если API не отфильтровал"""
+        if self.update_types is None or update_type in self.update_types:
+            return True
+        FILTERED_UPDATES.labels(
+            origin_type=self.origin_type, update_type=update_type or "unknown"
+        ).inc()
+        return False
+
+    def raw_json(self, update: dict) -> Optional[bytes]:
+        """
+        JSON одного апдейта для MessageSchema.raw. Только свой апдейт, а не весь
+        ответ API: иначе каждое уведомление пачки несёт всю пачку. Это повторная
+        сериализация уже разобранного апдейта, а не срез байт ответа: порядок
+        ключей сохраняется, пробелы и экранирование - нет.
+        """
+        if not self.raw_passthrough:
+            return None
+        return json.dumps(update, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def remember_chat(self, metadata: ChatMetadata) -> ChatMetadata:
+        """Метаданные чата из апдейта, дополненные кешем (и сохранённые в него)"""
+        if self.chat_cache is None:
+            return metadata
+        return self.chat_cache.merge(metadata)
+
+    def get_cursor(self) -> Optional[str]:
+        return self.marker
+
+    def set_cursor(self, cursor: Optional[str]):
+        self.marker = cursor
+
+    async def ack(self, messages: List[MessageSchema]):
+        """Подтверждение обработанных апдейтов на стороне мессенджера (если нужно)"""
+        pass
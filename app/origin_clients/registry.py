@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Type
+
+from app.config import TamTamSettings, TelegramSettings, settings
+from app.enums.polling_workers import OriginType, TokenSourceType
+from app.origin_clients.base_client import BaseOriginClient
+from app.origin_clients.tamtam import TamTamClient
+from app.origin_clients.telegram import TelegramClient
+from app.utils.poll_controller import PollBounds
+
+
+@dataclass(frozen=True)
+class OriginConfig:
+    """Всё, что движку поллинга нужно знать об одном мессенджере"""
+
+    origin_type: OriginType
+    client_class: Type[BaseOriginClient]
+    max_pollers: int
+    rate_limit: int
+    poll_limit: int
+    poll_timeout_sec: int
+    poll_adaptive: bool
+    poll_timeout_max_sec: int
+    poll_limit_max: int
+    raw_passthrough: bool
+    # Пустой список - все типы апдейтов
+    update_types: List[str]
+    tokens_source: TokenSourceType
+    tokens_file: str
+    tokens_redis_key: str
+    tokens_reload_sec: int
+    # Перечитывает токены из окружения и .env (для TokenSourceType.ENV)
+    env_tokens: Callable[[], Set[str]]
+
+    def poll_bounds(self) -> Optional[PollBounds]:
+        if not self.poll_adaptive:
+            return None
+        return PollBounds(
+            min_timeout=self.poll_timeout_sec,
+            max_timeout=max(self.poll_timeout_sec, self.poll_timeout_max_sec),
+            min_limit=self.poll_limit,
+            max_limit=max(self.poll_limit, self.poll_limit_max),
+        )
+
+
+def _tamtam() -> OriginConfig:
+    tam_tam = settings.tam_tam
+    return OriginConfig(
+        origin_type=OriginType.TAMTAM,
+        client_class=TamTamClient,
+        max_pollers=tam_tam.TAM_TAM_MAX_POLLING_BOTS,
+        rate_limit=tam_tam.TAM_TAM_RATE_LIMIT,
+        poll_limit=tam_tam.TAM_TAM_POLL_LIMIT,
+        poll_timeout_sec=tam_tam.TAM_TAM_POLL_TIMEOUT_SEC,
+        poll_adaptive=tam_tam.TAM_TAM_POLL_ADAPTIVE,
+        poll_timeout_max_sec=tam_tam.TAM_TAM_POLL_TIMEOUT_MAX_SEC,
+        poll_limit_max=tam_tam.TAM_TAM_POLL_LIMIT_MAX,
+        raw_passthrough=tam_tam.TAM_TAM_RAW_PASSTHROUGH,
+        update_types=tam_tam.TAM_TAM_UPDATE_TYPES_LIST,
+        tokens_source=tam_tam.TAM_TAM_TOKENS_SOURCE,
+        tokens_file=tam_tam.TAM_TAM_TOKENS_FILE,
+        tokens_redis_key=tam_tam.TAM_TAM_TOKENS_REDIS_KEY,
+        tokens_reload_sec=tam_tam.TAM_TAM_TOKENS_RELOAD_SEC,
+        env_tokens=lambda: {
+            token.get_secret_value() for token in TamTamSettings().TAM_TAM_TOKENS
+        },
+    )
+
+
+def _telegram() -> OriginConfig:
+    telegram = settings.telegram
+    return OriginConfig(
+        origin_type=OriginType.TELEGRAM,
+        client_class=TelegramClient,
+        max_pollers=telegram.TELEGRAM_MAX_POLLING_BOTS,
+        rate_limit=telegram.TELEGRAM_RATE_LIMIT,
+        poll_limit=telegram.TELEGRAM_POLL_LIMIT,
+        poll_timeout_sec=telegram.TELEGRAM_POLL_TIMEOUT_SEC,
+        poll_adaptive=telegram.TELEGRAM_POLL_ADAPTIVE,
+        poll_timeout_max_sec=telegram.TELEGRAM_POLL_TIMEOUT_MAX_SEC,
+        poll_limit_max=telegram.TELEGRAM_POLL_LIMIT_MAX,
+        raw_passthrough=telegram.TELEGRAM_RAW_PASSTHROUGH,
+        update_types=telegram.TELEGRAM_UPDATE_TYPES_LIST,
+        tokens_source=telegram.TELEGRAM_TOKENS_SOURCE,
+        tokens_file=telegram.TELEGRAM_TOKENS_FILE,
+        tokens_redis_key=telegram.TELEGRAM_TOKENS_REDIS_KEY,
+        tokens_reload_sec=telegram.TELEGRAM_TOKENS_RELOAD_SEC,
+        env_tokens=lambda: {
+            token.get_secret_value() for token in TelegramSettings().TELEGRAM_TOKENS
+        },
+    )
+
+
+# Новый мессенджер = клиент с интерфейсом BaseOriginClient, настройки и строка здесь
+ORIGINS: Dict[OriginType, Callable[[], OriginConfig]] = {
+    OriginType.TAMTAM: _tamtam,
+    OriginType.TELEGRAM: _telegram,
+}
+
+
+def get_origin_config(origin_type: OriginType) -> OriginConfig:
+    return ORIGINS[origin_type]()
+
+
+def get_enabled_origins() -> List[OriginConfig]:
+    return [get_origin_config(origin) for origin in settings.origins.ORIGINS]
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import List, Optional, Tuple
 import httpx
 
 from app.origin_clients.base_client import BaseOriginClient
@@ -7,38 +7,77 @@ from app.metrics import metrics_middleware, get_token_suffix
 from app.enums.polling_workers import OriginType
 from app.logger import logger
 from app.schemas.message import MessageSchema
+from app.utils import tracing
+from app.utils.chat_cache import ChatMetadata, ChatMetadataCache
 
 
 class TamTamClient(BaseOriginClient):
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        http_client: Optional[httpx.AsyncClient] = None,
+        raw_passthrough: bool = False,
+        poll_limit: int = 100,
+        poll_timeout: int = 1,
+        update_types: Optional[List[str]] = None,
+        chat_cache: Optional[ChatMetadataCache] = None,
+    ):
         self.token = token
+        # Прикладывать ли к уведомлению исходный JSON апдейта (MessageSchema.raw)
+        self.raw_passthrough = raw_passthrough
+        self.poll_limit = poll_limit
+        self.poll_timeout = poll_timeout
+        self.update_types = update_types or None
+        self.chat_cache = chat_cache
 
         self.token_suffix = get_token_suffix(self.token)
         self.origin_type = OriginType.TAMTAM
+        # Первый чат из GET /chats: пока его запись в кеше жива, запрос не повторяется
+        self.first_chat_id: Optional[int] = None
 
         self.base_url = "https://botapi.tamtam.chat/"
 
-        # Состояние сервиса
-        self.is_running = False
         self.marker: Optional[str] = None
-        self.client: Optional[httpx.AsyncClient] = None
+        # Общий HTTP-клиент пула поллеров не закрывается вместе с ботом
+        self.client: Optional[httpx.AsyncClient] = http_client
+        self._owns_client = http_client is None
 
-        self.get_updates = metrics_middleware(
+        self._get_updates_with_metrics = metrics_middleware(
             origin_type=self.origin_type, token_suffix=self.token_suffix
         )(self._get_updates)
 
     async def create_client(self):
         if self.client is None:
             self.client = httpx.AsyncClient()
+            self._owns_client = True
             logger.info("Клиент создан")
 
     async def close_client(self):
-        if self.client:
+        # Общий клиент пула остаётся у бота: его закрывает сервис
+        if self.client and self._owns_client:
             await self.client.aclose()
             self.client = None
             logger.info("HTTPX клиент закрыт")
 
-    async def _get_updates(self, limit=1, timeout=1):
+    async def fetch_updates(
+        self,
+        limit: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> List[MessageSchema]:
+        return await self._get_updates_with_metrics(
+            limit=limit or self.poll_limit,
+            timeout=self.poll_timeout if timeout is None else timeout,
+            types=self.update_types,
+        )
+
+    async def ack(self, messages: List[MessageSchema]):
+        """Отмечает чаты с полученными сообщениями прочитанными"""
+        chat_ids = {message.chat_id for message in messages}
+        await asyncio.gather(*(self.mark_seen(chat_id) for chat_id in chat_ids))
+
+    async def _get_updates(
+        self, limit=100, timeout=1, types: Optional[List[str]] = None
+    ) -> List[MessageSchema]:
         """Выполнение запроса к TamTam API"""
         method = "updates"
         params = {
@@ -46,15 +85,16 @@ class TamTamClient(BaseOriginClient):
             "timeout": timeout,
             "limit": limit,
             "marker": self.marker,
-            "types": None,
+            "types": ",".join(types) if types else None,
         }
 
         # Удаляем None значения из params
         params = {k: v for k, v in params.items() if v is not None}
 
         try:
+            # HTTP-таймаут чуть больше long-poll, чтобы сервер успел ответить пустой пачкой
             response = await self.client.get(
-                self.base_url + method, params=params, timeout=60
+                self.base_url + method, params=params, timeout=timeout + 30
             )
             response.raise_for_status()
             update = response.json()
@@ -62,35 +102,72 @@ class TamTamClient(BaseOriginClient):
             logger.error(f"Error in get_updates: {str(e)}")
             raise
 
-        if "updates" in update.keys():
-            if len(update["updates"]) != 0:
-                chat_id = self.get_chat_id_from_update(update)
-                if chat_id:
-                    await self.mark_seen(chat_id)
-            else:
-                return None
-        else:
-            return None
-
-        if update and "marker" in update:
+        if update.get("marker") is not None:
             self.marker = update["marker"]
 
-        return MessageSchema(
-            chat_id=chat_id,
-            text=self.get_text(update),
-            chat_user_name=self.get_name(update),
-        )
+        messages = []
+        for upd in update.get("updates") or []:
+            if not self.accepts(upd.get("update_type")):
+                continue
+            chat_id = self.get_chat_id_from_update(upd)
+            if chat_id is None:
+                logger.debug(
+                    f"Бот {self.token_suffix}: апдейт {upd.get('update_type')} без chat_id пропущен"
+                )
+                continue
+            name = self.get_name(upd)
+            chat = self.remember_chat(self.get_chat_metadata(chat_id, upd, name))
+            messages.append(
+                MessageSchema(
+                    chat_id=chat_id,
+                    text=self.get_text(upd),
+                    chat_user_name=name or chat.user_name,
+                    chat_title=chat.title,
+                    chat_type=chat.chat_type,
+                    update_id=self.get_update_id(upd),
+                    update_type=self.get_update_type(upd),
+                    message_id=self.get_message_id(upd),
+                    timestamp=self.get_timestamp(upd),
+                    sender_id=self.get_sender_id(upd),
+                    raw=self.raw_json(upd),
+                )
+            )
+        return messages
 
     def get_chat_id_from_update(self, update):
-        """Извлекает chat_id из update"""
+        """Извлекает chat_id из update (ответа GET /updates или отдельного апдейта)"""
         try:
-            if "updates" in update and len(update["updates"]) > 0:
-                message = update["updates"][0].get("message", {})
-                return message.get("recipient", {}).get("chat_id")
+            if update and "updates" in update:
+                if len(update["updates"]) == 0:
+                    return None
+                update = update["updates"][0]
+            if not update:
+                return None
+            message = update.get("message") or {}
+            return message.get("recipient", {}).get("chat_id") or update.get("chat_id")
         except Exception as e:
             logger.error(f"Error getting chat_id from update: {e}")
         return None
 
+    @staticmethod
+    def get_chat_metadata(chat_id, update, name=None) -> ChatMetadata:
+        """
+        Метаданные чата из апдейта: тип - из recipient сообщения или объекта chat,
+        название - из chat или chat_title_changed. Имя инициатора сохраняется
+        только для диалога: в групповом чате оно у каждого апдейта своё.
+        """
+        chat = update.get("chat") or {}
+        recipient = (update.get("message") or {}).get("recipient") or {}
+        chat_type = recipient.get("chat_type") or chat.get("type")
+        if update.get("update_type") == "chat_title_changed":
+            title = update.get("title")
+        else:
+            title = chat.get("title")
+        user_name = (chat.get("dialog_with_user") or {}).get("name")
+        if user_name is None and chat_type == "dialog":
+            user_name = name
+        return ChatMetadata(chat_id, title, chat_type, user_name)
+
     def get_update_type(self, update):
         """
         Метод получения типа события произошедшего с ботом
@@ -108,6 +185,60 @@ class TamTamClient(BaseOriginClient):
                 upd_type = update.get("update_type")
         return upd_type
 
+    def get_update_id(self, update):
+        """
+        Ключ идемпотентности события: тип, id сообщения (или callback) и время события.
+        Повторно полученный апдейт даёт тот же ключ, а каждое редактирование - новый.
+        """
+        if update and "updates" in update.keys():
+            if len(update["updates"]) == 0:
+                return None
+            update = update["updates"][0]
+        if not update:
+            return None
+
+        message = update.get("message") or {}
+        source_id = (
+            message.get("body", {}).get("mid")
+            or update.get("callback", {}).get("callback_id")
+            or update.get("chat_id")
+            or update.get("user", {}).get("user_id")
+            or ""
+        )
+        return f"{update.get('update_type')}:{source_id}:{update.get('timestamp')}"
+
+    def get_message_id(self, update):
+        """id сообщения (body.mid): общий у созданного сообщения и всех его правок"""
+        if update and "updates" in update.keys():
+            if len(update["updates"]) == 0:
+                return None
+            update = update["updates"][0]
+        if not update:
+            return None
+        return (update.get("message") or {}).get("body", {}).get("mid")
+
+    def get_timestamp(self, update):
+        """Время события в мс (Update.timestamp)"""
+        if update and "updates" in update.keys():
+            if len(update["updates"]) == 0:
+                return None
+            update = update["updates"][0]
+        return update.get("timestamp") if update else None
+
+    def get_sender_id(self, update):
+        """id пользователя, инициировавшего событие"""
+        if update and "updates" in update.keys():
+            if len(update["updates"]) == 0:
+                return None
+            update = update["updates"][0]
+        if not update:
+            return None
+        if "callback" in update:
+            return update["callback"].get("user", {}).get("user_id")
+        if "user" in update:
+            return update["user"].get("user_id")
+        return (update.get("message") or {}).get("sender", {}).get("user_id")
+
     def get_marker(self, update):
         """Метод получения маркера события"""
         marker = None
@@ -119,29 +250,62 @@ class TamTamClient(BaseOriginClient):
         """Отправка маркера о прочтении сообщения"""
         method_ntf = f"chats/{chat_id}/actions"
         params = {"action": "mark_seen"}
-        try:
-            await self.client.post(
-                self.base_url + method_ntf + f"?access_token={self.token}", json=params
-            )
-        except Exception as e:
-            logger.error(f"Error in mark_seen: {e}")
+        with tracing.span("tamtam.mark_seen", {"chat.id": chat_id}) as current:
+            try:
+                await self.client.post(
+                    self.base_url + method_ntf + f"?access_token={self.token}",
+                    json=params,
+                )
+            except Exception as e:
+                tracing.record_error(current, e)
+                logger.error(f"Error in mark_seen: {e}")
+
+    async def get_chats(
+        self, count: int = 100, marker: Optional[int] = None
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Страница чатов бота (GET /chats) и маркер следующей.
+        Метаданные всех чатов страницы попадают в кеш одним запросом.
+        """
+        params = {"access_token": self.token, "count": count}
+        if marker is not None:
+            params["marker"] = marker
+        response = await self.client.get(self.base_url + "chats", params=params)
+        response.raise_for_status()
+        data = response.json()
+        chats = data.get("chats") or []
+        for chat in chats:
+            if chat.get("chat_id") is not None:
+                self.remember_chat(
+                    ChatMetadata(
+                        chat["chat_id"],
+                        title=chat.get("title"),
+                        chat_type=chat.get("type"),
+                        user_name=(chat.get("dialog_with_user") or {}).get("name"),
+                    )
+                )
+        return chats, data.get("marker")
 
     async def get_chat_id(self, update=None):
         """Получение id чата"""
         if update is not None:
             return self.get_chat_id_from_update(update)
 
+        if (
+            self.first_chat_id is not None
+            and self.chat_cache is not None
+            and self.chat_cache.get(self.first_chat_id) is not None
+        ):
+            return self.first_chat_id
+
         # Если update не передан, получаем список чатов
-        method = "chats"
-        params = {"access_token": self.token}
         try:
-            response = await self.client.get(self.base_url + method, params=params)
-            if response.status_code == 200:
-                chats_data = response.json()
-                if "chats" in chats_data.keys() and len(chats_data["chats"]) > 0:
-                    return chats_data["chats"][0].get("chat_id")
-            else:
-                logger.error("Error get_chat_id: Non-200 response")
+            chats, _ = await self.get_chats()
+            if chats:
+                self.first_chat_id = chats[0].get("chat_id")
+                return self.first_chat_id
+        except httpx.HTTPStatusError:
+            logger.error("Error get_chat_id: Non-200 response")
         except Exception as e:
             logger.error(f"Error connect get_chat_id: {e}")
         return None
@@ -227,21 +391,3 @@ class TamTamClient(BaseOriginClient):
                 if "sender" in upd.keys():
                     name = upd["sender"]["name"]
         return name
-
-    async def run_polling(self):
-        """Асинхронный метод для запуска поллинга"""
-        await self.create_client()
-        self.is_running = True
-
-        try:
-            while self.is_running:
-                last_update = await self.get_updates()
-                if last_update:
-                    text = self.get_text(last_update)
-                    chat_id = await self.get_chat_id(last_update)
-                    logger.error(f"Received message: {text} in chat: {chat_id}")
-                await asyncio.sleep(0.1)  # Небольшая пауза между запросами
-        except KeyboardInterrupt:
-            logger.error("Polling stopped by user")
-        finally:
-            await self.close_client()
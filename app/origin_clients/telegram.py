@@ -0,0 +1,191 @@
+import json
+from typing import List, Optional
+
+import httpx
+
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import get_token_suffix, metrics_middleware
+from app.origin_clients.base_client import BaseOriginClient
+from app.schemas.message import MessageSchema
+from app.utils.chat_cache import ChatMetadata, ChatMetadataCache
+
+# Типы апдейтов Telegram -> общие имена (как у TamTam), чтобы склейка правок
+# и фильтры работали одинаково для всех origin
+UPDATE_TYPES = {
+    "message": "message_created",
+    "edited_message": "message_edited",
+    "channel_post": "message_created",
+    "edited_channel_post": "message_edited",
+    "callback_query": "message_callback",
+}
+
+
+class TelegramClient(BaseOriginClient):
+    """
+    Telegram Bot API (getUpdates).
+    Курсор - offset: update_id последнего полученного апдейта + 1. Telegram
+    считает подтверждёнными все апдейты до offset, отдельный ack не нужен.
+    """
+
+    def __init__(
+        self,
+        token,
+        http_client: Optional[httpx.AsyncClient] = None,
+        raw_passthrough: bool = False,
+        poll_limit: int = 100,
+        poll_timeout: int = 1,
+        update_types: Optional[List[str]] = None,
+        chat_cache: Optional[ChatMetadataCache] = None,
+    ):
+        self.token = token
+        self.raw_passthrough = raw_passthrough
+        self.poll_limit = poll_limit
+        self.poll_timeout = poll_timeout
+        self.update_types = update_types or None
+        self.chat_cache = chat_cache
+
+        self.token_suffix = get_token_suffix(self.token)
+        self.origin_type = OriginType.TELEGRAM
+        # update_id уникален только в пределах бота, в ключ дедупликации добавляем id бота
+        self.bot_id = token.split(":", 1)[0]
+
+        self.base_url = "https://api.telegram.org/"
+
+        self.marker: Optional[str] = None
+        self.filtered = False
+        self.client: Optional[httpx.AsyncClient] = http_client
+        self._owns_client = http_client is None
+
+        self._get_updates_with_metrics = metrics_middleware(
+            origin_type=self.origin_type, token_suffix=self.token_suffix
+        )(self._get_updates)
+
+    async def create_client(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient()
+            self._owns_client = True
+            logger.info("Клиент создан")
+
+    async def close_client(self):
+        # Общий клиент пула остаётся у бота: его закрывает сервис
+        if self.client and self._owns_client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("HTTPX клиент закрыт")
+
+    async def fetch_updates(
+        self,
+        limit: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> List[MessageSchema]:
+        return await self._get_updates_with_metrics(
+            limit=limit or self.poll_limit,
+            timeout=self.poll_timeout if timeout is None else timeout,
+            types=self.update_types,
+        )
+
+    async def _get_updates(
+        self, limit=100, timeout=1, types: Optional[List[str]] = None
+    ) -> List[MessageSchema]:
+        """Выполнение запроса getUpdates"""
+        params = {"timeout": timeout, "limit": min(limit, 100)}
+        if self.marker is not None:
+            params["offset"] = self.marker
+        # allowed_updates Telegram запоминает: после фильтра его надо явно сбросить
+        if types:
+            params["allowed_updates"] = json.dumps(self.telegram_types(types))
+        elif self.filtered:
+            params["allowed_updates"] = "[]"
+
+        try:
+            response = await self.client.get(
+                f"{self.base_url}bot{self.token}/getUpdates",
+                params=params,
+                timeout=timeout + 30,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            logger.error(f"Error in getUpdates: {str(e)}")
+            raise
+
+        self.filtered = bool(types)
+        updates = data.get("result") or []
+        if updates:
+            self.marker = str(updates[-1]["update_id"] + 1)
+
+        messages = []
+        for update in updates:
+            update_type, payload = self._split(update)
+            if not self.accepts(UPDATE_TYPES.get(update_type, update_type)):
+                continue
+            chat_id = self.get_chat_id(payload)
+            if chat_id is None:
+                logger.debug(
+                    f"Бот {self.token_suffix}: апдейт {update_type} без chat_id пропущен"
+                )
+                continue
+            message = payload.get("message") if update_type == "callback_query" else payload
+            sender = payload.get("from") or {}
+            name = sender.get("username") or sender.get("first_name")
+            chat = self.remember_chat(self.get_chat_metadata(chat_id, payload))
+            messages.append(
+                MessageSchema(
+                    chat_id=chat_id,
+                    text=self.get_text(update_type, payload),
+                    chat_user_name=name or chat.user_name,
+                    chat_title=chat.title,
+                    chat_type=chat.chat_type,
+                    update_id=f"{self.bot_id}:{update['update_id']}",
+                    update_type=UPDATE_TYPES.get(update_type, update_type),
+                    message_id=(
+                        str(message["message_id"])
+                        if message and "message_id" in message
+                        else None
+                    ),
+                    timestamp=(
+                        (payload.get("edit_date") or payload.get("date")) * 1000
+                        if payload.get("date")
+                        else None
+                    ),
+                    sender_id=sender.get("id"),
+                    raw=self.raw_json(update),
+                )
+            )
+        return messages
+
+    @staticmethod
+    def telegram_types(types: List[str]) -> List[str]:
+        """Общие имена типов -> типы Telegram; незнакомые имена передаются как есть"""
+        names = [name for name, common in UPDATE_TYPES.items() if common in types]
+        known = set(UPDATE_TYPES.values())
+        return names + [t for t in types if t not in known and t not in names]
+
+    @staticmethod
+    def _split(update: dict):
+        """Update содержит update_id и ровно одно поле с полезной нагрузкой"""
+        for key, value in update.items():
+            if key != "update_id" and isinstance(value, dict):
+                return key, value
+        return None, {}
+
+    @staticmethod
+    def get_chat_id(payload: dict):
+        chat = payload.get("chat") or (payload.get("message") or {}).get("chat") or {}
+        return chat.get("id")
+
+    @staticmethod
+    def get_chat_metadata(chat_id, payload: dict) -> ChatMetadata:
+        """Chat есть в каждом сообщении; у callback с недоступным сообщением - нет"""
+        chat = payload.get("chat") or (payload.get("message") or {}).get("chat") or {}
+        user_name = None
+        if chat.get("type") == "private":
+            user_name = chat.get("username") or chat.get("first_name")
+        return ChatMetadata(chat_id, chat.get("title"), chat.get("type"), user_name)
+
+    @staticmethod
+    def get_text(update_type: Optional[str], payload: dict):
+        if update_type == "callback_query":
+            return payload.get("data")
+        return payload.get("text") or payload.get("caption")
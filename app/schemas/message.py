@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
@@ -6,3 +6,21 @@ class MessageSchema(BaseModel):
     chat_id: int
     text: Optional[str] = None
     chat_user_name: Optional[str] = None
+    # Метаданные чата из апдейта или кеша метаданных чатов
+    chat_title: Optional[str] = None
+    chat_type: Optional[str] = None
+    update_id: Optional[str] = None
+    update_type: Optional[str] = None
+    message_id: Optional[str] = None
+    # Время события в мс и id отправителя (пользователь, нажавший кнопку, и т.п.)
+    timestamp: Optional[int] = None
+    sender_id: Optional[int] = None
+    # JSON апдейта из ответа API, клиент сериализует его заново (BaseOriginClient.raw_json)
+    raw: Optional[bytes] = Field(default=None, exclude=True, repr=False)
+
+    def to_json_bytes(self) -> bytes:
+        """JSON сообщения; готовые байты raw вставляются в него без разбора"""
+        body = self.model_dump_json().encode()
+        if self.raw is None:
+            return body
+        return b"".join((body[:-1], b',"raw":', self.raw, b"}"))
@@ -1,36 +1,208 @@
 import asyncio
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional
 
-from app.clients.polling_worker import PollingWorker
-from app.clients.rabbit.provide import get_rabbit_client
+import httpx
+
+from app.admin.api import get_admin_server
+from app.clients.health import get_health_checker
+from app.clients.rabbit.backpressure import (
+    BackpressureController,
+    get_backpressure_controller,
+)
+from app.clients.rabbit.routing import MessageRouter, get_message_router
+from app.clients.redis.marker_store import MarkerStore
+from app.clients.redis.pool import close_redis
+from app.clients.sinks.base import BaseSink
+from app.clients.sinks.provide import wrap_batch_publisher
+from app.clients.worker_registry import WorkerRegistry
 from app.config import settings
-from app.origin_clients.tamtam import TamTamClient
+from app.origin_clients.registry import OriginConfig, get_enabled_origins
 from app.clients.redis.redis_client import RedisRateLimiter
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.utils.chat_cache import ChatMetadataCache
+from app.utils.coalescer import EditCoalescer
+from app.utils.deduplicator import UpdateDeduplicator
+from app.utils.local_rate_limiter import LocalRateLimiter, degraded_rate
+from app.on_startup import startup_finished, startup_phase
+from app.utils.token_source import BaseTokenSource, get_token_source
 
-from app.utils.circuit_breaker.rabbit import CircuitBreakerRabbitClient
-from app.utils.circuit_breaker.redis import CircuitBreakerRedisClient
 
+def get_deduplicator(origin_type: OriginType):
+    if not settings.dedup.DEDUP_ENABLED:
+        return None
+    return UpdateDeduplicator(
+        origin_type,
+        max_size=settings.dedup.DEDUP_LRU_SIZE,
+        use_redis=settings.dedup.DEDUP_REDIS_ENABLED,
+        ttl_sec=settings.dedup.DEDUP_TTL_SEC,
+    )
+
+
+def get_chat_cache(origin_type: OriginType):
+    if not settings.chat_cache.CHAT_CACHE_ENABLED:
+        return None
+    return ChatMetadataCache(
+        origin_type,
+        max_size=settings.chat_cache.CHAT_CACHE_SIZE,
+        ttl_sec=settings.chat_cache.CHAT_CACHE_TTL_SEC,
+    )
+
+
+def get_coalescer(origin_type: OriginType):
+    if not settings.coalesce.COALESCE_ENABLED:
+        return None
+    return EditCoalescer(
+        origin_type, window_sec=settings.coalesce.COALESCE_WINDOW_MS / 1000
+    )
+
+
+def get_fallback_limiter(origin: OriginConfig):
+    if not settings.redis.REDIS_DEGRADED_ENABLED:
+        return None
+    return LocalRateLimiter(degraded_rate(origin.rate_limit), origin.origin_type)
+
+
+@dataclass
+class OriginRuntime:
+    """Запущенный origin: его воркеры, источник токенов и ресурсы для закрытия"""
+
+    origin: OriginConfig
+    registry: WorkerRegistry
+    token_source: BaseTokenSource
+    closers: List[Callable[[], Awaitable]] = field(default_factory=list)
 
-async def start_all_workers():
-    tasks = []
-    for token in settings.tam_tam.TAM_TAM_TOKENS:
-        client = TamTamClient(token.get_secret_value())
-        publisher = await get_rabbit_client()
-        redis_client = RedisRateLimiter(
-            settings.redis.REDIS_URL.get_secret_value(), 2, client.origin_type
-        )
-        await redis_client.connect()
 
-        publisher_cb = CircuitBreakerRabbitClient()
-        redis_cb = CircuitBreakerRedisClient()
+async def start_origin(
+    origin: OriginConfig,
+    publisher: BaseSink,
+    router: MessageRouter,
+    backpressure: Optional[BackpressureController] = None,
+) -> OriginRuntime:
+    origin_type = origin.origin_type
+    redis_client = RedisRateLimiter(origin.rate_limit, origin_type)
+    with startup_phase(f"redis_connect_{origin_type.value.lower()}"):
+        await redis_client.connect()
 
-        worker = PollingWorker(
-            client,
-            publisher,
-            redis_client,
-            publisher_cb,
-            redis_cb,
-            settings.rabbit.RABBITMQ_NOTIFICATIONS_QUEUE,
+    # Один пул соединений на все боты: не больше соединений, чем поллеров
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=origin.max_pollers * 2,
+            max_keepalive_connections=origin.max_pollers,
         )
-        tasks.append(asyncio.create_task(worker.start()))
+    )
+
+    marker_store = (
+        MarkerStore(origin_type)
+        if settings.shutdown.SHUTDOWN_CHECKPOINT_MARKERS
+        else None
+    )
+    deduplicator = get_deduplicator(origin_type)
+
+    registry = WorkerRegistry(
+        origin_type,
+        partial(
+            origin.client_class,
+            http_client=http_client,
+            raw_passthrough=origin.raw_passthrough,
+            poll_limit=origin.poll_limit,
+            poll_timeout=origin.poll_timeout_sec,
+            update_types=origin.update_types,
+            chat_cache=get_chat_cache(origin_type),
+        ),
+        publisher,
+        redis_client,
+        router,
+        deduplicator,
+        max_concurrency=origin.max_pollers,
+        marker_store=marker_store,
+        coalescer=get_coalescer(origin_type),
+        poll_bounds=origin.poll_bounds(),
+        fallback_limiter=get_fallback_limiter(origin),
+        backpressure=backpressure,
+    )
+    token_source = get_token_source(origin)
+
+    closers = [redis_client.disconnect, http_client.aclose, token_source.close]
+    if deduplicator:
+        closers.append(deduplicator.close)
+    if marker_store:
+        closers.append(marker_store.close)
+    return OriginRuntime(origin, registry, token_source, closers)
+
+
+async def start_all_workers(
+    publisher: BaseSink, reload_event: Optional[asyncio.Event] = None
+):
+    publisher = wrap_batch_publisher(publisher)
+    router = get_message_router()
+    runtimes: List[OriginRuntime] = []
+    # Общий для admin API и проверок, заполняется по мере запуска origin
+    registries: Dict[OriginType, WorkerRegistry] = {}
+    admin = None
+    backpressure = get_backpressure_controller(
+        publisher, [queue.name for queue in router.queues()]
+    )
+    backpressure_task = (
+        asyncio.create_task(backpressure.run()) if backpressure else None
+    )
+    health = get_health_checker(publisher, registries)
+    health_task = asyncio.create_task(health.run()) if health else None
 
-    await asyncio.gather(*tasks)
+    try:
+        # Пробы доступны с начала запуска: до его окончания /ready отвечает 503
+        admin = get_admin_server(registries, backpressure, health)
+        if admin:
+            await admin.start()
+
+        for origin in get_enabled_origins():
+            runtime = await start_origin(origin, publisher, router, backpressure)
+            runtimes.append(runtime)
+            registries[origin.origin_type] = runtime.registry
+
+        with startup_phase("workers_start"):
+            await asyncio.gather(
+                *(rt.registry.reload(rt.token_source) for rt in runtimes)
+            )
+        startup_finished()
+        if health:
+            health.mark_started()
+
+        await asyncio.gather(
+            *(
+                rt.registry.watch(
+                    rt.token_source, reload_event, rt.origin.tokens_reload_sec
+                )
+                for rt in runtimes
+            )
+        )
+    finally:
+        if health:
+            health.mark_stopping()
+            health_task.cancel()
+        if admin:
+            await admin.stop()
+        if backpressure_task:
+            backpressure_task.cancel()
+        await asyncio.gather(
+            *(
+                rt.registry.drain(settings.shutdown.SHUTDOWN_DRAIN_TIMEOUT_SEC)
+                for rt in runtimes
+            )
+        )
+        logger.info(f"Закрываем соединения с {publisher.name} и Redis...")
+        results = await asyncio.gather(
+            publisher.stop(),
+            *(close() for rt in runtimes for close in rt.closers),
+            return_exceptions=True,
+        )
+        # Общий пул закрывается после всех его пользователей
+        try:
+            await close_redis()
+        except Exception as e:
+            results.append(e)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка при закрытии соединения: {result}")
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.enums.polling_workers import OriginType
+from app.metrics import CHAT_CACHE_EVICTIONS, CHAT_CACHE_REQUESTS, CHAT_CACHE_SIZE
+
+
+@dataclass(frozen=True)
+class ChatMetadata:
+    chat_id: int
+    title: Optional[str] = None
+    # Тип чата в терминах мессенджера: dialog/chat/channel, private/group/...
+    chat_type: Optional[str] = None
+    # Собеседник бота (только для личных диалогов)
+    user_name: Optional[str] = None
+
+
+class ChatMetadataCache:
+    """
+    Ограниченный LRU метаданных чатов по chat_id с TTL записи.
+
+    Заполняется из апдейтов и пакетных запросов списка чатов, общий для всех
+    ботов origin. Поле, которого нет в очередном апдейте, берётся из кеша -
+    уведомление дополняется без лишних запросов к API. Запись живёт ttl_sec
+    с последнего обновления: название чата, сменившееся без апдейта, не
+    держится дольше.
+    """
+
+    def __init__(
+        self, origin_type: OriginType, max_size: int = 100000, ttl_sec: float = 3600
+    ):
+        self.origin_type = origin_type
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self._entries: "OrderedDict[int, Tuple[ChatMetadata, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, result: str):
+        CHAT_CACHE_REQUESTS.labels(origin_type=self.origin_type, result=result).inc()
+
+    def _evict(self, reason: str, amount: int = 1):
+        CHAT_CACHE_EVICTIONS.labels(origin_type=self.origin_type, reason=reason).inc(
+            amount
+        )
+
+    def get(self, chat_id: int) -> Optional[ChatMetadata]:
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            self._count("miss")
+            return None
+        metadata, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[chat_id]
+            self._evict("expired")
+            self._export_size()
+            self._count("miss")
+            return None
+        self._entries.move_to_end(chat_id)
+        self._count("hit")
+        return metadata
+
+    def get_many(self, chat_ids: Iterable[int]) -> Dict[int, ChatMetadata]:
+        found = {}
+        for chat_id in chat_ids:
+            metadata = self.get(chat_id)
+            if metadata is not None:
+                found[chat_id] = metadata
+        return found
+
+    def put(self, metadata: ChatMetadata):
+        self._entries[metadata.chat_id] = (metadata, time.monotonic() + self.ttl_sec)
+        self._entries.move_to_end(metadata.chat_id)
+        evicted = 0
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self._evict("size", evicted)
+        self._export_size()
+
+    def merge(self, metadata: ChatMetadata) -> ChatMetadata:
+        """
+        Дополняет метаданные из апдейта закешированными и сохраняет результат.
+        Непустые поля апдейта свежее кеша и заменяют его значения.
+        """
+        cached = self.get(metadata.chat_id)
+        if cached is not None:
+            metadata = replace(
+                cached,
+                **{
+                    field: value
+                    for field, value in vars(metadata).items()
+                    if value is not None
+                },
+            )
+        self.put(metadata)
+        return metadata
+
+    def _export_size(self):
+        CHAT_CACHE_SIZE.labels(origin_type=self.origin_type).set(len(self._entries))
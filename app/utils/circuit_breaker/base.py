@@ -1,5 +1,5 @@
 import time
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 from app.logger import logger
 from app.enums.circuit_breaker import CircuitBreakerState, CircuitBreakerClientEnum
@@ -25,7 +25,7 @@ class CircuitBreakerBaseClient:
         self.failures = 0
         self.state = CircuitBreakerState.CLOSED
         self.last_failure_time = 0
-        self.half_open_max_attempts = 0
+        self.half_open_attempts = 0
 
     def _get_exception_class(self):
         exception_mapping = {
@@ -48,6 +48,31 @@ class CircuitBreakerBaseClient:
         self.failures = 0
         logger.info(f"CircuitBreaker {self.client} изменил состояние на CLOSED")
 
+    def configure(
+        self,
+        max_failures: Optional[int] = None,
+        reset_timeout_sec: Optional[int] = None,
+    ):
+        """Новые пороги применяются со следующего вызова, счётчики сохраняются"""
+        if max_failures is not None:
+            self.max_failures = max(1, max_failures)
+        if reset_timeout_sec is not None:
+            self.reset_timeout_sec = max(0, reset_timeout_sec)
+
+    def force(self, state: CircuitBreakerState):
+        """
+        Ручной перевод состояния (admin API). Принудительно открытый выключатель
+        переходит в HALF_OPEN через reset_timeout_sec, как после ошибок.
+        """
+        logger.warning(f"CircuitBreaker {self.client}: состояние {state.value} задано вручную")
+        self.half_open_attempts = 0
+        if state == CircuitBreakerState.OPEN:
+            self._open()
+        elif state == CircuitBreakerState.HALF_OPEN:
+            self._half_open()
+        else:
+            self._close()
+
     async def call(self, func: Callable, *args, **kwargs) -> Any:
         if self.state == CircuitBreakerState.OPEN:
             if (time.time() - self.last_failure_time) >= self.reset_timeout_sec:
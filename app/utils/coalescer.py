@@ -0,0 +1,114 @@
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import COALESCED_UPDATES
+from app.schemas.message import MessageSchema
+
+# Типы, которые имеет смысл придержать: за ними может прийти правка того же сообщения
+COALESCABLE_TYPES = {"message_created", "message_edited"}
+EDIT_TYPE = "message_edited"
+
+PublishCallback = Callable[[MessageSchema], Awaitable[None]]
+# Бот и чат: у разных ботов одного мессенджера chat_id могут совпадать
+ChatKey = Tuple[str, int]
+
+
+@dataclass
+class _Pending:
+    message: MessageSchema
+    publish: PublishCallback
+
+
+class EditCoalescer:
+    """
+    Склейка правок перед публикацией.
+
+    Апдейты копятся по паре (бот, chat_id) в течение window_sec после первого из них.
+    Правка (message_edited) сообщения, которое ещё ждёт публикации, заменяет его
+    содержимое на последнюю версию, сохраняя место в очереди чата и исходный
+    update_type. Остальные апдейты чата публикуются в порядке поступления,
+    пачки одного чата - строго друг за другом.
+    """
+
+    def __init__(self, origin_type: OriginType, window_sec: float = 0.5):
+        self.origin_type = origin_type
+        self.window_sec = window_sec
+        self.pending: Dict[ChatKey, List[_Pending]] = {}
+        self.timers: Dict[ChatKey, asyncio.TimerHandle] = {}
+        # Последняя запущенная публикация чата: следующая ждёт её завершения
+        self.tails: Dict[ChatKey, asyncio.Task] = {}
+        self.flushing: Set[asyncio.Task] = set()
+        # Принятые, но ещё не опубликованные апдейты (для drain)
+        self.held = 0
+
+    def submit(self, bot: str, message: MessageSchema, publish: PublishCallback):
+        """Принимает апдейт бота; publish будет вызван для него (или его последней версии) позже"""
+        key = (bot, message.chat_id)
+        entries = self.pending.get(key)
+        if entries and self._merge(entries, message):
+            COALESCED_UPDATES.labels(origin_type=self.origin_type).inc()
+            return
+
+        if entries is None:
+            entries = self.pending[key] = []
+            delay = self.window_sec if message.update_type in COALESCABLE_TYPES else 0
+            self.timers[key] = asyncio.get_running_loop().call_later(
+                delay, self._schedule_flush, key
+            )
+        entries.append(_Pending(message, publish))
+        self.held += 1
+
+    @staticmethod
+    def _merge(entries: List[_Pending], message: MessageSchema) -> bool:
+        if message.update_type != EDIT_TYPE or not message.message_id:
+            return False
+        for entry in reversed(entries):
+            if entry.message.message_id == message.message_id:
+                entry.message = message.model_copy(
+                    update={"update_type": entry.message.update_type}
+                )
+                return True
+        return False
+
+    def _schedule_flush(self, key: ChatKey):
+        entries = self.pending.pop(key, None)
+        self.timers.pop(key).cancel()
+        if not entries:
+            return
+        task = asyncio.create_task(self._flush(key, entries, self.tails.get(key)))
+        self.tails[key] = task
+        self.flushing.add(task)
+        task.add_done_callback(partial(self._flush_done, key))
+
+    def _flush_done(self, key: ChatKey, task: asyncio.Task):
+        self.flushing.discard(task)
+        if self.tails.get(key) is task:
+            del self.tails[key]
+
+    async def _flush(
+        self,
+        key: ChatKey,
+        entries: List[_Pending],
+        previous: Optional[asyncio.Task],
+    ):
+        if previous is not None:
+            await asyncio.wait([previous])
+        for entry in entries:
+            try:
+                await entry.publish(entry.message)
+            except Exception as e:
+                logger.error(f"Ошибка публикации апдейта чата {key[1]}: {e}")
+            finally:
+                self.held -= 1
+
+    async def flush(self, timeout: float) -> int:
+        """Публикует всё накопленное без ожидания окна, возвращает число неопубликованных"""
+        for key in list(self.pending):
+            self._schedule_flush(key)
+        if self.flushing:
+            await asyncio.wait(set(self.flushing), timeout=timeout)
+        return self.held
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import List, Optional
+
+from redis.exceptions import RedisError
+
+from app.clients.redis.pool import RedisClient, get_redis
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import DEDUP_CHECKS, REDIS_OPERATIONS
+from app.schemas.message import MessageSchema
+
+
+class UpdateDeduplicator:
+    """
+    Индекс идемпотентности апдейтов по update_id.
+
+    Первый уровень - ограниченный LRU в памяти процесса, второй (опционально) -
+    ключи в Redis с TTL, общие для всех реплик. Пачка проверяется в Redis
+    за один round-trip: SET NX для каждого ключа в одном pipeline.
+    """
+
+    def __init__(
+        self,
+        origin_type: OriginType,
+        max_size: int = 10000,
+        use_redis: bool = False,
+        ttl_sec: int = 86400,
+    ):
+        self.origin_type = origin_type
+        self.max_size = max_size
+        self.use_redis = use_redis
+        self.ttl_sec = ttl_sec
+        self.key_prefix = "dedup"
+        self.redis: Optional[RedisClient] = None
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    def _key(self, message: MessageSchema) -> str:
+        return f"{self.key_prefix}:{self.origin_type.value}:{message.update_id}"
+
+    def _remember(self, key: str):
+        self._seen[key] = None
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+
+    def _count(self, layer: str, result: str, amount: int = 1):
+        if amount:
+            DEDUP_CHECKS.labels(
+                origin_type=self.origin_type, layer=layer, result=result
+            ).inc(amount)
+
+    async def _get_redis(self) -> RedisClient:
+        if self.redis is None:
+            self.redis = get_redis()
+        return self.redis
+
+    async def filter_new(self, messages: List[MessageSchema]) -> List[MessageSchema]:
+        """Возвращает только ещё не виденные апдейты, сохраняя их порядок"""
+        candidates = []
+        batch_keys = set()
+        duplicates = 0
+        for message in messages:
+            if not message.update_id:
+                candidates.append((None, message))
+                continue
+            key = self._key(message)
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                duplicates += 1
+                continue
+            if key in batch_keys:
+                duplicates += 1
+                continue
+            batch_keys.add(key)
+            candidates.append((key, message))
+        self._count("memory", "duplicate", duplicates)
+
+        keyed = [key for key, _ in candidates if key]
+        is_new = dict.fromkeys(keyed, True)
+        if keyed and self.use_redis:
+            is_new.update(await self._claim_in_redis(keyed))
+
+        fresh = []
+        redis_duplicates = 0
+        for key, message in candidates:
+            if key is None:
+                fresh.append(message)
+                continue
+            self._remember(key)
+            if is_new[key]:
+                fresh.append(message)
+            else:
+                redis_duplicates += 1
+        self._count("redis", "duplicate", redis_duplicates)
+        self._count("redis" if self.use_redis else "memory", "unique", len(fresh))
+        return fresh
+
+    async def _claim_in_redis(self, keys: List[str]) -> dict:
+        try:
+            client = await self._get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, 1, nx=True, ex=self.ttl_sec)
+                results = await pipe.execute()
+            REDIS_OPERATIONS.labels(
+                origin_type=self.origin_type, operation="dedup_check", status="success"
+            ).inc()
+            return {key: bool(result) for key, result in zip(keys, results)}
+        except (RedisError, ConnectionError) as e:
+            # Дедупликация не должна останавливать приём апдейтов
+            logger.warning(f"Redis недоступен для дедупликации, пропускаем проверку: {e}")
+            REDIS_OPERATIONS.labels(
+                origin_type=self.origin_type, operation="dedup_check", status="error"
+            ).inc()
+            return {}
+
+    async def forget(self, messages: List[MessageSchema]):
+        """Снимает отметку с апдейтов, которые не удалось опубликовать"""
+        keys = [self._key(message) for message in messages if message.update_id]
+        for key in keys:
+            self._seen.pop(key, None)
+        if not keys or not self.use_redis:
+            return
+        try:
+            client = await self._get_redis()
+            await client.delete(*keys)
+        except (RedisError, ConnectionError) as e:
+            logger.warning(f"Не удалось снять отметку дедупликации в Redis: {e}")
+
+    async def close(self):
+        self.redis = None
@@ -0,0 +1,90 @@
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from app.enums.rabbit import MessageCompression
+from app.logger import logger
+from app.schemas.message import MessageSchema
+
+try:
+    import zstandard
+except ImportError:  # zstd - опциональная зависимость
+    zstandard = None
+
+# Одиночное уведомление уходит JSON-строкой с text/plain, как до появления конверта:
+# консьюмеры с телом типа str получают её без изменений
+MESSAGE_CONTENT_TYPE = "text/plain"
+ENVELOPE_SCHEMA_VERSION = 1
+ENVELOPE_CONTENT_TYPE = "application/vnd.notifications.batch+json"
+SCHEMA_VERSION_HEADER = "x-schema-version"
+BATCH_SIZE_HEADER = "x-batch-size"
+
+
+@dataclass
+class Envelope:
+    body: bytes
+    content_type: str = ENVELOPE_CONTENT_TYPE
+    content_encoding: Optional[str] = None
+    headers: Dict[str, Any] = field(default_factory=dict)
+    raw_size: int = 0
+
+
+def dump_message(message: BaseModel) -> bytes:
+    if isinstance(message, MessageSchema):
+        return message.to_json_bytes()
+    return message.model_dump_json().encode()
+
+
+def resolve_compression(compression: MessageCompression) -> MessageCompression:
+    """zstd без установленного zstandard заменяется на gzip"""
+    if compression == MessageCompression.ZSTD and zstandard is None:
+        logger.warning("Пакет zstandard не установлен, вместо zstd используется gzip")
+        return MessageCompression.GZIP
+    return compression
+
+
+def encode_envelope(
+    messages: Sequence[BaseModel],
+    compression: MessageCompression = MessageCompression.NONE,
+    min_bytes: int = 1024,
+) -> Envelope:
+    """
+    Пачка уведомлений -> JSON-массив в одном AMQP-сообщении.
+    Сжимается только пачка не меньше min_bytes: на мелких сообщениях сжатие
+    тратит CPU и почти не экономит байты.
+    """
+    body = b"[" + b",".join(dump_message(m) for m in messages) + b"]"
+    envelope = Envelope(
+        body=body,
+        headers={
+            SCHEMA_VERSION_HEADER: ENVELOPE_SCHEMA_VERSION,
+            BATCH_SIZE_HEADER: len(messages),
+        },
+        raw_size=len(body),
+    )
+    if compression == MessageCompression.NONE or len(body) < min_bytes:
+        return envelope
+
+    if compression == MessageCompression.ZSTD:
+        envelope.body = zstandard.ZstdCompressor().compress(body)
+    else:
+        envelope.body = gzip.compress(body, compresslevel=5)
+    envelope.content_encoding = compression.value
+    return envelope
+
+
+def decode_envelope(
+    body: bytes, content_encoding: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Обратное преобразование для консьюмеров и бенчмарков"""
+    if content_encoding == MessageCompression.GZIP.value:
+        body = gzip.decompress(body)
+    elif content_encoding == MessageCompression.ZSTD.value:
+        if zstandard is None:
+            raise RuntimeError("Для распаковки zstd нужен пакет zstandard")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    data = json.loads(body)
+    return data if isinstance(data, list) else [data]
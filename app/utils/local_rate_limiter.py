@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.config import settings
+from app.enums.polling_workers import OriginType
+from app.logger import logger
+from app.metrics import RATE_LIMIT_DEGRADED, RATE_LIMIT_DEGRADED_SECONDS
+
+
+def degraded_rate(rate_limit: float) -> float:
+    """Локальный лимит реплики без Redis: доля общего лимита origin на число реплик"""
+    return (
+        rate_limit
+        * settings.redis.REDIS_DEGRADED_LIMIT_RATIO
+        / max(1, settings.redis.REDIS_DEGRADED_REPLICAS)
+    )
+
+
+class LocalRateLimiter:
+    """
+    Token bucket в памяти процесса - запасной лимитер на время недоступности Redis.
+
+    Скорость - rate единиц в секунду (доля общего лимита origin, делённая на число
+    реплик), поэтому без Redis квота API не превышается и поллинг не останавливается.
+    Время работы в деградированном режиме учитывается в метрике.
+    """
+
+    def __init__(self, rate: float, origin_type: OriginType):
+        self._check_rate(rate)
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.origin_type = origin_type
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        # Начало текущего периода деградации и момент последнего учёта времени в метрике
+        self.degraded_since: Optional[float] = None
+        self._accounted = 0.0
+
+    def set_rate(self, rate: float):
+        """Новая скорость без сброса накопленных единиц (сверх новой ёмкости - срезаются)"""
+        self._check_rate(rate)
+        self._refill()
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = min(self.tokens, self.capacity)
+
+    @staticmethod
+    def _check_rate(rate: float):
+        # При нулевой скорости корзина не наполняется, и acquire ждал бы вечно
+        if not rate > 0:
+            raise ValueError(f"скорость локального лимита должна быть больше 0, а не {rate}")
+
+    @property
+    def degraded(self) -> bool:
+        return self.degraded_since is not None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _account(self):
+        now = time.monotonic()
+        RATE_LIMIT_DEGRADED_SECONDS.labels(origin_type=self.origin_type).inc(
+            now - self._accounted
+        )
+        self._accounted = now
+
+    def _enter(self):
+        self.degraded_since = self._accounted = time.monotonic()
+        RATE_LIMIT_DEGRADED.labels(origin_type=self.origin_type).set(1)
+        logger.warning(
+            f"Redis недоступен: {self.origin_type.value} переходит на локальный лимит "
+            f"{self.rate:.2f} запросов/с"
+        )
+
+    async def acquire(self, cost: int = 1):
+        """Ждёт, пока в корзине наберётся cost единиц (не больше её ёмкости)"""
+        if not self.degraded:
+            self._enter()
+        async with self.lock:
+            self._refill()
+            need = min(cost, self.capacity)
+            if self.tokens < need:
+                await asyncio.sleep((need - self.tokens) / self.rate)
+                self._refill()
+            # Запрос дороже ёмкости уводит корзину в минус: следующие подождут дольше
+            self.tokens -= cost
+        self._account()
+
+    def recover(self):
+        """Redis снова отвечает - общий лимит опять считается в Redis"""
+        if not self.degraded:
+            return
+        self._account()
+        logger.info(
+            f"Redis доступен: {self.origin_type.value} возвращается к общему лимиту "
+            f"после {time.monotonic() - self.degraded_since:.1f}с"
+        )
+        self.degraded_since = None
+        RATE_LIMIT_DEGRADED.labels(origin_type=self.origin_type).set(0)
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+from app.enums.polling_workers import OriginType
+from app.metrics import POLL_LIMIT, POLL_TIMEOUT
+
+
+@dataclass(frozen=True)
+class PollBounds:
+    """Допустимые long-poll таймаут (с) и размер пачки для origin"""
+
+    min_timeout: int
+    max_timeout: int
+    min_limit: int
+    max_limit: int
+
+
+def pool_timeout_cap(bounds: PollBounds, pollers: int, bots: int) -> int:
+    """
+    Потолок long-poll таймаута для пула из pollers поллеров на bots ботов.
+
+    Простаивающий бот держит поллер весь таймаут, и бот в конце очереди ждёт
+    bots / pollers таких циклов. Потолок делит max_timeout на это число, чтобы
+    полный круг очереди не превышал max_timeout при любом числе токенов.
+    """
+    if bots <= pollers:
+        return bounds.max_timeout
+    return max(bounds.min_timeout, bounds.max_timeout * pollers // bots)
+
+
+class AdaptivePollController:
+    """
+    Подбирает параметры запроса апдейтов под активность бота.
+
+    Пустой ответ - бот простаивает: таймаут long-poll удваивается до max_timeout,
+    и вместо десятков пустых запросов в минуту бот делает один-два. Полная пачка -
+    бот занят: таймаут сбрасывается до минимума, limit удваивается до max_limit.
+    Неполная пачка плавно возвращает таймаут к минимуму. Сверху таймаут
+    ограничен ещё и потолком пула поллеров (cap_timeout).
+    """
+
+    def __init__(self, bounds: PollBounds, origin_type: OriginType, token_suffix: str):
+        self.bounds = bounds
+        self.max_timeout = bounds.max_timeout
+        self._timeout_gauge = POLL_TIMEOUT.labels(
+            origin_type=origin_type, token_suffix=token_suffix
+        )
+        self._limit_gauge = POLL_LIMIT.labels(
+            origin_type=origin_type, token_suffix=token_suffix
+        )
+        self.reset()
+
+    def reset(self):
+        self.timeout = self.bounds.min_timeout
+        self.limit = self.bounds.min_limit
+        self._export()
+
+    def cap_timeout(self, max_timeout: int):
+        bounds = self.bounds
+        self.max_timeout = max(bounds.min_timeout, min(bounds.max_timeout, max_timeout))
+        if self.timeout > self.max_timeout:
+            self.timeout = self.max_timeout
+            self._export()
+
+    def observe(self, received: int):
+        bounds = self.bounds
+        if received == 0:
+            self.timeout = min(self.max_timeout, max(self.timeout * 2, 1))
+        elif received >= self.limit:
+            self.timeout = bounds.min_timeout
+            self.limit = min(bounds.max_limit, self.limit * 2)
+        else:
+            self.timeout = max(bounds.min_timeout, self.timeout // 2)
+        self._export()
+
+    def _export(self):
+        self._timeout_gauge.set(self.timeout)
+        self._limit_gauge.set(self.limit)
@@ -1,26 +1,32 @@
-from faststream.rabbit import RabbitBroker
 import asyncio
 
+from app.clients.rabbit.client import RabbitProducerClient
+from app.clients.rabbit.provide import create_rabbit_client
 from app.logger import logger
 from app.config import settings
+from app.utils.retry import backoff_delay
 
-MAX_RETRIES = 10
-RETRY_DELAY = 5
 
-
-async def wait_for_rabbit():
-    """Ждем, пока RabbitMQ станет доступен."""
-    for attempt in range(1, MAX_RETRIES + 1):
+async def wait_for_rabbit() -> RabbitProducerClient:
+    """Ждем, пока RabbitMQ станет доступен, и возвращаем подключённый клиент."""
+    max_retries = settings.rabbit.RABBITMQ_STARTUP_MAX_RETRIES
+    client = create_rabbit_client()
+    for attempt in range(1, max_retries + 1):
         logger.info("Ожидаем, пока RabbitMQ запустится и станет доступен...")
         try:
-            broker = RabbitBroker(url=settings.rabbit.RABBIT_URL.get_secret_value())
-            await broker.connect()
+            await client.start()
             logger.info("RabbitMQ доступен — продолжаем запуск приложения")
-            await broker.stop()
-            return
+            return client
         except Exception as e:
+            if attempt == max_retries:
+                break
+            delay = backoff_delay(
+                attempt,
+                settings.rabbit.RABBITMQ_STARTUP_BACKOFF_BASE_SEC,
+                settings.rabbit.RABBITMQ_STARTUP_BACKOFF_MAX_SEC,
+            )
             logger.warning(
-                f"RabbitMQ недоступен (попытка {attempt}/{MAX_RETRIES}): {e}"
+                f"RabbitMQ недоступен (попытка {attempt}/{max_retries}), повтор через {delay:.2f}с: {e}"
             )
-            await asyncio.sleep(RETRY_DELAY)
+            await asyncio.sleep(delay)
     raise RuntimeError("Не удалось подключиться к RabbitMQ после нескольких попыток")
@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.logger import logger
+from app.metrics import RETRY_ATTEMPTS, RETRY_BUDGET_EXHAUSTED
+
+# Статусы, при которых сервер просит подождать и может прислать Retry-After
+RETRY_AFTER_STATUSES = {429, 503}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Экспоненциальная задержка с полным jitter"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def retry_after_delay(exc: BaseException) -> Optional[float]:
+    """
+    Задержка, которую запросил сервер: заголовок Retry-After (секунды или дата)
+    или parameters.retry_after в теле ответа (Telegram).
+    """
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    response = exc.response
+    if response.status_code not in RETRY_AFTER_STATUSES:
+        return None
+
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    try:
+        retry_after = response.json().get("parameters", {}).get("retry_after")
+    except Exception:
+        retry_after = None
+    return float(retry_after) if retry_after is not None else None
+
+
+class RetryBudget:
+    """
+    Бюджет повторов зависимости: за последние window_sec повторов может быть
+    не больше ratio от числа запросов (плюс min_retries на случай малого трафика).
+    При частичной аварии повторы не умножают нагрузку на зависимость.
+    """
+
+    def __init__(
+        self,
+        dependency: str,
+        ratio: float = 0.1,
+        min_retries: int = 10,
+        window_sec: int = 10,
+    ):
+        self.dependency = dependency
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_sec = window_sec
+        # Посекундные корзины [секунда, запросы, повторы]
+        self.buckets: Deque[List[int]] = deque()
+
+    def _bucket(self) -> List[int]:
+        now = int(time.monotonic())
+        while self.buckets and self.buckets[0][0] <= now - self.window_sec:
+            self.buckets.popleft()
+        if not self.buckets or self.buckets[-1][0] != now:
+            self.buckets.append([now, 0, 0])
+        return self.buckets[-1]
+
+    def record_request(self):
+        self._bucket()[1] += 1
+
+    def try_retry(self) -> bool:
+        bucket = self._bucket()
+        requests = sum(b[1] for b in self.buckets)
+        retries = sum(b[2] for b in self.buckets)
+        if retries >= self.ratio * requests + self.min_retries:
+            RETRY_BUDGET_EXHAUSTED.labels(dependency=self.dependency).inc()
+            return False
+        bucket[2] += 1
+        RETRY_ATTEMPTS.labels(dependency=self.dependency).inc()
+        return True
+
+
+class RetryPolicy:
+    """Повторы с экспоненциальной задержкой, полным jitter, бюджетом и учётом Retry-After"""
+
+    def __init__(
+        self,
+        dependency: str,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+        retry_after_max: float = 120.0,
+    ):
+        self.dependency = dependency
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_after_max = retry_after_max
+
+    def record_request(self):
+        if self.budget:
+            self.budget.record_request()
+
+    def next_delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """
+        Пауза перед следующей попыткой. Retry-After сервера важнее своей задержки;
+        при исчерпанном бюджете jitter не сокращает паузу, а её потолок удваивается.
+        """
+        retry_after = retry_after_delay(exc) if exc is not None else None
+        if retry_after is not None:
+            if self.budget:
+                self.budget.try_retry()
+            return min(retry_after, self.retry_after_max)
+        if self.budget and not self.budget.try_retry():
+            return min(self.max_delay, self.base_delay * 2**attempt)
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            self.record_request()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                retry_after = retry_after_delay(e)
+                if self.budget and not self.budget.try_retry():
+                    logger.warning(
+                        f"{self.dependency}: бюджет повторов исчерпан, ошибка не повторяется: {e}"
+                    )
+                    raise
+                if retry_after is not None:
+                    delay = min(retry_after, self.retry_after_max)
+                else:
+                    delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                logger.warning(
+                    f"{self.dependency}: попытка {attempt}/{self.max_attempts} неуспешна, повтор через {delay:.2f}с: {e}"
+                )
+                await asyncio.sleep(delay)
+
+
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(dependency: str) -> RetryBudget:
+    """Один бюджет на зависимость для всех её клиентов"""
+    if dependency not in _budgets:
+        _budgets[dependency] = RetryBudget(
+            dependency,
+            ratio=settings.retry.RETRY_BUDGET_RATIO,
+            min_retries=settings.retry.RETRY_BUDGET_MIN_RETRIES,
+            window_sec=settings.retry.RETRY_BUDGET_WINDOW_SEC,
+        )
+    return _budgets[dependency]
+
+
+def get_retry_policy(
+    dependency: str,
+    max_attempts: int = 3,
+    max_delay: Optional[float] = None,
+) -> RetryPolicy:
+    return RetryPolicy(
+        dependency,
+        max_attempts=max_attempts,
+        base_delay=settings.retry.RETRY_BASE_DELAY_SEC,
+        max_delay=max_delay or settings.retry.RETRY_MAX_DELAY_SEC,
+        budget=get_retry_budget(dependency),
+        retry_after_max=settings.retry.RETRY_AFTER_MAX_SEC,
+    )
@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Set
+
+from app.clients.redis.pool import get_redis
+from app.enums.polling_workers import TokenSourceType
+from app.origin_clients.registry import OriginConfig
+
+
+class BaseTokenSource(ABC):
+    """Источник актуального набора токенов ботов"""
+
+    @abstractmethod
+    async def load(self) -> Set[str]:
+        pass
+
+    async def close(self):
+        pass
+
+
+class EnvTokenSource(BaseTokenSource):
+    """Перечитывает <ORIGIN>_TOKENS_STR из окружения и .env"""
+
+    def __init__(self, reader: Callable[[], Set[str]]):
+        self.reader = reader
+
+    async def load(self) -> Set[str]:
+        return self.reader()
+
+
+class FileTokenSource(BaseTokenSource):
+    """Файл с токенами: по одному на строку или через запятую, # - комментарий"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def load(self) -> Set[str]:
+        tokens = set()
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0]
+            tokens.update(token.strip() for token in line.split(",") if token.strip())
+        return tokens
+
+
+class RedisTokenSource(BaseTokenSource):
+    """Множество токенов в Redis (SADD/SREM на ключе)"""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    async def load(self) -> Set[str]:
+        return set(await get_redis().smembers(self.key))
+
+
+def get_token_source(origin: OriginConfig) -> BaseTokenSource:
+    if origin.tokens_source == TokenSourceType.FILE:
+        return FileTokenSource(origin.tokens_file)
+    if origin.tokens_source == TokenSourceType.REDIS:
+        return RedisTokenSource(origin.tokens_redis_key)
+    return EnvTokenSource(origin.env_tokens)
@@ -0,0 +1,149 @@
+import os
+import threading
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Optional, Sequence
+
+from app.config import settings
+from app.enums.tracing import TracingExporter
+from app.logger import logger
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # OpenTelemetry - опциональная зависимость
+    trace = None
+
+# None - трассировка выключена: span() отдаёт общий пустой контекст,
+# inject_headers() возвращает заголовки как есть
+_tracer = None
+_provider = None
+_NOOP = nullcontext()
+
+
+if trace is not None:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """Спаны в файл, по JSON-объекту на строку, для разбора без коллектора"""
+
+        def __init__(self, path: str):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+            self.lock = threading.Lock()
+
+        def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+            lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+            with self.lock:
+                self.file.write(lines)
+                self.file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            with self.lock:
+                self.file.close()
+
+
+def _create_exporter():
+    config = settings.tracing
+    if config.TRACING_EXPORTER == TracingExporter.FILE:
+        return JsonLinesSpanExporter(config.TRACING_FILE_PATH)
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+    except ImportError:
+        logger.warning(
+            "Пакет opentelemetry-exporter-otlp-proto-http не установлен, спаны пишутся в "
+            f"{config.TRACING_FILE_PATH}"
+        )
+        return JsonLinesSpanExporter(config.TRACING_FILE_PATH)
+    return OTLPSpanExporter(endpoint=config.TRACING_OTLP_ENDPOINT)
+
+
+def setup_tracing():
+    """Включает трассировку по TracingSettings; без OpenTelemetry остаётся выключенной"""
+    global _tracer, _provider
+    config = settings.tracing
+    if not config.TRACING_ENABLED or _tracer is not None:
+        return
+    if trace is None:
+        logger.warning("Пакет opentelemetry-sdk не установлен, трассировка выключена")
+        return
+
+    # Решение родителя (traceparent) сохраняется, корневые спаны - с долей sample_ratio
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(config.TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+    _tracer = _provider.get_tracer("app")
+    logger.info(
+        f"Трассировка включена: {config.TRACING_EXPORTER.value}, "
+        f"доля {config.TRACING_SAMPLE_RATIO}"
+    )
+
+
+def shutdown_tracing():
+    """Отправляет накопленные спаны и останавливает экспорт"""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+
+def span(
+    name: str,
+    attributes: Optional[Dict] = None,
+    links: Optional[List] = None,
+    root: bool = False,
+) -> ContextManager:
+    """
+    Спан вокруг блока: `with span("...") as current`. При выключенной
+    трассировке current - None. root - новый трейс без родителя из контекста.
+    """
+    if _tracer is None:
+        return _NOOP
+    if attributes:
+        # None не допускается в атрибутах спана
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+    return _tracer.start_as_current_span(
+        name,
+        context=otel_context.Context() if root else None,
+        attributes=attributes,
+        links=links,
+    )
+
+
+def record_error(current, exc: BaseException):
+    """Ошибка, перехваченная внутри спана, который сам её не увидит"""
+    if current is None:
+        return
+    current.record_exception(exc)
+    current.set_status(Status(StatusCode.ERROR, str(exc)))
+
+
+def current_link():
+    """Ссылка на текущий спан для спана пачки; None без трассировки"""
+    if _tracer is None:
+        return None
+    context = trace.get_current_span().get_span_context()
+    return trace.Link(context) if context.is_valid else None
+
+
+def inject_headers(headers: Optional[Dict] = None) -> Optional[Dict]:
+    """Добавляет traceparent текущего спана в заголовки AMQP-сообщения"""
+    if _tracer is None:
+        return headers
+    headers = dict(headers or {})
+    propagate.inject(headers)
+    return headers
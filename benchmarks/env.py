@@ -0,0 +1,22 @@
+"""
+Окружение для офлайн-бенчмарков.
+
+Модуль должен импортироваться до любого модуля из app: настройки читаются
+при импорте app.config, поэтому обязательные переменные подставляются заранее.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("RABBITMQ_USER", "bench")
+os.environ.setdefault("RABBITMQ_PASS", "bench")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("LOGGING_LEVEL", "WARNING")
+
+
+def quiet_logger():
+    """Отключает файловые логи приложения, чтобы они не искажали замеры"""
+    from app.logger import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
@@ -0,0 +1,202 @@
+"""Общая сборка воркеров и отчёта для бенчмарков"""
+
+import asyncio
+import subprocess
+import time
+from dataclasses import replace
+from typing import List, Optional
+
+from benchmarks.stubs import (
+    DeliveryRecorder,
+    FakeRedis,
+    FakeTamTamAPI,
+    StubRabbitBroker,
+    make_stub_publisher,
+)
+from app.config import settings
+from app.clients.rabbit.backpressure import (
+    BackpressureController,
+    get_backpressure_controller,
+)
+from app.clients.rabbit.routing import get_message_router
+from app.clients.redis.pool import close_redis, create_redis, get_redis, set_redis
+from app.clients.redis.redis_client import RedisRateLimiter
+from app.clients.sinks.provide import create_rabbit_sink, wrap_batch_publisher
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.polling_workers import OriginType
+from app.origin_clients.registry import get_origin_config
+from app.origin_clients.tamtam import TamTamClient
+from app.service import (
+    get_chat_cache,
+    get_coalescer,
+    get_deduplicator,
+    get_fallback_limiter,
+)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_ms(values: List[float], q: float) -> Optional[float]:
+    value = percentile(values, q)
+    return round(value * 1000, 3) if value is not None else None
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+class Bench:
+    """Набор воркеров поверх заглушек, собранный так же, как в service.py"""
+
+    def __init__(
+        self,
+        api: FakeTamTamAPI,
+        broker: StubRabbitBroker,
+        rate_limit: int,
+        redis_url: Optional[str] = None,
+        redis_latency_ms: float = 0.0,
+        max_pollers: Optional[int] = None,
+        drain_timeout: float = 5.0,
+    ):
+        self.api = api
+        self.broker = broker
+        self.rate_limit = rate_limit
+        self.redis_url = redis_url
+        self.fake_redis = None if redis_url else FakeRedis(redis_latency_ms)
+        self.max_pollers = max_pollers or settings.tam_tam.TAM_TAM_MAX_POLLING_BOTS
+        self.drain_timeout = drain_timeout
+        self.http_client = api.http_client()
+        self.chat_cache = get_chat_cache(OriginType.TAMTAM)
+        self.registry: Optional[WorkerRegistry] = None
+        self.backpressure: Optional[BackpressureController] = None
+        self._backpressure_task: Optional[asyncio.Task] = None
+        self.limiter: Optional[RedisRateLimiter] = None
+        self._redis_ops_before = 0
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def make_client(self, token: str) -> TamTamClient:
+        origin = get_origin_config(OriginType.TAMTAM)
+        client = TamTamClient(
+            token,
+            http_client=self.http_client,
+            raw_passthrough=origin.raw_passthrough,
+            poll_limit=origin.poll_limit,
+            poll_timeout=origin.poll_timeout_sec,
+            update_types=origin.update_types,
+            chat_cache=self.chat_cache,
+        )
+        client.base_url = self.api.base_url
+        return client
+
+    async def build(self):
+        # Все пользователи Redis получают общий клиент процесса
+        set_redis(self.fake_redis or create_redis(self.redis_url))
+        deduplicator = get_deduplicator(OriginType.TAMTAM)
+
+        self.limiter = RedisRateLimiter(self.rate_limit, OriginType.TAMTAM)
+        await self.limiter.connect()
+
+        publisher = wrap_batch_publisher(
+            create_rabbit_sink(await make_stub_publisher(self.broker))
+        )
+        router = get_message_router()
+        self.backpressure = get_backpressure_controller(
+            publisher, [queue.name for queue in router.queues()]
+        )
+        self.registry = WorkerRegistry(
+            OriginType.TAMTAM,
+            self.make_client,
+            publisher,
+            self.limiter,
+            router,
+            deduplicator,
+            max_concurrency=self.max_pollers,
+            coalescer=get_coalescer(OriginType.TAMTAM),
+            poll_bounds=get_origin_config(OriginType.TAMTAM).poll_bounds(),
+            fallback_limiter=get_fallback_limiter(
+                replace(get_origin_config(OriginType.TAMTAM), rate_limit=self.rate_limit)
+            ),
+            backpressure=self.backpressure,
+        )
+
+    async def redis_ops(self) -> int:
+        if self.fake_redis is not None:
+            return self.fake_redis.ops
+        info = await get_redis().info("stats")
+        return int(info["total_commands_processed"])
+
+    async def redis_outage(self, after: float, duration: float):
+        """Отключает заглушку Redis на duration секунд через after секунд после старта"""
+        if self.fake_redis is None or duration <= 0:
+            return
+        await asyncio.sleep(after)
+        self.fake_redis.available = False
+        await asyncio.sleep(duration)
+        self.fake_redis.available = True
+
+    async def start(self):
+        self._redis_ops_before = await self.redis_ops()
+        self._wall_start, self._cpu_start = time.perf_counter(), time.process_time()
+        await self.api.start()
+        if self.backpressure:
+            self._backpressure_task = asyncio.create_task(self.backpressure.run())
+        self.registry.scheduler.start()
+        await self.registry.sync(set(self.api.bots))
+
+    async def stop(self) -> dict:
+        await self.api.stop()
+        if self._backpressure_task:
+            self._backpressure_task.cancel()
+        dropped = await self.registry.drain(self.drain_timeout)
+        await self.http_client.aclose()
+
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        redis_ops = await self.redis_ops() - self._redis_ops_before
+        await self.limiter.disconnect()
+        await close_redis()
+
+        recorder: DeliveryRecorder = self.api.recorder
+        delivered = recorder.delivered
+
+        def per_message(value):
+            return round(value / delivered, 4) if delivered else None
+
+        return {
+            "revision": git_revision(),
+            "generated": recorder.generated,
+            "delivered": delivered,
+            "poll_errors": self.registry.scheduler.errors,
+            "drain_dropped": dropped,
+            "wall_seconds": round(wall, 3),
+            "messages_per_sec": round(delivered / wall, 3),
+            "latency_p50_ms": latency_ms(recorder.latencies, 50),
+            "latency_p99_ms": latency_ms(recorder.latencies, 99),
+            "redis_ops": redis_ops,
+            "redis_ops_per_message": per_message(redis_ops),
+            "rate_limit_denied": (
+                self.fake_redis.rate_limit_denied if self.fake_redis else None
+            ),
+            "cpu_seconds": round(cpu, 4),
+            "cpu_ms_per_message": per_message(cpu * 1000),
+            "api_calls": dict(self.api.calls),
+            "api_calls_per_message": per_message(sum(self.api.calls.values())),
+            "amqp_publishes": self.broker.published,
+            "amqp_bytes": self.broker.published_bytes,
+            "amqp_routes": dict(sorted(self.broker.routes.items())),
+            "amqp_max_backlog": self.broker.max_backlog,
+        }
@@ -0,0 +1,148 @@
+"""
+Бенчмарк цикла PollingWorker -> RedisRateLimiter -> RabbitProducerClient.
+
+Прогоняет N токенов через настоящий цикл воркера поверх локальных заглушек
+TamTam Bot API, Redis и RabbitMQ и печатает результаты в JSON:
+
+    python -m benchmarks.polling --tokens 50 --rate 2 --duration 30 > before.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+import benchmarks.env as bench_env  # noqa: F401  (должен импортироваться первым)
+
+from benchmarks.harness import Bench, latency_ms
+from benchmarks.stubs import DeliveryRecorder, FakeTamTamAPI, StubRabbitBroker
+
+
+async def run(args) -> dict:
+    tokens = [f"bench-token-{i:05d}" for i in range(args.tokens)]
+    recorder = DeliveryRecorder()
+    api = FakeTamTamAPI(
+        tokens,
+        recorder,
+        rate_per_token=args.rate,
+        latency_ms=args.api_latency_ms,
+        latency_jitter_ms=args.api_jitter_ms,
+        seed=args.seed,
+        error_rate=args.api_error_rate,
+        retry_after=args.api_retry_after,
+        callback_ratio=args.callback_ratio,
+        noise_ratio=args.noise_ratio,
+    )
+    bench = Bench(
+        api,
+        StubRabbitBroker(
+            recorder,
+            latency_ms=args.rabbit_latency_ms,
+            consumer_rate=args.consumer_rate,
+        ),
+        rate_limit=args.rate_limit,
+        redis_url=args.redis_url,
+        redis_latency_ms=args.redis_latency_ms,
+        max_pollers=args.max_pollers,
+    )
+    await bench.build()
+    await bench.start()
+    outage = asyncio.create_task(
+        bench.redis_outage(args.redis_outage_at, args.redis_outage_sec)
+    )
+    await asyncio.sleep(args.duration)
+    outage.cancel()
+    result = await bench.stop()
+    result["params"] = vars(args)
+    result["latency_p99_ms_by_type"] = {
+        update_type: latency_ms(latencies, 99)
+        for update_type, latencies in sorted(recorder.latencies_by_group.items())
+    }
+    return result
+
+
+def add_common_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--api-latency-ms", type=float, default=20.0)
+    parser.add_argument("--api-jitter-ms", type=float, default=10.0)
+    parser.add_argument(
+        "--api-error-rate",
+        type=float,
+        default=0.0,
+        help="доля ответов /updates с ошибкой (429 при --api-retry-after, иначе 500)",
+    )
+    parser.add_argument("--api-retry-after", type=float, default=None)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument(
+        "--redis-outage-sec",
+        type=float,
+        default=0.0,
+        help="длительность недоступности заглушки Redis",
+    )
+    parser.add_argument(
+        "--redis-outage-at", type=float, default=1.0, help="начало недоступности, с"
+    )
+    parser.add_argument("--rabbit-latency-ms", type=float, default=1.0)
+    parser.add_argument(
+        "--consumer-rate",
+        type=float,
+        default=None,
+        help="скорость потребителей очереди, AMQP-сообщений/с (по умолчанию без отставания)",
+    )
+    parser.add_argument(
+        "--redis-url",
+        default=None,
+        help="использовать локальный Redis вместо in-process заглушки",
+    )
+    parser.add_argument(
+        "--max-pollers",
+        type=int,
+        default=None,
+        help="размер пула поллеров (по умолчанию TAM_TAM_MAX_POLLING_BOTS)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="файл для JSON-результата")
+
+
+def write_result(result: dict, output=None):
+    payload = json.dumps(result, indent=2, sort_keys=True, ensure_ascii=False)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    sys.stdout.write(payload + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=10, help="количество ботов")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность, с")
+    parser.add_argument("--rate", type=float, default=1.0, help="апдейтов/с на бота")
+    parser.add_argument(
+        "--callback-ratio",
+        type=float,
+        default=0.0,
+        help="доля нажатий кнопок (message_callback) среди апдейтов",
+    )
+    parser.add_argument(
+        "--noise-ratio",
+        type=float,
+        default=0.0,
+        help="доля ненужных сервису апдейтов (message_removed)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=1000,
+        help="max_requests_per_service лимитера (в сервисе сейчас 2)",
+    )
+    add_common_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    bench_env.quiet_logger()
+    write_result(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
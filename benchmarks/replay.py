@@ -0,0 +1,223 @@
+"""
+Воспроизведение записанных трасс апдейтов через TamTamClient и путь публикации.
+
+Трасса - JSONL, одна строка на апдейт:
+
+    {"ts": 1718000000.125, "bot": "shop-bot", "update": {...TamTam Update...}}
+
+ts - время поступления в секундах (если нет - берётся update.timestamp в мс),
+bot - метка бота (токены в трассы не пишем). Строка может содержать и целый
+ответ GET /updates: {"ts": ..., "bot": ..., "updates": [...], "marker": ...}.
+
+    python -m benchmarks.replay trace.jsonl --speed 10
+    python -m benchmarks.replay --synthesize trace.jsonl --bots 50 --skew 1.2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import benchmarks.env as bench_env  # noqa: F401  (должен импортироваться первым)
+
+from benchmarks.harness import Bench, latency_ms
+from benchmarks.polling import add_common_args, write_result
+from benchmarks.stubs import (
+    DeliveryRecorder,
+    FakeTamTamAPI,
+    StubRabbitBroker,
+    delivery_key,
+)
+from app.origin_clients.tamtam import TamTamClient
+
+
+@dataclass
+class TraceEvent:
+    ts: float
+    bot: str
+    update: dict
+
+
+def load_trace(path: str) -> List[TraceEvent]:
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            bot = str(record.get("bot", "default"))
+            updates = record["updates"] if "updates" in record else [record["update"]]
+            for update in updates:
+                ts = record.get("ts")
+                if ts is None:
+                    ts = update.get("timestamp", 0) / 1000
+                events.append(TraceEvent(float(ts), bot, update))
+    events.sort(key=lambda event: event.ts)
+    return events
+
+
+def synthesize_trace(path: str, bots: int, events: int, duration: float, skew: float, seed: int):
+    """Генерирует трассу с zipf-перекосом нагрузки по ботам и пачками сообщений"""
+    rnd = random.Random(seed)
+    weights = [1 / (i + 1) ** skew for i in range(bots)]
+    start = time.time()
+    ts = 0.0
+    rate = events / duration
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < events:
+            ts += rnd.expovariate(rate)
+            bot = rnd.choices(range(bots), weights)[0]
+            burst = rnd.randint(2, 20) if rnd.random() < 0.05 else 1
+            for _ in range(min(burst, events - written)):
+                written += 1
+                chat_id = 1000 + bot * 100 + rnd.randrange(10)
+                update = {
+                    "update_type": "message_created",
+                    "timestamp": int((start + ts) * 1000),
+                    "message": {
+                        "recipient": {"chat_id": chat_id, "chat_type": "dialog"},
+                        "sender": {"user_id": chat_id, "name": f"user{chat_id}"},
+                        "body": {"mid": f"mid.{written}", "seq": written, "text": f"msg {written}"},
+                    },
+                }
+                record = {"ts": round(ts, 6), "bot": f"bot-{bot:03d}", "update": update}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                ts += rnd.uniform(0, 0.01)
+
+
+async def replay(args) -> dict:
+    events = load_trace(args.trace)
+    if not events:
+        raise SystemExit("Трасса пуста")
+
+    bots = sorted({event.bot for event in events})
+    token_by_bot = {bot: f"replay-{i:05d}" for i, bot in enumerate(bots)}
+    recorder = DeliveryRecorder()
+    api = FakeTamTamAPI(
+        list(token_by_bot.values()),
+        recorder,
+        rate_per_token=0,
+        latency_ms=args.api_latency_ms,
+        latency_jitter_ms=args.api_jitter_ms,
+        seed=args.seed,
+        error_rate=args.api_error_rate,
+        retry_after=args.api_retry_after,
+    )
+    bench = Bench(
+        api,
+        StubRabbitBroker(
+            recorder,
+            latency_ms=args.rabbit_latency_ms,
+            consumer_rate=args.consumer_rate,
+        ),
+        rate_limit=args.rate_limit,
+        redis_url=args.redis_url,
+        redis_latency_ms=args.redis_latency_ms,
+        max_pollers=args.max_pollers,
+    )
+    await bench.build()
+
+    parser = TamTamClient("replay")
+    per_bot: Dict[str, int] = {bot: 0 for bot in bots}
+    unparseable = 0
+
+    await bench.start()
+    outage = asyncio.create_task(
+        bench.redis_outage(args.redis_outage_at, args.redis_outage_sec)
+    )
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    first_ts = events[0].ts
+    for event in events:
+        if args.speed > 0:
+            delay = (event.ts - first_ts) / args.speed - (loop.time() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        wrapped = {"updates": [event.update]}
+        chat_id = parser.get_chat_id_from_update(wrapped)
+        key = None
+        if chat_id is None:
+            unparseable += 1
+        else:
+            key = delivery_key(chat_id, parser.get_text(wrapped))
+        per_bot[event.bot] += 1
+        api.push(token_by_bot[event.bot], event.update, key=key, group=event.bot)
+    replay_seconds = loop.time() - started
+
+    deadline = loop.time() + args.drain_timeout
+    while recorder.outstanding and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+
+    outage.cancel()
+    result = await bench.stop()
+    result["params"] = vars(args)
+    result["trace"] = {
+        "events": len(events),
+        "bots": len(bots),
+        "span_seconds": round(events[-1].ts - first_ts, 3),
+        "replay_seconds": round(replay_seconds, 3),
+        "unparseable": unparseable,
+        "undelivered": recorder.outstanding,
+    }
+    result["per_bot"] = {
+        bot: {
+            "updates": per_bot[bot],
+            "delivered": len(recorder.latencies_by_group.get(bot, [])),
+            "latency_p50_ms": latency_ms(recorder.latencies_by_group.get(bot, []), 50),
+            "latency_p99_ms": latency_ms(recorder.latencies_by_group.get(bot, []), 99),
+        }
+        for bot in bots
+    }
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("trace", help="путь к JSONL-трассе")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="множитель скорости воспроизведения, 0 - без пауз",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=2,
+        help="max_requests_per_service лимитера (как в service.py)",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=30.0,
+        help="сколько ждать доставки после конца трассы, с",
+    )
+    parser.add_argument(
+        "--synthesize",
+        action="store_true",
+        help="не воспроизводить, а сгенерировать синтетическую трассу в trace",
+    )
+    parser.add_argument("--bots", type=int, default=20)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--span", type=float, default=60.0, help="длительность трассы, с")
+    parser.add_argument("--skew", type=float, default=1.1, help="zipf-перекос по ботам")
+    add_common_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.synthesize:
+        synthesize_trace(args.trace, args.bots, args.events, args.span, args.skew, args.seed)
+        return
+    bench_env.quiet_logger()
+    write_result(asyncio.run(replay(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Бенчмарк получателей уведомлений: RabbitMQ, Redis Streams, файл.
+
+Параллельные отправители (как воркеры) публикуют одинаковый поток уведомлений
+через MessageRouter и BatchPublisher в каждый получатель по очереди;
+для каждого печатаются пропускная способность, CPU и число записей:
+
+    python -m benchmarks.sinks --messages 20000 --concurrency 500 > sinks.json
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import benchmarks.env as bench_env  # noqa: F401  (должен импортироваться первым)
+
+from benchmarks.harness import git_revision, latency_ms
+from benchmarks.polling import write_result
+from benchmarks.stubs import (
+    DeliveryRecorder,
+    FakeRedis,
+    StubRabbitBroker,
+    make_stub_publisher,
+)
+from app.clients.rabbit.routing import get_message_router
+from app.clients.redis.pool import close_redis, create_redis, set_redis
+from app.clients.sinks.base import BaseSink
+from app.clients.sinks.file import FileSink
+from app.clients.sinks.provide import wrap_batch_publisher
+from app.clients.sinks.rabbit import RabbitSink
+from app.clients.sinks.redis_stream import RedisStreamSink
+from app.enums.polling_workers import OriginType
+from app.enums.sink import SinkType
+from app.metrics import registry
+from app.schemas.message import MessageSchema
+
+
+def make_messages(count: int, chats: int) -> List[MessageSchema]:
+    return [
+        MessageSchema(
+            chat_id=1000 + i % chats,
+            text=f"bench message {i}",
+            chat_user_name="bench",
+            update_id=str(i),
+            update_type="message_created",
+            message_id=f"mid.{i}",
+            timestamp=1718000000000 + i,
+            sender_id=1000 + i % chats,
+        )
+        for i in range(count)
+    ]
+
+
+def sink_writes(name: str) -> float:
+    return (
+        registry.get_sample_value(
+            "origin_sink_write_duration_seconds_count", {"sink": name}
+        )
+        or 0.0
+    )
+
+
+async def build_sink(sink_type: SinkType, args, workdir: str):
+    """Получатель и функция, возвращающая (round-trips, байты) для отчёта"""
+    batch = {
+        "batch_max_messages": args.batch_max_messages,
+        "batch_max_delay_sec": args.batch_max_delay_ms / 1000,
+    }
+    if sink_type == SinkType.RABBITMQ:
+        broker = StubRabbitBroker(DeliveryRecorder(), latency_ms=args.rabbit_latency_ms)
+        sink = RabbitSink(
+            await make_stub_publisher(broker), envelope=args.envelope, **batch
+        )
+        return sink, lambda: (broker.published, broker.published_bytes)
+
+    if sink_type == SinkType.REDIS_STREAM:
+        fake = None if args.redis_url else FakeRedis(args.redis_latency_ms)
+        set_redis(fake or create_redis(args.redis_url))
+        sink = RedisStreamSink(maxlen=args.stream_maxlen, **batch)
+        await sink.start()
+        if fake is None:
+            return sink, lambda: (None, None)
+        return sink, lambda: (fake.ops, fake.stream_bytes)
+
+    directory = tempfile.mkdtemp(prefix="sink-", dir=workdir)
+    sink = FileSink(directory, fsync=args.fsync, **batch)
+    await sink.start()
+
+    def file_stats():
+        return None, sum(file.tell() for file in sink.files.values())
+
+    return sink, file_stats
+
+
+async def run_sink(sink_type: SinkType, messages: List[MessageSchema], args, workdir):
+    sink, stats = await build_sink(sink_type, args, workdir)
+    publisher: BaseSink = wrap_batch_publisher(sink)
+    router = get_message_router()
+    writes_before = sink_writes(sink.name)
+    queue: asyncio.Queue = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    latencies: List[float] = []
+
+    async def sender():
+        while not queue.empty():
+            message = queue.get_nowait()
+            route = router.route(message, OriginType.TAMTAM)
+            started = time.perf_counter()
+            await publisher.send(
+                message,
+                route.queue,
+                route.exchange,
+                route.routing_key,
+                route.priority,
+                route.partition,
+            )
+            latencies.append(time.perf_counter() - started)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(sender() for _ in range(args.concurrency)))
+    await publisher.flush()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    round_trips, written_bytes = stats()
+    writes = int(sink_writes(sink.name) - writes_before)
+    await publisher.stop()
+    if sink_type == SinkType.REDIS_STREAM:
+        await close_redis()
+
+    count = len(messages)
+    return {
+        "messages": count,
+        "wall_seconds": round(wall, 3),
+        "messages_per_sec": round(count / wall, 1),
+        "cpu_seconds": round(cpu, 4),
+        "cpu_ms_per_message": round(cpu * 1000 / count, 4),
+        "send_latency_p50_ms": latency_ms(latencies, 50),
+        "send_latency_p99_ms": latency_ms(latencies, 99),
+        "writes": writes,
+        "messages_per_write": round(count / writes, 2) if writes else None,
+        "round_trips": round_trips,
+        "bytes": written_bytes,
+    }
+
+
+async def run(args) -> dict:
+    messages = make_messages(args.messages, args.chats)
+    workdir = tempfile.mkdtemp(prefix="bench-sinks-", dir=args.file_dir)
+    results: Dict[str, dict] = {}
+    try:
+        for name in args.sinks.split(","):
+            sink_type = SinkType(name.strip())
+            results[sink_type.value] = await run_sink(sink_type, messages, args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"revision": git_revision(), "sinks": results, "params": vars(args)}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sinks",
+        default=",".join(sink.value for sink in SinkType),
+        help="получатели через запятую",
+    )
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument(
+        "--concurrency", type=int, default=500, help="параллельных отправителей"
+    )
+    parser.add_argument("--batch-max-messages", type=int, default=100)
+    parser.add_argument("--batch-max-delay-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--envelope",
+        action="store_true",
+        help="RabbitMQ: пачки одним конвертом (иначе поштучно)",
+    )
+    parser.add_argument("--rabbit-latency-ms", type=float, default=1.0)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.5)
+    parser.add_argument(
+        "--redis-url",
+        default=None,
+        help="использовать локальный Redis вместо in-process заглушки",
+    )
+    parser.add_argument("--stream-maxlen", type=int, default=1000000)
+    parser.add_argument(
+        "--file-dir", default=None, help="каталог для файлового получателя (tmp)"
+    )
+    parser.add_argument("--fsync", action="store_true")
+    parser.add_argument("--output", default=None, help="файл для JSON-результата")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    bench_env.quiet_logger()
+    write_result(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
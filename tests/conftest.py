@@ -0,0 +1,8 @@
+import os
+
+# Настройки читаются при импорте app.config, поэтому обязательные переменные
+# задаются до импорта тестовых модулей
+os.environ.setdefault("RABBITMQ_USER", "test")
+os.environ.setdefault("RABBITMQ_PASS", "test")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("LOGGING_LEVEL", "WARNING")
@@ -0,0 +1,110 @@
+"""Заглушки для модульных тестов: клиент мессенджера, получатель, лимитер"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.clients.polling_worker import PollingWorker
+from app.clients.rabbit.routing import MessageRouter, Route
+from app.clients.sinks.base import BaseSink
+from app.enums.polling_workers import OriginType
+from app.origin_clients.base_client import BaseOriginClient
+from app.schemas.message import MessageSchema
+from app.utils.circuit_breaker.rabbit import CircuitBreakerRabbitClient
+from app.utils.circuit_breaker.redis import CircuitBreakerRedisClient
+
+
+def make_message(
+    chat_id: int = 1,
+    update_type: str = "message_created",
+    message_id: Optional[str] = None,
+    text: Optional[str] = None,
+    update_id: Optional[str] = None,
+) -> MessageSchema:
+    return MessageSchema(
+        chat_id=chat_id,
+        update_type=update_type,
+        message_id=message_id,
+        text=text,
+        update_id=update_id,
+    )
+
+
+class FakeOriginClient(BaseOriginClient):
+    """Клиент мессенджера: fetch_updates забирает всё из pending"""
+
+    origin_type = OriginType.TAMTAM
+
+    def __init__(self, token: str = "test-token-0001"):
+        self.token = token
+        self.token_suffix = token[-4:]
+        self.marker: Optional[str] = None
+        self.pending: List[MessageSchema] = []
+        self.fetches = 0
+        self.acked: List[MessageSchema] = []
+        self.error: Optional[Exception] = None
+
+    async def create_client(self):
+        pass
+
+    async def close_client(self):
+        pass
+
+    async def fetch_updates(self, limit=None, timeout=None) -> List[MessageSchema]:
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        batch, self.pending = self.pending, []
+        return batch
+
+    async def ack(self, messages: List[MessageSchema]):
+        self.acked.extend(messages)
+
+
+class RecordingSink(BaseSink):
+    """Получатель, запоминающий пачки и их маршруты; error - ошибка записи"""
+
+    name = "recording"
+
+    def __init__(self):
+        self.writes: List[Tuple[List[BaseModel], Route]] = []
+        self.error: Optional[Exception] = None
+
+    async def _write(self, messages: Sequence[BaseModel], route: Route):
+        if self.error:
+            raise self.error
+        self.writes.append((list(messages), route))
+
+    async def check(self) -> bool:
+        return True
+
+    @property
+    def messages(self) -> List[BaseModel]:
+        return [message for batch, _ in self.writes for message in batch]
+
+
+class FakeRateLimiter:
+    """Общий лимит без Redis: пропускает все запросы"""
+
+    def __init__(self):
+        self.acquired = 0
+
+    async def wait_for_service(self, service, cost: int = 1):
+        self.acquired += cost
+
+
+def make_worker(
+    client: Optional[FakeOriginClient] = None,
+    sink: Optional[BaseSink] = None,
+    router: Optional[MessageRouter] = None,
+    **kwargs,
+) -> PollingWorker:
+    return PollingWorker(
+        client or FakeOriginClient(),
+        sink or RecordingSink(),
+        FakeRateLimiter(),
+        CircuitBreakerRabbitClient(),
+        CircuitBreakerRedisClient(),
+        router or MessageRouter("notifications"),
+        **kwargs,
+    )
@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import pytest
+
+from app.admin.api import AdminAPI
+from app.admin.server import AdminServer, Request
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.redis.redis_client import RedisRateLimiter
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.polling_workers import OriginType
+from app.logger import get_log_level, set_log_level
+from app.utils.local_rate_limiter import LocalRateLimiter
+from tests.fakes import FakeOriginClient, RecordingSink
+
+TOKEN = "admin-secret"
+AUTH = {"authorization": f"Bearer {TOKEN}"}
+
+
+@pytest.fixture
+def admin():
+    registry = WorkerRegistry(
+        OriginType.TAMTAM,
+        FakeOriginClient,
+        RecordingSink(),
+        RedisRateLimiter(2, OriginType.TAMTAM),
+        MessageRouter("notifications"),
+        fallback_limiter=LocalRateLimiter(1, OriginType.TAMTAM),
+    )
+    asyncio.run(registry.sync({"bot-token-aaaa", "bot-token-bbbb"}))
+    server = AdminServer("127.0.0.1", 0, TOKEN)
+    AdminAPI({OriginType.TAMTAM: registry}).register(server)
+    level = get_log_level()
+    yield server, registry
+    set_log_level(level)
+
+
+def call(server, method, path, body=None, headers=AUTH):
+    data = json.dumps(body).encode() if body is not None else b""
+    request = Request(method, path, headers=headers, body=data)
+    return asyncio.run(server.dispatch(request))
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [{}, {"authorization": "Bearer wrong"}, {"authorization": f"Basic {TOKEN}"}],
+)
+def test_requests_without_valid_token_are_rejected(admin, headers):
+    server, _ = admin
+
+    status, _ = call(server, "GET", "/state", headers=headers)
+
+    assert status == 401
+
+
+def test_server_without_token_rejects_everything(admin):
+    _, registry = admin
+    server = AdminServer("127.0.0.1", 0, None)
+    AdminAPI({OriginType.TAMTAM: registry}).register(server)
+
+    status, _ = call(server, "GET", "/state", headers={"authorization": "Bearer "})
+
+    assert status == 401
+
+
+def test_state_lists_workers_by_token_suffix(admin):
+    server, _ = admin
+
+    status, payload = call(server, "GET", "/state")
+
+    assert status == 200
+    workers = payload["origins"]["TAMTAM"]["workers"]
+    assert sorted(worker["token_suffix"] for worker in workers) == ["aaaa", "bbbb"]
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/origins/viber", 404),
+        ("GET", "/nope", 404),
+        ("DELETE", "/state", 405),
+        ("POST", "/origins/tamtam/workers/zzzz/pause", 404),
+        ("PUT", "/origins/tamtam/breakers/kafka", 404),
+    ],
+)
+def test_unknown_resources(admin, method, path, expected):
+    server, _ = admin
+
+    status, payload = call(server, method, path, body={})
+
+    assert status == expected
+    assert "error" in payload
+
+
+def test_pause_and_resume_worker(admin):
+    server, registry = admin
+
+    status, paused = call(server, "POST", "/origins/tamtam/workers/aaaa/pause")
+    _, resumed = call(server, "POST", "/origins/tamtam/workers/aaaa/resume")
+
+    assert status == 200
+    assert (paused["paused"], paused["state"]) == (True, "paused")
+    assert (resumed["paused"], resumed["state"]) == (False, "running")
+
+
+@pytest.mark.parametrize("value", [0, -1, "5", True, None, 1.5])
+def test_rate_limit_rejects_invalid_values(admin, value):
+    server, registry = admin
+
+    status, _ = call(
+        server, "PUT", "/origins/tamtam/rate-limit", {"max_requests_per_service": value}
+    )
+
+    assert status == 400
+    assert registry.rate_limiter.max_requests_per_service == 2
+
+
+def test_rate_limit_updates_shared_and_fallback_limiters(admin):
+    server, registry = admin
+
+    status, limiter = call(
+        server, "PUT", "/origins/tamtam/rate-limit", {"max_requests_per_service": 10}
+    )
+
+    assert status == 200
+    assert limiter["max_requests_per_service"] == 10
+    assert registry.rate_limiter.max_requests_per_service == 10
+    assert registry.fallback_limiter.rate > 0
+
+
+def test_breaker_can_be_forced_and_reconfigured(admin):
+    server, registry = admin
+
+    status, breaker = call(
+        server,
+        "PUT",
+        "/origins/tamtam/breakers/redis",
+        {"state": "open", "max_failures": 7},
+    )
+
+    assert status == 200
+    assert (breaker["state"], breaker["max_failures"]) == ("OPEN", 7)
+    assert registry.redis_cb.max_failures == 7
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{"state": "broken"}, {"max_failures": 0}, {"reset_timeout_sec": "10"}],
+)
+def test_breaker_rejects_invalid_body(admin, body):
+    server, _ = admin
+
+    status, _ = call(server, "PUT", "/origins/tamtam/breakers/rabbitmq", body)
+
+    assert status == 400
+
+
+def test_log_level(admin):
+    server, _ = admin
+
+    bad, _ = call(server, "PUT", "/log-level", {"level": "verbose"})
+    status, payload = call(server, "PUT", "/log-level", {"level": "debug"})
+
+    assert bad == 400
+    assert (status, payload) == (200, {"log_level": "DEBUG"})
+
+
+def test_http_round_trip_rejects_non_json_body(admin):
+    server, _ = admin
+
+    async def scenario():
+        await server.start()
+        port = server.server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                b"PUT /log-level HTTP/1.1\r\n"
+                b"Authorization: Bearer " + TOKEN.encode() + b"\r\n"
+                b"Content-Length: 3\r\n\r\nnot"
+            )
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            await server.stop()
+
+    response = asyncio.run(scenario())
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400")
+    assert "error" in json.loads(body)
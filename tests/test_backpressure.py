@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from app.clients.rabbit.backpressure import BackpressureController
+from app.enums.rabbit import BackpressureMode
+from tests.fakes import RecordingSink, make_message, make_worker
+
+
+class StatsSink(RecordingSink):
+    """Получатель с заданной глубиной очередей"""
+
+    supports_queue_stats = True
+
+    def __init__(self, stats):
+        super().__init__()
+        self.stats = stats
+
+    async def queue_stats(self, queue):
+        return self.stats[queue]
+
+
+def make_controller(stats=None) -> BackpressureController:
+    return BackpressureController(
+        StatsSink(stats or {}),
+        list(stats or {}),
+        throttle_depth=10,
+        pause_depth=100,
+        throttle_delay_sec=2.0,
+    )
+
+
+def test_mode_follows_deepest_queue():
+    controller = make_controller({"a": (5, 1), "b": (50, 1)})
+    asyncio.run(controller.sample())
+    assert controller.mode == BackpressureMode.THROTTLE
+    assert controller.depth == 50
+
+    controller.publisher.stats["b"] = (500, 1)
+    asyncio.run(controller.sample())
+    assert controller.paused
+
+    controller.publisher.stats["b"] = (0, 1)
+    asyncio.run(controller.sample())
+    assert controller.mode == BackpressureMode.NORMAL
+    assert controller.poll_delay == 0.0
+
+
+def test_pause_depth_not_below_throttle_depth():
+    controller = BackpressureController(
+        StatsSink({}), [], throttle_depth=100, pause_depth=10
+    )
+    assert controller.pause_depth == 100
+
+
+def test_pause_keeps_non_priority_updates():
+    controller = make_controller()
+    worker = make_worker(backpressure=controller)
+    client, sink = worker.client, worker.publisher
+    client.pending = [
+        make_message(chat_id=1, update_type="message_created", text="created"),
+        make_message(chat_id=1, update_type="message_callback", text="callback"),
+    ]
+
+    controller.mode = BackpressureMode.PAUSE
+    asyncio.run(worker.poll_once())
+    # API не опрашивается, курсор стоит: апдейты ждут у мессенджера
+    assert client.fetches == 0
+    assert len(client.pending) == 2
+    assert worker.resume_at > time.monotonic()
+
+    controller.mode = BackpressureMode.NORMAL
+    worker.resume_at = 0.0
+    asyncio.run(worker.poll_once())
+    assert client.fetches == 1
+    assert [message.text for message in sink.messages] == ["created", "callback"]
+
+
+def test_throttle_delays_next_poll():
+    controller = make_controller()
+    controller.mode = BackpressureMode.THROTTLE
+    worker = make_worker(backpressure=controller)
+    worker.client.pending = [make_message()]
+
+    asyncio.run(worker.poll_once())
+    assert worker.client.fetches == 1
+    assert worker.resume_at >= time.monotonic() + 1.5
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+
+from app.enums.polling_workers import OriginType
+from app.origin_clients.telegram import TelegramClient
+from app.utils.chat_cache import ChatMetadata, ChatMetadataCache
+
+
+def test_merge_keeps_cached_fields_and_prefers_fresh_ones():
+    cache = ChatMetadataCache(OriginType.TAMTAM)
+    cache.put(ChatMetadata(1, title="Старое", chat_type="chat"))
+
+    merged = cache.merge(ChatMetadata(1, title="Новое"))
+
+    assert merged == ChatMetadata(1, title="Новое", chat_type="chat")
+    assert cache.get(1) == merged
+
+
+def test_size_limit_evicts_least_recently_used():
+    cache = ChatMetadataCache(OriginType.TAMTAM, max_size=2)
+    cache.put(ChatMetadata(1))
+    cache.put(ChatMetadata(2))
+    cache.get(1)
+    cache.put(ChatMetadata(3))
+
+    assert set(cache.get_many([1, 2, 3])) == {1, 3}
+    assert len(cache) == 2
+
+
+def test_entry_expires_after_ttl():
+    fresh = ChatMetadataCache(OriginType.TAMTAM, ttl_sec=3600)
+    expired = ChatMetadataCache(OriginType.TAMTAM, ttl_sec=0)
+    for cache in (fresh, expired):
+        cache.put(ChatMetadata(1, title="Чат"))
+
+    assert fresh.get(1) is not None
+    assert expired.get(1) is None
+    assert len(expired) == 0
+
+
+def test_client_enriches_update_without_chat_from_cache():
+    updates = [
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 1,
+                "chat": {"id": 77, "type": "group", "title": "Команда"},
+                "text": "a",
+            },
+        },
+        # В сообщении callback чат без названия и типа
+        {
+            "update_id": 2,
+            "callback_query": {
+                "id": "cb",
+                "from": {"id": 5},
+                "message": {"message_id": 2, "chat": {"id": 77}},
+                "data": "button",
+            },
+        },
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"ok": True, "result": updates})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache = ChatMetadataCache(OriginType.TELEGRAM)
+    client = TelegramClient("1:token", http_client=http, chat_cache=cache)
+
+    messages = asyncio.run(client.fetch_updates())
+
+    assert [(m.chat_title, m.chat_type) for m in messages] == [
+        ("Команда", "group"),
+        ("Команда", "group"),
+    ]
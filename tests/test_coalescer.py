@@ -0,0 +1,85 @@
+import asyncio
+
+from app.enums.polling_workers import OriginType
+from app.utils.coalescer import EditCoalescer
+from tests.fakes import make_message
+
+
+class Published:
+    def __init__(self, error_on=None):
+        self.messages = []
+        self.error_on = error_on
+
+    async def __call__(self, message):
+        if self.error_on is not None and message.text == self.error_on:
+            raise RuntimeError("publish failed")
+        self.messages.append(message)
+
+
+def test_edit_replaces_pending_message_keeping_position():
+    async def scenario():
+        coalescer = EditCoalescer(OriginType.TAMTAM, window_sec=0.02)
+        published = Published()
+        coalescer.submit("bot", make_message(1, message_id="a", text="v1"), published)
+        coalescer.submit("bot", make_message(1, message_id="b", text="other"), published)
+        coalescer.submit(
+            "bot", make_message(1, "message_edited", message_id="a", text="v2"), published
+        )
+        assert coalescer.held == 2
+        await asyncio.sleep(0.05)
+        return coalescer, published
+
+    coalescer, published = asyncio.run(scenario())
+
+    assert [(m.message_id, m.text, m.update_type) for m in published.messages] == [
+        ("a", "v2", "message_created"),
+        ("b", "other", "message_created"),
+    ]
+    assert coalescer.held == 0
+
+
+def test_same_chat_of_different_bots_is_not_merged():
+    async def scenario():
+        coalescer = EditCoalescer(OriginType.TAMTAM, window_sec=10)
+        published = Published()
+        coalescer.submit("bot1", make_message(1, message_id="a", text="v1"), published)
+        coalescer.submit(
+            "bot2", make_message(1, "message_edited", message_id="a", text="v2"), published
+        )
+        held = await coalescer.flush(timeout=1)
+        return held, published
+
+    held, published = asyncio.run(scenario())
+
+    assert held == 0
+    assert [m.text for m in published.messages] == ["v1", "v2"]
+
+
+def test_flush_publishes_without_waiting_for_window():
+    async def scenario():
+        coalescer = EditCoalescer(OriginType.TAMTAM, window_sec=10)
+        published = Published(error_on="bad")
+        coalescer.submit("bot", make_message(1, message_id="a", text="bad"), published)
+        coalescer.submit("bot", make_message(2, message_id="b", text="ok"), published)
+        held = await coalescer.flush(timeout=1)
+        return held, published
+
+    held, published = asyncio.run(scenario())
+
+    # Ошибка публикации не повторяется и не оставляет апдейт придержанным
+    assert held == 0
+    assert [m.text for m in published.messages] == ["ok"]
+
+
+def test_non_coalescable_type_is_not_held_for_window():
+    async def scenario():
+        coalescer = EditCoalescer(OriginType.TAMTAM, window_sec=10)
+        published = Published()
+        coalescer.submit("bot", make_message(1, "bot_started"), published)
+        await asyncio.sleep(0.01)
+        return coalescer, published
+
+    coalescer, published = asyncio.run(scenario())
+
+    assert len(published.messages) == 1
+    assert coalescer.held == 0
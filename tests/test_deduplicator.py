@@ -0,0 +1,115 @@
+import asyncio
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.enums.polling_workers import OriginType
+from app.utils.deduplicator import UpdateDeduplicator
+from tests.fakes import make_message
+
+
+class SetNxRedis:
+    """SET NX и DELETE в памяти; error - ошибка выполнения pipeline"""
+
+    def __init__(self):
+        self.keys = set()
+        self.error = None
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def delete(self, *keys):
+        self.keys.difference_update(keys)
+
+
+class _Pipeline:
+    def __init__(self, redis: SetNxRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, nx=False, ex=None):
+        self.commands.append(key)
+
+    async def execute(self):
+        if self.redis.error:
+            raise self.redis.error
+        results = [key not in self.redis.keys for key in self.commands]
+        self.redis.keys.update(self.commands)
+        return results
+
+
+def ids(messages):
+    return [message.update_id for message in messages]
+
+
+def test_memory_layer_drops_repeats_within_and_across_batches():
+    dedup = UpdateDeduplicator(OriginType.TAMTAM)
+    batch = [
+        make_message(update_id="1"),
+        make_message(update_id="1"),
+        make_message(update_id=None),
+        make_message(update_id="2"),
+    ]
+
+    first = asyncio.run(dedup.filter_new(batch))
+    second = asyncio.run(
+        dedup.filter_new([make_message(update_id="2"), make_message(update_id="3")])
+    )
+
+    # Апдейты без update_id не дедуплицируются
+    assert ids(first) == ["1", None, "2"]
+    assert ids(second) == ["3"]
+
+
+def test_memory_layer_is_bounded_lru():
+    dedup = UpdateDeduplicator(OriginType.TAMTAM, max_size=2)
+    for update_id in ("1", "2", "3"):
+        asyncio.run(dedup.filter_new([make_message(update_id=update_id)]))
+
+    again = asyncio.run(
+        dedup.filter_new([make_message(update_id="1"), make_message(update_id="3")])
+    )
+
+    assert ids(again) == ["1"]
+
+
+def test_redis_layer_is_shared_between_replicas():
+    redis = SetNxRedis()
+    first = UpdateDeduplicator(OriginType.TAMTAM, use_redis=True)
+    second = UpdateDeduplicator(OriginType.TAMTAM, use_redis=True)
+    first.redis = second.redis = redis
+
+    asyncio.run(first.filter_new([make_message(update_id="1")]))
+    fresh = asyncio.run(
+        second.filter_new([make_message(update_id="1"), make_message(update_id="2")])
+    )
+
+    assert ids(fresh) == ["2"]
+    assert redis.keys == {"dedup:TAMTAM:1", "dedup:TAMTAM:2"}
+
+
+def test_redis_error_lets_updates_through():
+    dedup = UpdateDeduplicator(OriginType.TAMTAM, use_redis=True)
+    dedup.redis = SetNxRedis()
+    dedup.redis.error = RedisConnectionError("down")
+
+    fresh = asyncio.run(dedup.filter_new([make_message(update_id="1")]))
+
+    assert ids(fresh) == ["1"]
+
+
+def test_forget_allows_republish():
+    dedup = UpdateDeduplicator(OriginType.TAMTAM, use_redis=True)
+    dedup.redis = SetNxRedis()
+    message = make_message(update_id="1")
+    asyncio.run(dedup.filter_new([message]))
+
+    asyncio.run(dedup.forget([message]))
+    fresh = asyncio.run(dedup.filter_new([message]))
+
+    assert ids(fresh) == ["1"]
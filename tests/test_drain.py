@@ -0,0 +1,89 @@
+import asyncio
+
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.polling_workers import OriginType
+from tests.fakes import FakeOriginClient, FakeRateLimiter, RecordingSink, make_message
+
+
+class SlowSink(RecordingSink):
+    """Запись ждёт release; started - первая запись началась"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def _write(self, messages, route):
+        self.started.set()
+        await self.release.wait()
+        await super()._write(messages, route)
+
+
+class MemoryMarkerStore:
+    def __init__(self):
+        self.saved = {}
+
+    async def load_many(self, tokens):
+        return {}
+
+    async def save_many(self, markers):
+        self.saved.update(markers)
+
+
+class MarkedClient(FakeOriginClient):
+    """Курсор сдвигается при получении апдейтов, как у настоящих клиентов"""
+
+    async def fetch_updates(self, limit=None, timeout=None):
+        updates = await super().fetch_updates(limit, timeout)
+        if updates:
+            self.marker = f"marker-{self.fetches}"
+        return updates
+
+
+async def drain_with_publish_in_flight(release_after: float, timeout: float):
+    sink = SlowSink()
+    markers = MemoryMarkerStore()
+    clients = []
+
+    def client_factory(token):
+        client = MarkedClient(token)
+        client.pending = [make_message(1, text="in flight")]
+        clients.append(client)
+        return client
+
+    registry = WorkerRegistry(
+        OriginType.TAMTAM,
+        client_factory,
+        sink,
+        FakeRateLimiter(),
+        MessageRouter("notifications"),
+        marker_store=markers,
+    )
+    await registry.sync({"bot-token-aaaa"})
+    registry.scheduler.start()
+    await asyncio.wait_for(sink.started.wait(), 1)
+    asyncio.get_running_loop().call_later(release_after, sink.release.set)
+
+    dropped = await registry.drain(timeout)
+    return dropped, sink, markers, registry
+
+
+def test_drain_waits_for_received_updates_and_saves_markers():
+    dropped, sink, markers, registry = asyncio.run(
+        drain_with_publish_in_flight(release_after=0.02, timeout=1)
+    )
+
+    assert dropped == 0
+    assert [message.text for message in sink.messages] == ["in flight"]
+    assert list(markers.saved.values()) == ["marker-1"]
+    assert registry.workers == {}
+
+
+def test_drain_counts_updates_dropped_at_deadline():
+    dropped, sink, markers, _ = asyncio.run(
+        drain_with_publish_in_flight(release_after=10, timeout=0.02)
+    )
+
+    assert dropped == 1
+    assert sink.messages == []
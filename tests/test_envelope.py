@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from app.enums.rabbit import MessageCompression
+from app.utils import envelope as envelope_module
+from app.utils.envelope import (
+    BATCH_SIZE_HEADER,
+    ENVELOPE_SCHEMA_VERSION,
+    SCHEMA_VERSION_HEADER,
+    decode_envelope,
+    encode_envelope,
+    resolve_compression,
+)
+from tests.fakes import make_message
+
+
+def messages(count: int):
+    return [make_message(i, text=f"текст {i}", update_id=str(i)) for i in range(count)]
+
+
+def test_uncompressed_envelope_is_json_array_with_headers():
+    batch = messages(3)
+
+    envelope = encode_envelope(batch)
+
+    assert envelope.content_encoding is None
+    assert envelope.headers == {
+        SCHEMA_VERSION_HEADER: ENVELOPE_SCHEMA_VERSION,
+        BATCH_SIZE_HEADER: 3,
+    }
+    assert decode_envelope(envelope.body) == [
+        json.loads(message.model_dump_json()) for message in batch
+    ]
+
+
+def test_gzip_round_trip_above_threshold():
+    batch = messages(50)
+
+    envelope = encode_envelope(batch, MessageCompression.GZIP, min_bytes=1024)
+
+    assert envelope.content_encoding == "gzip"
+    assert len(envelope.body) < envelope.raw_size
+    assert [m["chat_id"] for m in decode_envelope(envelope.body, "gzip")] == list(range(50))
+
+
+def test_small_batch_is_not_compressed():
+    envelope = encode_envelope(messages(1), MessageCompression.GZIP, min_bytes=1024)
+
+    assert envelope.content_encoding is None
+    assert len(envelope.body) == envelope.raw_size
+
+
+def test_zstd_falls_back_to_gzip_without_package(monkeypatch):
+    monkeypatch.setattr(envelope_module, "zstandard", None)
+
+    assert resolve_compression(MessageCompression.ZSTD) == MessageCompression.GZIP
+    with pytest.raises(RuntimeError):
+        decode_envelope(b"", "zstd")
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    envelope = encode_envelope(messages(50), MessageCompression.ZSTD, min_bytes=0)
+
+    assert envelope.content_encoding == "zstd"
+    assert len(decode_envelope(envelope.body, "zstd")) == 50
+
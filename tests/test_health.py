@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+
+from app.admin.health import HealthAPI
+from app.admin.server import AdminServer, Request
+from app.clients import health as health_module
+from app.clients.health import HealthChecker
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.circuit_breaker import CircuitBreakerState
+from app.enums.polling_workers import OriginType
+from tests.fakes import FakeOriginClient, FakeRateLimiter, RecordingSink
+
+
+class CheckedSink(RecordingSink):
+    def __init__(self, ok: bool = True, delay: float = 0):
+        super().__init__()
+        self.ok = ok
+        self.delay = delay
+        self.checks = 0
+
+    async def check(self) -> bool:
+        self.checks += 1
+        await asyncio.sleep(self.delay)
+        return self.ok
+
+
+class PingRedis:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def ping(self):
+        if self.error:
+            raise self.error
+        return True
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = PingRedis()
+    monkeypatch.setattr(health_module, "get_redis", lambda: redis)
+    return redis
+
+
+def make_registry() -> WorkerRegistry:
+    return WorkerRegistry(
+        OriginType.TAMTAM,
+        FakeOriginClient,
+        RecordingSink(),
+        FakeRateLimiter(),
+        MessageRouter("notifications"),
+    )
+
+
+def make_checker(sink=None, registry=None, **kwargs) -> HealthChecker:
+    registries = {OriginType.TAMTAM: registry or make_registry()}
+    return HealthChecker(sink or CheckedSink(), registries, timeout_sec=0.05, **kwargs)
+
+
+def test_ready_only_after_start_and_passed_checks(redis):
+    checker = make_checker()
+
+    asyncio.run(checker.check())
+    assert not checker.ready()
+    checker.mark_started()
+
+    assert checker.ready()
+    checker.mark_stopping()
+    assert not checker.ready()
+
+
+def test_failed_sink_makes_service_not_ready(redis):
+    checker = make_checker(CheckedSink(ok=False))
+    checker.mark_started()
+
+    asyncio.run(checker.check())
+
+    assert not checker.ready()
+    assert checker.checks["sink"]["ok"] is False
+
+
+def test_slow_dependency_times_out(redis):
+    checker = make_checker(CheckedSink(delay=1))
+
+    asyncio.run(checker.check())
+
+    assert checker.checks["sink"]["ok"] is False
+    assert "error" in checker.checks["sink"]
+
+
+@pytest.mark.parametrize("required, ready", [(False, True), (True, False)])
+def test_redis_is_required_only_without_local_limiter(redis, required, ready):
+    redis.error = ConnectionError("down")
+    checker = make_checker(redis_required=required)
+    checker.mark_started()
+
+    asyncio.run(checker.check())
+
+    assert checker.checks["redis"]["ok"] is False
+    assert checker.ready() is ready
+
+
+def test_open_breaker_skips_ping(redis):
+    sink = CheckedSink()
+    registry = make_registry()
+    registry.publisher_cb.force(CircuitBreakerState.OPEN)
+    checker = make_checker(sink, registry)
+
+    asyncio.run(checker.check())
+
+    assert sink.checks == 0
+    assert checker.checks["sink"]["ok"] is False
+
+
+def test_stale_heartbeat_with_due_workers_fails_origin(redis):
+    registry = make_registry()
+    asyncio.run(registry.sync({"bot-token-aaaa"}))
+    registry.scheduler.heartbeat_at = time.monotonic() - 1000
+    checker = make_checker(registry=registry, stale_sec=120)
+
+    asyncio.run(checker.check())
+
+    assert checker.checks["tamtam"]["ok"] is False
+    assert checker.checks["tamtam"]["due"] == 1
+
+
+def test_probes_read_snapshot_without_touching_dependencies(redis):
+    sink = CheckedSink()
+    checker = make_checker(sink)
+    checker.mark_started()
+    server = AdminServer("127.0.0.1", 0)
+    HealthAPI(checker).register(server)
+
+    async def scenario():
+        await checker.check()
+        return [
+            await server.dispatch(Request("GET", path))
+            for path in ("/health", "/ready", "/ready")
+        ]
+
+    responses = asyncio.run(scenario())
+
+    assert [status for status, _ in responses] == [200, 200, 200]
+    assert responses[1][1]["status"] == "ready"
+    assert sink.checks == 1
+
+
+def test_not_ready_probe_returns_503(redis):
+    checker = make_checker()
+    server = AdminServer("127.0.0.1", 0)
+    HealthAPI(checker).register(server)
+
+    status, payload = asyncio.run(server.dispatch(Request("GET", "/ready")))
+
+    assert (status, payload["status"]) == (503, "not_ready")
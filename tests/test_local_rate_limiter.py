@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import RedisSettings, TamTamSettings, TelegramSettings
+from app.enums.polling_workers import OriginType
+from app.utils.local_rate_limiter import LocalRateLimiter
+
+
+@pytest.mark.parametrize("rate", [0, -1, 0.0])
+def test_zero_or_negative_rate_is_rejected(rate):
+    with pytest.raises(ValueError):
+        LocalRateLimiter(rate, OriginType.TAMTAM)
+
+
+def test_set_rate_rejects_zero_and_keeps_previous_rate():
+    limiter = LocalRateLimiter(2, OriginType.TAMTAM)
+
+    with pytest.raises(ValueError):
+        limiter.set_rate(0)
+
+    assert limiter.rate == 2
+
+
+def test_acquire_waits_for_refill(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = LocalRateLimiter(2, OriginType.TAMTAM)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire()
+
+    asyncio.run(scenario())
+
+    # Ёмкость - 2 запроса, третий ждёт половину секунды при 2 запросах/с
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(0.5, abs=0.01)
+
+
+def test_recover_leaves_degraded_mode():
+    limiter = LocalRateLimiter(2, OriginType.TAMTAM)
+
+    asyncio.run(limiter.acquire())
+    assert limiter.degraded
+    limiter.recover()
+
+    assert not limiter.degraded
+
+
+@pytest.mark.parametrize(
+    "settings_class, values",
+    [
+        (TamTamSettings, {"TAM_TAM_RATE_LIMIT": 0}),
+        (TelegramSettings, {"TELEGRAM_RATE_LIMIT": -5}),
+        (RedisSettings, {"REDIS_DEGRADED_LIMIT_RATIO": 0}),
+        (RedisSettings, {"REDIS_DEGRADED_REPLICAS": 0}),
+    ],
+)
+def test_settings_reject_limits_that_stop_polling(settings_class, values):
+    with pytest.raises(ValidationError):
+        settings_class(**values)
@@ -0,0 +1,54 @@
+import asyncio
+
+from app import main, on_startup
+
+
+def run_serve(stop_event: asyncio.Event = None) -> int:
+    async def serve():
+        return await main.serve(stop_event or asyncio.Event(), asyncio.Event())
+
+    return asyncio.run(asyncio.wait_for(serve(), 5))
+
+
+def test_rabbit_never_up_exits_non_zero(monkeypatch):
+    async def wait_for_rabbit():
+        raise RuntimeError("Не удалось подключиться к RabbitMQ после нескольких попыток")
+
+    monkeypatch.setattr(on_startup, "wait_for_rabbit", wait_for_rabbit)
+    assert run_serve() == 1
+
+
+def test_workers_crash_exits_non_zero(monkeypatch):
+    async def on_startup():
+        return object()
+
+    async def start_all_workers(publisher, reload_event):
+        raise RuntimeError("воркеры упали")
+
+    monkeypatch.setattr(main, "on_startup", on_startup)
+    monkeypatch.setattr(main, "start_all_workers", start_all_workers)
+    assert run_serve() == 1
+
+
+def test_stop_signal_exits_zero(monkeypatch):
+    started = []
+
+    async def on_startup():
+        return object()
+
+    async def start_all_workers(publisher, reload_event):
+        started.append(publisher)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main, "on_startup", on_startup)
+    monkeypatch.setattr(main, "start_all_workers", start_all_workers)
+
+    async def serve_and_stop():
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(main.serve(stop_event, asyncio.Event()))
+        while not started:
+            await asyncio.sleep(0)
+        stop_event.set()
+        return await task
+
+    assert asyncio.run(asyncio.wait_for(serve_and_stop(), 5)) == 0
@@ -0,0 +1,71 @@
+import asyncio
+
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.polling_workers import OriginType
+from app.utils.poll_controller import AdaptivePollController, PollBounds, pool_timeout_cap
+from tests.fakes import FakeOriginClient, FakeRateLimiter, RecordingSink
+
+BOUNDS = PollBounds(min_timeout=1, max_timeout=8, min_limit=100, max_limit=1000)
+
+
+def make_controller() -> AdaptivePollController:
+    return AdaptivePollController(BOUNDS, OriginType.TAMTAM, "test")
+
+
+def test_idle_bot_timeout_doubles_up_to_max():
+    controller = make_controller()
+    for expected in (2, 4, 8, 8):
+        controller.observe(0)
+        assert controller.timeout == expected
+
+
+def test_full_batch_resets_timeout_and_grows_limit():
+    controller = make_controller()
+    controller.observe(0)
+    controller.observe(100)
+    assert (controller.timeout, controller.limit) == (1, 200)
+
+
+def test_pool_cap_keeps_round_within_max_timeout():
+    assert pool_timeout_cap(BOUNDS, pollers=10, bots=5) == 8
+    assert pool_timeout_cap(BOUNDS, pollers=2, bots=4) == 4
+    assert pool_timeout_cap(BOUNDS, pollers=2, bots=1000) == BOUNDS.min_timeout
+
+
+def test_cap_lowers_current_timeout():
+    controller = make_controller()
+    for _ in range(3):
+        controller.observe(0)
+    controller.cap_timeout(2)
+    assert controller.timeout == 2
+    controller.observe(0)
+    assert controller.timeout == 2
+
+
+async def timeouts_caps(bots: int, keep: int):
+    registry = WorkerRegistry(
+        OriginType.TAMTAM,
+        FakeOriginClient,
+        RecordingSink(),
+        FakeRateLimiter(),
+        MessageRouter("notifications"),
+        max_concurrency=2,
+        poll_bounds=BOUNDS,
+    )
+    tokens = [f"test-token-{i:04d}" for i in range(bots)]
+    for token in tokens:
+        await registry.add(token)
+    crowded = {w.poll_controller.max_timeout for w in registry.workers.values()}
+    for token in tokens[keep:]:
+        await registry.remove(token)
+    relaxed = {w.poll_controller.max_timeout for w in registry.workers.values()}
+    return crowded, relaxed
+
+
+def test_registry_caps_timeouts_when_bots_outnumber_pollers():
+    crowded, relaxed = asyncio.run(timeouts_caps(bots=8, keep=2))
+    # 8 ботов на 2 поллера: круг очереди 4 цикла по 2с
+    assert crowded == {2}
+    # Ботов не больше поллеров - потолок снимается
+    assert relaxed == {8}
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.clients.polling_scheduler import PollingScheduler
+from app.enums.polling_workers import OriginType
+from tests.fakes import FakeOriginClient, make_worker
+
+
+class SlowClient(FakeOriginClient):
+    """Каждый запрос - короткий long-poll; считает одновременные запросы"""
+
+    active = 0
+    peak = 0
+
+    async def fetch_updates(self, limit=None, timeout=None):
+        SlowClient.active += 1
+        SlowClient.peak = max(SlowClient.peak, SlowClient.active)
+        try:
+            await asyncio.sleep(0.001)
+            return await super().fetch_updates(limit, timeout)
+        finally:
+            SlowClient.active -= 1
+
+
+async def run_round_robin(bots: int, pollers: int, rounds: int):
+    scheduler = PollingScheduler(OriginType.TAMTAM, pollers)
+    workers = [make_worker(SlowClient(f"test-token-{i:04d}")) for i in range(bots)]
+    for worker in workers:
+        await worker.start()
+        scheduler.add(worker)
+    scheduler.start()
+    while min(worker.client.fetches for worker in workers) < rounds:
+        await asyncio.sleep(0)
+    await scheduler.stop()
+    return [worker.client.fetches for worker in workers]
+
+
+def test_more_bots_than_pollers_served_in_turn():
+    SlowClient.peak = 0
+    fetches = asyncio.run(asyncio.wait_for(run_round_robin(12, 3, rounds=3), 5))
+    # Одновременно не больше поллеров, и ни один бот не отстаёт больше чем на круг
+    assert SlowClient.peak <= 3
+    assert max(fetches) - min(fetches) <= 1
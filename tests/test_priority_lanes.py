@@ -0,0 +1,73 @@
+import asyncio
+
+from app.clients.rabbit.routing import MessageRouter
+from app.enums.polling_workers import OriginType
+from app.enums.rabbit import PriorityLane, PriorityMode
+from app.utils.coalescer import EditCoalescer
+from tests.fakes import RecordingSink, make_message, make_worker
+
+
+def make_router(mode: PriorityMode, partitions: int = 2) -> MessageRouter:
+    return MessageRouter(
+        "notifications",
+        partitions=partitions,
+        priority_mode=mode,
+        priority_types=["message_callback"],
+    )
+
+
+def test_lanes_are_off_without_priority_mode():
+    router = make_router(PriorityMode.NONE)
+
+    route = router.route(make_message(1, "message_callback"), OriginType.TAMTAM)
+
+    assert router.lane(make_message(1, "message_callback")) == PriorityLane.NORMAL
+    assert route.priority is None
+
+
+def test_priority_queue_mode_sets_amqp_priority_in_same_queue():
+    router = make_router(PriorityMode.PRIORITY_QUEUE)
+
+    normal = router.route(make_message(1), OriginType.TAMTAM)
+    high = router.route(make_message(1, "message_callback"), OriginType.TAMTAM)
+
+    assert (normal.priority, high.priority) == (0, 5)
+    assert high.queue == normal.queue
+    # Прочие получатели кладут верхнюю полосу в отдельную партицию
+    assert high.partition == f"{normal.partition}.priority"
+    assert router.queues()[0].arguments["x-max-priority"] == 5
+
+
+def test_separate_queue_mode_routes_to_priority_queue():
+    router = make_router(PriorityMode.SEPARATE_QUEUE)
+
+    high = router.route(make_message(1, "message_callback"), OriginType.TAMTAM)
+
+    assert high.queue == high.partition == "notifications.priority"
+    assert router.priority_queue().name == "notifications.priority"
+
+
+def test_high_lane_skips_coalescing_window():
+    sink = RecordingSink()
+    coalescer = EditCoalescer(OriginType.TAMTAM, window_sec=10)
+    worker = make_worker(
+        sink=sink,
+        router=make_router(PriorityMode.PRIORITY_QUEUE, 1),
+        coalescer=coalescer,
+    )
+    worker.client.pending = [
+        make_message(1, text="normal"),
+        make_message(1, "message_callback", text="button"),
+    ]
+
+    async def scenario():
+        await worker.start()
+        await worker.poll_once()
+        published = [message.text for message in sink.messages]
+        await coalescer.flush(timeout=1)
+        return published
+
+    published = asyncio.run(scenario())
+
+    assert published == ["button"]
+    assert [message.text for message in sink.messages] == ["button", "normal"]
@@ -0,0 +1,34 @@
+import asyncio
+
+from app.clients.redis.redis_client import RedisRateLimiter
+from app.enums.polling_workers import OriginType
+
+
+class EvalshaRedis:
+    """Запоминает ключи, с которыми вызывался Lua-скрипт лимитера"""
+
+    def __init__(self):
+        self.keys = []
+
+    async def evalsha(self, sha, numkeys, key, *args):
+        self.keys.append(key)
+        return [1, 0]
+
+
+def test_key_uses_origin_value_with_hash_tag():
+    limiter = RedisRateLimiter(2, OriginType.TAMTAM)
+
+    assert limiter._key(OriginType.TAMTAM) == "rate_limiter:service:{TAMTAM}"
+    assert limiter._key(OriginType.TELEGRAM) == "rate_limiter:service:{TELEGRAM}"
+    assert limiter._key("TAMTAM") == "rate_limiter:service:{TAMTAM}"
+
+
+def test_acquire_uses_service_key():
+    limiter = RedisRateLimiter(2, OriginType.TAMTAM)
+    limiter.redis = EvalshaRedis()
+    limiter._script_sha = "sha"
+
+    allowed, _ = asyncio.run(limiter.acquire_for_service(OriginType.TAMTAM))
+
+    assert allowed
+    assert limiter.redis.keys == ["rate_limiter:service:{TAMTAM}"]
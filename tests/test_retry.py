@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.retry import (
+    RetryBudget,
+    RetryPolicy,
+    backoff_delay,
+    retry_after_delay,
+)
+
+
+def status_error(status: int, headers=None, json=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.example/updates")
+    response = httpx.Response(status, headers=headers, json=json, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class Flaky:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("down")
+        return "ok"
+
+
+def test_backoff_is_jittered_below_exponential_cap():
+    delays = [
+        backoff_delay(attempt, 0.5, 3.0) for attempt in (1, 2, 3, 10) for _ in range(100)
+    ]
+
+    assert all(0 <= delay <= 3.0 for delay in delays)
+    assert max(backoff_delay(1, 0.5, 3.0) for _ in range(100)) <= 0.5
+
+
+def test_retry_after_header_and_telegram_body():
+    assert retry_after_delay(status_error(429, headers={"Retry-After": "7"})) == 7
+    telegram = status_error(429, json={"ok": False, "parameters": {"retry_after": 3}})
+    assert retry_after_delay(telegram) == 3
+    assert retry_after_delay(status_error(500, headers={"Retry-After": "7"})) is None
+    assert retry_after_delay(ConnectionError()) is None
+
+
+def test_budget_limits_retries_to_ratio_of_requests():
+    budget = RetryBudget("test", ratio=0.1, min_retries=2, window_sec=60)
+    for _ in range(10):
+        budget.record_request()
+
+    # 0.1 * 10 запросов + 2 в запас
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+
+
+def test_policy_retries_until_success(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    func = Flaky(failures=2)
+    policy = RetryPolicy("test", max_attempts=3, base_delay=0.01)
+
+    result = asyncio.run(policy.call(func))
+
+    assert result == "ok"
+    assert func.calls == 3
+    assert len(sleeps) == 2
+
+
+def test_policy_stops_when_budget_is_exhausted(monkeypatch):
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    budget = RetryBudget("test", ratio=0, min_retries=1, window_sec=60)
+    policy = RetryPolicy("test", max_attempts=5, budget=budget)
+    func = Flaky(failures=10)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(policy.call(func))
+
+    # Первый повтор разрешён запасом, второй - уже нет
+    assert func.calls == 2
+
+
+def test_next_delay_prefers_retry_after_with_cap():
+    policy = RetryPolicy("test", retry_after_max=5)
+
+    delay = policy.next_delay(1, status_error(429, headers={"Retry-After": "60"}))
+
+    assert delay == 5
@@ -0,0 +1,84 @@
+import fnmatch
+
+import pytest
+
+from app.clients.rabbit.routing import MessageRouter
+from app.enums.polling_workers import OriginType
+from app.enums.rabbit import RoutingExchangeType, RoutingKeyField
+from tests.fakes import make_message
+
+
+def binding_matches(router: MessageRouter, binding: str, routing_key: str) -> bool:
+    if router.exchange_type == RoutingExchangeType.TOPIC:
+        # В тестовых ключах одно слово на "*", этого достаточно для fnmatch
+        return fnmatch.fnmatchcase(routing_key, binding)
+    return binding == routing_key
+
+
+def test_default_exchange_routes_to_partition_queue():
+    router = MessageRouter("notifications", partitions=4)
+
+    route = router.route(make_message(42), OriginType.TAMTAM)
+
+    assert router.queue_names() == [f"notifications.{i}" for i in range(4)]
+    assert route.exchange is None
+    assert route.queue == route.partition == f"notifications.{router.partition('42')}"
+
+
+def test_single_partition_keeps_legacy_queue_name():
+    router = MessageRouter("notifications")
+
+    route = router.route(make_message(42), OriginType.TAMTAM)
+
+    assert router.queue_names() == ["notifications"]
+    assert (route.queue, route.partition) == ("notifications", "notifications")
+
+
+@pytest.mark.parametrize(
+    "exchange_type", [RoutingExchangeType.DIRECT, RoutingExchangeType.TOPIC]
+)
+def test_routing_key_matches_binding_of_its_partition(exchange_type):
+    router = MessageRouter("notifications", exchange_type=exchange_type, partitions=3)
+    names = router.queue_names()
+
+    for chat_id in range(50):
+        route = router.route(make_message(chat_id), OriginType.TAMTAM)
+        matched = [
+            name
+            for index, name in enumerate(names)
+            if binding_matches(router, router.binding_key(index), route.routing_key)
+        ]
+        assert matched == [route.partition]
+        assert route.exchange.name == "notifications.exchange"
+
+
+def test_consistent_hash_routes_by_chat_id_with_equal_weights():
+    router = MessageRouter(
+        "notifications",
+        exchange_type=RoutingExchangeType.CONSISTENT_HASH,
+        partitions=3,
+    )
+
+    route = router.route(make_message(42), OriginType.TAMTAM)
+
+    assert route.routing_key == "42"
+    assert {router.binding_key(i) for i in range(3)} == {"1"}
+
+
+def test_chat_stays_in_one_partition_and_origin_key_groups_all_chats():
+    by_chat = MessageRouter("notifications", partitions=8)
+    by_origin = MessageRouter(
+        "notifications", partitions=8, key_field=RoutingKeyField.ORIGIN_TYPE
+    )
+
+    chat_partitions = {
+        by_chat.route(make_message(7, text=str(i)), OriginType.TAMTAM).partition
+        for i in range(10)
+    }
+    origin_partitions = {
+        by_origin.route(make_message(chat_id), OriginType.TAMTAM).partition
+        for chat_id in range(50)
+    }
+
+    assert len(chat_partitions) == 1
+    assert len(origin_partitions) == 1
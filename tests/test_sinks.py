@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from app.clients.rabbit.routing import Route
+from app.clients.sinks.batcher import BatchPublisher
+from app.clients.sinks.file import FileSink
+from tests.fakes import RecordingSink, make_message
+
+
+def test_file_sink_appends_json_lines_per_partition(tmp_path):
+    async def scenario():
+        sink = FileSink(str(tmp_path / "out"))
+        first = Route("notifications", partition="notifications.0")
+        second = Route("notifications", partition="notifications.1")
+        await sink.start()
+        await sink.write([make_message(1, text="a"), make_message(2, text="b")], first)
+        await sink.write([make_message(3, text="c")], second)
+        await sink.write([make_message(4, text="d")], first)
+        await sink.stop()
+
+    asyncio.run(scenario())
+
+    first = (tmp_path / "out" / "notifications.0.jsonl").read_text().splitlines()
+    second = (tmp_path / "out" / "notifications.1.jsonl").read_text().splitlines()
+    assert [json.loads(line)["text"] for line in first] == ["a", "b", "d"]
+    assert [json.loads(line)["chat_id"] for line in second] == [3]
+
+
+def test_batcher_groups_by_route_and_flushes_full_batch():
+    async def scenario():
+        sink = RecordingSink()
+        batcher = BatchPublisher(sink, max_messages=2, max_delay_sec=10)
+
+        def send(chat_id, text, partition):
+            return batcher.send(
+                make_message(chat_id, text=text), "notifications", partition=partition
+            )
+
+        # Первая партиция набирает max_messages сама, вторую дописывает flush
+        full = asyncio.gather(
+            send(1, "a", "notifications.0"), send(3, "c", "notifications.0")
+        )
+        partial = asyncio.ensure_future(send(2, "b", "notifications.1"))
+        await asyncio.wait_for(full, timeout=1)
+        assert not partial.done()
+        await batcher.flush()
+        await partial
+        return sink
+
+    sink = asyncio.run(scenario())
+
+    batches = {route.target: [m.text for m in messages] for messages, route in sink.writes}
+    assert batches == {"notifications.0": ["a", "c"], "notifications.1": ["b"]}
+
+
+def test_batcher_priority_batch_is_not_held_for_window():
+    async def scenario():
+        sink = RecordingSink()
+        batcher = BatchPublisher(sink, max_messages=50, max_delay_sec=10)
+        await asyncio.wait_for(
+            batcher.send(make_message(1, "message_callback"), "notifications", priority=5),
+            timeout=1,
+        )
+        return sink
+
+    sink = asyncio.run(scenario())
+
+    assert len(sink.messages) == 1
+    assert sink.writes[0][1].priority == 5
+
+
+def test_batcher_write_error_reaches_every_sender():
+    async def scenario():
+        sink = RecordingSink()
+        sink.error = RuntimeError("sink down")
+        batcher = BatchPublisher(sink, max_messages=2, max_delay_sec=10)
+        return await asyncio.gather(
+            batcher.send(make_message(1), "notifications"),
+            batcher.send(make_message(2), "notifications"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+
+def test_sink_without_queue_stats_reports_unknown_depth():
+    sink = RecordingSink()
+
+    assert not sink.supports_queue_stats
+    assert asyncio.run(sink.queue_stats("notifications")) is None
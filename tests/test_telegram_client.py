@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import httpx
+
+from app.origin_clients.telegram import TelegramClient
+
+TOKEN = "12345:secret-token"
+
+UPDATES = [
+    {
+        "update_id": 10,
+        "message": {
+            "message_id": 1,
+            "date": 1700000000,
+            "chat": {"id": 77, "type": "private", "username": "alice"},
+            "from": {"id": 5, "username": "alice"},
+            "text": "привет",
+        },
+    },
+    {
+        "update_id": 11,
+        "edited_message": {
+            "message_id": 1,
+            "date": 1700000000,
+            "edit_date": 1700000060,
+            "chat": {"id": 77, "type": "private", "username": "alice"},
+            "from": {"id": 5, "username": "alice"},
+            "text": "привет!",
+        },
+    },
+    {
+        "update_id": 12,
+        "callback_query": {
+            "id": "cb",
+            "from": {"id": 5, "first_name": "Alice"},
+            "message": {"message_id": 2, "chat": {"id": 77, "type": "private"}},
+            "data": "button",
+        },
+    },
+    # Без чата: уведомление некуда адресовать
+    {"update_id": 13, "poll": {"id": "p1", "question": "?"}},
+]
+
+
+def make_client(updates, requests, **kwargs) -> TelegramClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True, "result": updates})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return TelegramClient(TOKEN, http_client=http_client, **kwargs)
+
+
+def test_updates_are_mapped_to_common_types():
+    requests = []
+    client = make_client(UPDATES, requests, raw_passthrough=True)
+
+    messages = asyncio.run(client.fetch_updates())
+
+    assert [m.update_type for m in messages] == [
+        "message_created",
+        "message_edited",
+        "message_callback",
+    ]
+    created, edited, callback = messages
+    assert (created.chat_id, created.text, created.chat_user_name) == (
+        77,
+        "привет",
+        "alice",
+    )
+    assert created.update_id == "12345:10"
+    assert created.timestamp == 1700000000000
+    assert edited.timestamp == 1700000060000
+    assert (callback.text, callback.message_id, callback.sender_id) == ("button", "2", 5)
+    assert json.loads(created.raw) == UPDATES[0]
+
+
+def test_offset_moves_past_last_update():
+    requests = []
+    client = make_client(UPDATES, requests)
+
+    asyncio.run(client.fetch_updates())
+    asyncio.run(client.fetch_updates())
+
+    assert "offset" not in requests[0].url.params
+    assert requests[1].url.params["offset"] == "14"
+    assert client.get_cursor() == "14"
+
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.clients.rabbit.routing import MessageRouter
+from app.clients.worker_registry import WorkerRegistry
+from app.enums.polling_workers import OriginType
+from app.utils.token_source import BaseTokenSource, FileTokenSource
+from tests.fakes import FakeOriginClient, FakeRateLimiter, RecordingSink
+
+
+class StaticTokenSource(BaseTokenSource):
+    def __init__(self, tokens=(), error=None):
+        self.tokens = set(tokens)
+        self.error = error
+
+    async def load(self):
+        if self.error:
+            raise self.error
+        return set(self.tokens)
+
+
+def make_registry() -> WorkerRegistry:
+    return WorkerRegistry(
+        OriginType.TAMTAM,
+        FakeOriginClient,
+        RecordingSink(),
+        FakeRateLimiter(),
+        MessageRouter("notifications"),
+    )
+
+
+def test_file_source_reads_lines_commas_and_comments(tmp_path):
+    path = tmp_path / "tokens.txt"
+    path.write_text(
+        "token-a, token-b\n# отключён: token-c\ntoken-d # прод\n\n", encoding="utf-8"
+    )
+
+    tokens = asyncio.run(FileTokenSource(str(path)).load())
+
+    assert tokens == {"token-a", "token-b", "token-d"}
+
+
+def test_reload_adds_and_removes_workers():
+    async def scenario():
+        registry = make_registry()
+        await registry.reload(StaticTokenSource({"token-a", "token-b"}))
+        first = dict(registry.workers)
+        await registry.reload(StaticTokenSource({"token-b", "token-c"}))
+        return first, registry.workers
+
+    first, current = asyncio.run(scenario())
+
+    assert set(first) == {"token-a", "token-b"}
+    assert set(current) == {"token-b", "token-c"}
+    # Оставшийся бот не перезапускается
+    assert current["token-b"] is first["token-b"]
+
+
+def test_reload_keeps_workers_on_empty_or_failed_source():
+    async def scenario():
+        registry = make_registry()
+        await registry.reload(StaticTokenSource({"token-a"}))
+        await registry.reload(StaticTokenSource())
+        await registry.reload(StaticTokenSource(error=OSError("no file")))
+        return registry.workers
+
+    workers = asyncio.run(scenario())
+
+    assert set(workers) == {"token-a"}
@@ -0,0 +1,55 @@
+import pytest
+
+from app.config import settings
+from app.utils import tracing
+
+
+@pytest.fixture
+def tracing_enabled(monkeypatch):
+    monkeypatch.setattr(settings.tracing, "TRACING_ENABLED", True)
+    yield
+    tracing.shutdown_tracing()
+
+
+def test_disabled_tracing_is_noop():
+    with tracing.span("poll_cycle", {"chat.id": None}) as current:
+        tracing.record_error(current, RuntimeError("boom"))
+
+    assert current is None
+    assert tracing.current_link() is None
+    assert tracing.inject_headers({"x-batch-size": 1}) == {"x-batch-size": 1}
+    assert tracing.inject_headers(None) is None
+
+
+def test_setup_without_sdk_keeps_tracing_off(tracing_enabled, monkeypatch):
+    monkeypatch.setattr(tracing, "trace", None)
+
+    tracing.setup_tracing()
+
+    with tracing.span("poll_cycle") as current:
+        assert current is None
+
+
+def test_publish_span_propagates_traceparent(tracing_enabled, monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "_create_exporter", lambda: exporter)
+    monkeypatch.setattr(settings.tracing, "TRACING_SAMPLE_RATIO", 1.0)
+    tracing.setup_tracing()
+
+    with tracing.span("publish", {"chat.id": 1, "update.type": None}) as current:
+        headers = tracing.inject_headers({"x-batch-size": 1})
+        link = tracing.current_link()
+        tracing.record_error(current, RuntimeError("boom"))
+    tracing.shutdown_tracing()
+
+    assert headers["traceparent"]
+    assert link is not None
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "publish"
+    assert dict(span.attributes) == {"chat.id": 1}
+    assert not span.status.is_ok
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+
+from app.config import TamTamSettings
+from app.origin_clients.tamtam import TamTamClient
+from app.origin_clients.telegram import TelegramClient
+
+TAMTAM_UPDATES = [
+    {
+        "update_type": "message_created",
+        "timestamp": 1700000000000,
+        "message": {
+            "recipient": {"chat_id": 77, "chat_type": "dialog"},
+            "sender": {"user_id": 5, "name": "Alice"},
+            "body": {"mid": "mid.1", "text": "привет"},
+        },
+    },
+    {"update_type": "user_added", "timestamp": 1700000000001, "chat_id": 78},
+]
+
+TELEGRAM_UPDATES = [
+    {
+        "update_id": 10,
+        "message": {"message_id": 1, "date": 1, "chat": {"id": 77}, "text": "a"},
+    },
+    {
+        "update_id": 11,
+        "callback_query": {
+            "id": "cb",
+            "from": {"id": 5},
+            "message": {"message_id": 2, "chat": {"id": 77}},
+            "data": "button",
+        },
+    },
+]
+
+
+def mock_http(body, requests) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_settings_parse_comma_separated_types():
+    tamtam = TamTamSettings(TAM_TAM_UPDATE_TYPES=" message_created, ,message_callback")
+
+    assert tamtam.TAM_TAM_UPDATE_TYPES_LIST == ["message_created", "message_callback"]
+    assert TamTamSettings(TAM_TAM_UPDATE_TYPES="").TAM_TAM_UPDATE_TYPES_LIST == []
+
+
+def test_tamtam_sends_types_and_drops_unrequested():
+    requests = []
+    http = mock_http({"updates": TAMTAM_UPDATES, "marker": 5}, requests)
+    client = TamTamClient(
+        "tamtam-token", http_client=http, update_types=["message_created"]
+    )
+
+    messages = asyncio.run(client.fetch_updates())
+
+    assert requests[0].url.params["types"] == "message_created"
+    assert [m.update_type for m in messages] == ["message_created"]
+
+
+def test_tamtam_without_filter_requests_all_types():
+    requests = []
+    http = mock_http({"updates": TAMTAM_UPDATES, "marker": 5}, requests)
+    client = TamTamClient("tamtam-token", http_client=http)
+
+    messages = asyncio.run(client.fetch_updates())
+
+    assert "types" not in requests[0].url.params
+    assert len(messages) == 2
+
+
+def test_telegram_allowed_updates_are_translated_and_reset():
+    requests = []
+    http = mock_http({"ok": True, "result": []}, requests)
+    client = TelegramClient(
+        "1:token", http_client=http, update_types=["message_created"]
+    )
+
+    asyncio.run(client.fetch_updates())
+    client.update_types = None
+    asyncio.run(client.fetch_updates())
+
+    assert json.loads(requests[0].url.params["allowed_updates"]) == [
+        "message",
+        "channel_post",
+    ]
+    # Telegram запоминает фильтр, поэтому после него передаётся пустой список
+    assert requests[1].url.params["allowed_updates"] == "[]"
+
+
+def test_telegram_drops_unrequested_types_before_parsing():
+    http = mock_http({"ok": True, "result": TELEGRAM_UPDATES}, [])
+    client = TelegramClient(
+        "1:token", http_client=http, update_types=["message_callback"]
+    )
+
+    messages = asyncio.run(client.fetch_updates())
+
+    assert [m.update_type for m in messages] == ["message_callback"]
+    # Курсор сдвигается и за отброшенные апдейты
+    assert client.get_cursor() == "12"
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import httpx
+
+from app.clients.worker_supervisor import WorkerSupervisor
+from app.enums.polling_workers import OriginType, WorkerState
+from tests.fakes import FakeOriginClient, make_worker
+
+
+class CountingClient(FakeOriginClient):
+    def __init__(self, token: str = "test-token-0001"):
+        super().__init__(token)
+        self.created = 0
+
+    async def create_client(self):
+        self.created += 1
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.example/updates")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_auth_error_quarantines_token():
+    supervisor = WorkerSupervisor(OriginType.TAMTAM, quarantine_sec=600)
+    worker = make_worker()
+
+    asyncio.run(supervisor.on_failure(worker, http_error(401)))
+
+    assert supervisor.state(worker) == WorkerState.QUARANTINED
+    assert worker.resume_at >= time.monotonic() + 590
+    # Карантин не считается ошибкой подряд и не перезапускает клиент
+    assert supervisor.failures.get(worker) is None
+
+
+def test_client_is_recreated_after_consecutive_failures():
+    client = CountingClient()
+    supervisor = WorkerSupervisor(OriginType.TAMTAM, restart_after=3)
+    worker = make_worker(client)
+
+    async def scenario():
+        for _ in range(6):
+            await supervisor.on_failure(worker, ConnectionError("down"))
+
+    asyncio.run(scenario())
+
+    assert client.created == 2
+    assert supervisor.state(worker) == WorkerState.BACKOFF
+    assert supervisor.failures[worker] == 6
+
+
+def test_success_resets_failures_and_state():
+    supervisor = WorkerSupervisor(OriginType.TAMTAM, restart_after=3)
+    worker = make_worker()
+
+    asyncio.run(supervisor.on_failure(worker, ConnectionError("down")))
+    supervisor.on_success(worker)
+
+    assert supervisor.state(worker) == WorkerState.RUNNING
+    assert worker not in supervisor.failures
+
+
+def test_failures_of_one_bot_do_not_affect_another():
+    supervisor = WorkerSupervisor(OriginType.TAMTAM)
+    failing = make_worker(FakeOriginClient("test-token-0001"))
+    healthy = make_worker(FakeOriginClient("test-token-0002"))
+
+    asyncio.run(supervisor.on_failure(failing, http_error(403)))
+    supervisor.on_success(healthy)
+
+    assert supervisor.state(failing) == WorkerState.QUARANTINED
+    assert supervisor.state(healthy) == WorkerState.RUNNING
+    assert healthy.resume_at == 0.0